@@ -0,0 +1,199 @@
+import asyncio
+import json
+import os
+from http.cookiejar import CookieJar
+from typing import Optional, List, Dict, Any, Union, Callable
+import httpx
+from espn_api.basketball.matchup import Matchup
+from espn_api.basketball.player import Player
+from espn_client import ESPNClient, map_scoreboard, map_box_scores, map_players, resolve_periods
+from logger_config import setup_logger
+from cache import cached
+import profiling
+
+# Set up logger
+logger = setup_logger('async_espn_client')
+
+
+class _DiscardingCookieJar(CookieJar):
+    """A cookie jar that never stores anything, so no Set-Cookie outlives its response."""
+
+    def set_cookie(self, cookie) -> None:
+        pass
+
+    def extract_cookies(self, response, request) -> None:
+        pass
+
+
+def connection_pool() -> httpx.AsyncClient:
+    """A keep-alive connection pool for ESPN fetches, sized by ESPN_MAX_CONNECTIONS.
+
+    The pool is shared by every league and set of credentials, so its cookie
+    jar stays empty: credentials only travel in each request's own Cookie header.
+    """
+    max_connections = int(os.getenv("ESPN_MAX_CONNECTIONS", 20))
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=float(os.getenv("ESPN_TIMEOUT", 10)),
+        cookies=_DiscardingCookieJar(),
+    )
+
+
+class AsyncESPNClient:
+    """Non-blocking ESPN fetches over a shared keep-alive connection pool.
+
+    League structure (teams, pro schedule, matchup periods) comes from the
+    ESPNClient snapshot; only the per-request views are fetched here. Results
+    share ESPNClient's response cache, so sync and async callers hit the same entries.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if args or kwargs:
+            return super(AsyncESPNClient, cls).__new__(cls)
+        if cls._instance is None:
+            cls._instance = super(AsyncESPNClient, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, client: Optional[ESPNClient] = None,
+                 http: Optional[Callable[[], httpx.AsyncClient]] = None):
+        if not self._initialized:
+            self.client = client or ESPNClient()
+            self.cache = self.client.cache
+            # Clients of several leagues can share one connection pool; cookies go with each request.
+            self._shared_http = http
+            self._http: Optional[httpx.AsyncClient] = None
+            self._initialized = True
+
+    @property
+    def league(self):
+        return self.client.league
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._shared_http is not None:
+            return self._shared_http()
+        # Created lazily so the pool binds to the event loop that first uses it.
+        if self._http is None or self._http.is_closed:
+            self._http = connection_pool()
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def fetch_view(self,
+                         *views: str,
+                         params: Optional[Dict[str, Any]] = None,
+                         filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch one or more league views (e.g. 'mTeam', 'mRoster') in a single request."""
+        params = dict(params or {})
+        if views:
+            params['view'] = list(views)
+        headers = {}
+        if filters:
+            headers['x-fantasy-filter'] = json.dumps(filters)
+        cookies = self.league.espn_request.cookies
+        if cookies:
+            headers['cookie'] = '; '.join(f"{name}={value}" for name, value in cookies.items())
+        with profiling.phase('upstream'):
+            response = await self.http.get(self.league.espn_request.LEAGUE_ENDPOINT, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        return data[0] if isinstance(data, list) else data
+
+    async def fetch_views(self, *views: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch several views concurrently, one request each, keyed by view name."""
+        results = await asyncio.gather(*(self.fetch_view(view, params=params) for view in views))
+        return dict(zip(views, results))
+
+    def _attach_teams(self, matchups: List[Any]) -> List[Any]:
+        # Mirrors League.scoreboard/box_scores: swap team IDs for Team objects.
+        teams = {team.team_id: team for team in self.league.teams}
+        for matchup in matchups:
+            matchup.home_team = teams.get(matchup.home_team, matchup.home_team)
+            matchup.away_team = teams.get(matchup.away_team, matchup.away_team)
+        return matchups
+
+    @cached('scoreboard')
+    async def get_scoreboard(self, matchup_period: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get scoreboard for specific week or current week."""
+        try:
+            matchup_period = matchup_period or self.league.currentMatchupPeriod
+            data = await self.fetch_view('mMatchup')
+            matchups = [Matchup(m) for m in data['schedule'] if m['matchupPeriodId'] == matchup_period]
+            if not matchups:
+                return None
+            return map_scoreboard(self._attach_teams(matchups))
+        except Exception as e:
+            logger.error(f"Error getting scoreboard: {str(e)}")
+            return None
+
+    @cached('box_scores')
+    async def get_box_scores(self,
+                             matchup_period: Optional[int] = None,
+                             scoring_period: Optional[int] = None,
+                             matchup_total: bool = True) -> List[Dict[str, Any]]:
+        """Get detailed box scores with player stats."""
+        try:
+            league = self.league
+            matchup_id, scoring_id = resolve_periods(league, matchup_period, scoring_period)
+            stored = await asyncio.to_thread(self.client.load_stored_box_scores,
+                                             league, matchup_id, scoring_id, matchup_total)
+            if stored is not None:
+                return stored
+            data = await self.fetch_view(
+                'mMatchupScore', 'mScoreboard',
+                params={'scoringPeriodId': scoring_id},
+                filters={"schedule": {"filterMatchupPeriodIds": {"value": [matchup_id]}}},
+            )
+            box_scores = [league.BoxScoreClass(m, league.pro_schedule, matchup_total, league.year, scoring_id)
+                          for m in data['schedule']]
+            if not box_scores:
+                return None
+            box_score_data = map_box_scores(self._attach_teams(box_scores))
+            await asyncio.to_thread(self.client.store_box_scores,
+                                    league, matchup_id, scoring_id, matchup_total, box_score_data)
+            return box_score_data
+        except Exception as e:
+            logger.error(f"Error getting box scores: {str(e)}")
+            return None
+
+    @cached('player_info')
+    async def get_player_info(self,
+                              name: Optional[str] = None,
+                              player_ids: Optional[Union[int, List[int]]] = None,
+                              include_stats: bool = True) -> List[Dict[str, Any]]:
+        """Get detailed player information. Can fetch multiple players at once.
+
+        Without `include_stats` only the season total and projection splits are
+        fetched (all that total, average and projected points need), not one
+        split per game, which keeps both the download and the parsing small.
+        """
+        try:
+            league = self.league
+            if name:
+                # An index miss falls back to a blocking ESPN lookup, so keep it off the event loop.
+                player_ids = await asyncio.to_thread(self.client.get_player_id_by_name, name)
+            if player_ids is None:
+                return None
+            if not isinstance(player_ids, list):
+                player_ids = [player_ids]
+            year = league.year
+            data = await self.fetch_view('kona_playercard', filters={'players': {
+                'filterIds': {'value': player_ids},
+                'filterStatsForTopScoringPeriodIds': {
+                    'value': league.finalScoringPeriod if include_stats else 0,
+                    'additionalValue': [f"00{year}", f"10{year}"],
+                },
+            }})
+            players = [Player(p, year, league.pro_schedule) for p in data.get('players', [])]
+            if not players:
+                logger.warning("No player data found")
+                return None
+            return map_players(players, include_stats=include_stats)
+        except Exception as e:
+            logger.error(f"Error getting player info: {str(e)}")
+            return None
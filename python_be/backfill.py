@@ -0,0 +1,171 @@
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from espn_client import (TRANSACTION_TYPES, ESPNClient, map_box_scores, map_standings, map_transactions,
+                         is_final_period, resolve_periods, season_over)
+from season_store import SeasonStore
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('backfill')
+
+# (task, matchup period, scoring period); standings use period 0.
+Task = Tuple[str, int, int]
+
+
+def season_periods(league: Any) -> List[Tuple[int, int]]:
+    """Every (matchup period, scoring period) pair of a season, in order."""
+    periods = []
+    for matchup_id, scoring_ids in sorted(getattr(league, 'matchup_ids', {}).items()):
+        periods.extend((matchup_id, int(scoring_id)) for scoring_id in scoring_ids)
+    if not periods:
+        # No schedule map (older seasons): resolve each scoring period individually.
+        last = getattr(league, 'finalScoringPeriod', None) or league.current_week
+        periods = [resolve_periods(league, None, scoring_id) for scoring_id in range(1, last + 1)]
+    return periods
+
+
+class Backfill:
+    """Loads past seasons into the season store on a bounded thread pool.
+
+    Every finished task is checkpointed in the store, so a rerun after a crash
+    only fetches what is still missing. Periods that are not over yet, and the
+    standings of a season still in progress, are fetched but never checkpointed.
+    """
+
+    def __init__(self,
+                 client: ESPNClient,
+                 store: SeasonStore,
+                 workers: int = 8,
+                 retries: int = 2,
+                 include_current: bool = False,
+                 report_every: float = 5.0):
+        self.client = client
+        self.store = store
+        self.workers = workers
+        self.retries = retries
+        self.include_current = include_current
+        self.report_every = report_every
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.completed = 0
+        self.failed = 0
+        self.periods = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def plan(self, league: Any) -> List[Task]:
+        """Tasks for one season that have not been checkpointed yet."""
+        done = self.store.done_tasks(league.league_id, league.year)
+        tasks: List[Task] = [('standings', 0, 0)]
+        for matchup_id, scoring_id in season_periods(league):
+            if not self.include_current and not is_final_period(league, matchup_id, scoring_id, False):
+                continue
+            tasks.append(('box_scores', matchup_id, scoring_id))
+            tasks.append(('transactions', matchup_id, scoring_id))
+        return [task for task in tasks if (task[0], task[2]) not in done]
+
+    def run(self, seasons: List[int]) -> Dict[str, Any]:
+        results = [self.run_season(season) for season in seasons]
+        return {'seasons': results}
+
+    def run_season(self, season: int) -> Dict[str, Any]:
+        self._reset_counters()
+        league = self.client.league_for_season(season)
+        tasks = self.plan(league)
+        logger.info(f"Backfilling season {season}: {len(tasks)} tasks on {self.workers} workers")
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backfill') as pool:
+            futures = [pool.submit(self._run_task, league, task) for task in tasks]
+            for future in as_completed(futures):
+                self._record(future.result(), len(tasks))
+        summary = self.summary(season, len(tasks))
+        logger.info(f"Season {season} done: {summary}")
+        return summary
+
+    def _run_task(self, league: Any, task: Task) -> Optional[Task]:
+        """Fetch and store one task, retrying with backoff. Returns the task on success, None on failure."""
+        name, matchup_id, scoring_id = task
+        for attempt in range(self.retries + 1):
+            try:
+                self._fetch_and_store(league, name, matchup_id, scoring_id)
+                final = season_over(league) if name == 'standings' else \
+                    is_final_period(league, matchup_id, scoring_id, False)
+                if final:
+                    self.store.mark_done(league.league_id, league.year, name, scoring_id)
+                return task
+            except Exception as e:
+                logger.warning(f"{name} for season {league.year} period {scoring_id} failed "
+                               f"(attempt {attempt + 1}): {str(e)}")
+                if attempt < self.retries:
+                    time.sleep(min(2 ** attempt, 30))
+        return None
+
+    def _fetch_and_store(self, league: Any, name: str, matchup_id: int, scoring_id: int) -> None:
+        if name == 'standings':
+            self.store.save_standings(league.league_id, league.year, map_standings(league.standings()))
+        elif name == 'box_scores':
+            box_scores = league.box_scores(matchup_period=matchup_id, scoring_period=scoring_id, matchup_total=False)
+            self.store.save_box_scores(league.league_id, league.year, matchup_id, scoring_id, False,
+                                       map_box_scores(box_scores),
+                                       final=is_final_period(league, matchup_id, scoring_id, False))
+        elif name == 'transactions':
+            transactions = league.transactions(scoring_period=scoring_id, types=TRANSACTION_TYPES)
+            self.store.save_transactions(league.league_id, league.year, scoring_id, map_transactions(transactions))
+
+    def _record(self, task: Optional[Task], total: int) -> None:
+        with self._lock:
+            if task is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                if task[0] == 'box_scores':
+                    self.periods += 1
+            now = time.perf_counter()
+            if now - self._last_report >= self.report_every:
+                self._last_report = now
+                elapsed = now - self.started
+                logger.info(f"{self.completed + self.failed}/{total} tasks, "
+                            f"{self.periods / elapsed:.2f} periods/s, {self.failed} failed")
+
+    def summary(self, season: int, total: int) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            'season': season,
+            'tasks': total,
+            'completed': self.completed,
+            'failed': self.failed,
+            'periods': self.periods,
+            'seconds': round(elapsed, 2),
+            'periods_per_second': round(self.periods / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill box scores, transactions and standings into the season store.")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[int(os.getenv("SEASON", 2026))])
+    parser.add_argument('--workers', type=int, default=int(os.getenv("BACKFILL_WORKERS", 8)))
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--include-current', action='store_true',
+                        help="also fetch periods that are not over yet (never checkpointed)")
+    args = parser.parse_args(argv)
+
+    client = ESPNClient()
+    if client.season_store is None:
+        parser.error("the season store is disabled; set SEASON_STORE_PATH")
+    backfill = Backfill(client, client.season_store, workers=args.workers,
+                        retries=args.retries, include_current=args.include_current)
+    results = backfill.run(args.seasons)
+    for summary in results['seasons']:
+        print(f"Season {summary['season']}: {summary['completed']}/{summary['tasks']} tasks, "
+              f"{summary['periods']} periods in {summary['seconds']}s "
+              f"({summary['periods_per_second']} periods/s), {summary['failed']} failed")
+    return 1 if any(summary['failed'] for summary in results['seasons']) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
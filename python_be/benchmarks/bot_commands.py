@@ -0,0 +1,84 @@
+"""Fake-ctx harness for CommandExecutor.
+
+Runs N concurrent bot commands whose ESPN work is a blocking sleep and checks
+that they finish in roughly the time of one, while a heartbeat coroutine keeps
+ticking on the event loop.
+
+    python benchmarks/bot_commands.py --commands 8 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot_executor import CommandExecutor
+
+
+class FakeContext:
+    """Just enough of discord.ext.commands.Context for a command body."""
+
+    def __init__(self, user_id: int, channel_id: int):
+        self.author = SimpleNamespace(id=user_id, mention=f'<@{user_id}>')
+        self.channel = SimpleNamespace(id=channel_id)
+        self.sent = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+
+def blocking_lookup(name: str, latency: float) -> int:
+    # Stands in for client.get_player_info: a synchronous upstream round-trip.
+    time.sleep(latency)
+    return len(name)
+
+
+async def player_stats_command(executor: CommandExecutor, ctx: FakeContext, name: str, latency: float) -> None:
+    await ctx.send(f'Player Stats for {name}!')
+    result = await executor.run(ctx, blocking_lookup, name, latency)
+    await ctx.send(f'Player Stats: {result}')
+
+
+async def heartbeat(interval: float, gaps: list, stop: asyncio.Event) -> None:
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        gaps.append(now - last - interval)
+        last = now
+
+
+async def main(commands: int, latency: float, channels: int) -> int:
+    executor = CommandExecutor(max_workers=commands, per_user=1, per_channel=commands)
+    contexts = [FakeContext(user_id=i, channel_id=i % channels) for i in range(commands)]
+    gaps: list = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(0.05, gaps, stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(player_stats_command(executor, ctx, f'player{i}', latency)
+                           for i, ctx in enumerate(contexts)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    executor.shutdown()
+
+    print(f"{commands} concurrent commands, {latency:.2f}s upstream latency each")
+    print(f"  wall time:           {elapsed:.3f}s ({elapsed / latency:.2f}x a single command)")
+    print(f"  max heartbeat delay: {max(gaps) * 1000 if gaps else 0:.1f}ms")
+    print(f"  executor metrics:    {executor.metrics()}")
+    ok = elapsed < latency * 2 and all(len(ctx.sent) == 2 for ctx in contexts)
+    print("  PASS" if ok else "  FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--commands', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--channels', type=int, default=2)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.commands, args.latency, args.channels)))
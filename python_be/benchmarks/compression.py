@@ -0,0 +1,62 @@
+"""Measure response compression on box score fixtures.
+
+Serves a week of fantasycast box scores through `http_cache.respond` for each
+Accept-Encoding and reports body size, the latency of a cold request (encode
+and compress) and a warm one (precompressed bytes from the cache), and the
+estimated time on the wire.
+
+    python benchmarks/compression.py --teams 12 --periods 40 --mbps 10 100
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.requests import Request
+from http_cache import EncodedCache, respond
+import http_cache
+from response_encoding import make_box_scores
+
+
+def make_request(accept_encoding: str) -> Request:
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': '/api/v1/league/fantasycast',
+        'query_string': b'',
+        'headers': [(b'accept-encoding', accept_encoding.encode())],
+    })
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main(teams: int, periods: int, mbps_list) -> int:
+    payload = make_box_scores(teams, periods)
+    print(f"{'encoding':>9} {'bytes':>10} {'ratio':>6} {'cold ms':>8} {'warm ms':>8}" +
+          ''.join(f" {f'wire@{m}Mbps ms':>16}" for m in mbps_list))
+    plain = None
+    for coding in ('identity', 'gzip', 'br'):
+        http_cache.encoded_cache = EncodedCache()
+        request = make_request(coding)
+        cold, response = timed(lambda: respond(request, 'fantasycast', 1, lambda: payload))
+        warm = min(timed(lambda: respond(request, 'fantasycast', 1, lambda: payload))[0] for _ in range(20))
+        size = len(response.body)
+        plain = plain or size
+        wire = ''.join(f" {size * 8 / (m * 1e6) * 1000:>16.1f}" for m in mbps_list)
+        print(f"{coding:>9} {size:>10} {plain / size:>6.1f} {cold * 1000:>8.2f} {warm * 1000:>8.3f}{wire}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--periods', type=int, default=40)
+    parser.add_argument('--mbps', type=float, nargs='+', default=[10, 100])
+    args = parser.parse_args()
+    sys.exit(main(args.teams, args.periods, args.mbps))
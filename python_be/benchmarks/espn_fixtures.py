@@ -0,0 +1,638 @@
+"""Recorded ESPN Fantasy API responses, replayed without touching ESPN.
+
+A Fixture maps normalized ESPN requests (path, query parameters and the
+x-fantasy-filter header) to response bodies in ESPN's own wire format, so
+espn_api parses replayed responses exactly as it parses live ones. Fixtures
+come from two places:
+
+- `record`: run the client's calls against a live league and save every
+  response (uses LEAGUE_ID, SEASON and, for private leagues, ESPN_S2/SWID).
+- `synthetic_league`: a deterministic league of any size, built from a seed.
+
+    python benchmarks/espn_fixtures.py record --out benchmarks/fixtures/my-league.json.gz
+    python benchmarks/espn_fixtures.py describe benchmarks/fixtures/my-league.json.gz
+    python benchmarks/espn_fixtures.py describe --teams 12
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import orjson
+from espn_api.requests import espn_requests
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SPORT_ENDPOINT = FANTASY_BASE_ENDPOINT + 'fba/'
+
+Handler = Callable[[str, Dict[str, List[str]], Optional[Dict[str, Any]]], Optional[Any]]
+
+
+class MissingFixture(LookupError):
+    """Raised for a request the fixture holds no response for."""
+
+
+def _canonical(value: Any) -> Any:
+    # Filters built from sets (transaction types) have no stable order.
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_canonical(item) for item in value]
+        return sorted(items) if items and all(isinstance(item, str) for item in items) else items
+    return value
+
+
+def normalize_request(url: Any, params: Any = None,
+                      headers: Any = None) -> Tuple[str, Dict[str, List[str]], Optional[Dict[str, Any]]]:
+    """Split an ESPN request into (path below /games/fba/, query parameters, parsed x-fantasy-filter)."""
+    parts = urlsplit(str(url))
+    path = parts.path.split('/games/fba/', 1)[-1].strip('/')
+    query: Dict[str, List[str]] = {}
+    items: Iterable = params.items() if isinstance(params, dict) else (params or ())
+    for name, value in list(parse_qsl(parts.query)) + list(items):
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.setdefault(name, []).extend(str(v) for v in values)
+    if 'view' in query:
+        query['view'] = sorted(query['view'])
+    filters = None
+    for name, value in (headers or {}).items():
+        if name.lower() == 'x-fantasy-filter' and value:
+            filters = _canonical(json.loads(value))
+    return path, query, filters
+
+
+def request_key(path: str, query: Dict[str, List[str]], filters: Optional[Dict[str, Any]]) -> str:
+    key = f"{path}?{urlencode(sorted((name, v) for name, values in query.items() for v in values))}"
+    if filters:
+        key += '|' + json.dumps(filters, sort_keys=True, separators=(',', ':'))
+    return key
+
+
+class ReplayResponse:
+    """The slice of requests.Response that espn_api reads."""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class Fixture:
+    """ESPN responses keyed by normalized request.
+
+    Player cards are stored per player and assembled for whatever ids a
+    kona_playercard request asks for. `handlers` answer views whose
+    parameters vary too much to enumerate (synthetic leagues only).
+    """
+
+    def __init__(self, meta: Dict[str, Any], responses: Optional[Dict[str, Any]] = None,
+                 cards: Optional[Dict[int, Any]] = None):
+        self.meta = meta
+        self.responses: Dict[str, Any] = responses or {}
+        self.cards: Dict[int, Any] = cards or {}
+        self.handlers: Dict[str, Handler] = {'kona_playercard': self._player_cards}
+        self._encoded: Dict[str, bytes] = {}
+
+    def __repr__(self) -> str:
+        return f"Fixture({self.name}, {len(self.responses)} responses, {len(self.cards)} player cards)"
+
+    @property
+    def name(self) -> str:
+        return self.meta.get('name') or f"{self.meta.get('source')}-{self.meta.get('teams')}"
+
+    def add(self, url: Any, params: Any, headers: Any, body: Any) -> None:
+        path, query, filters = normalize_request(url, params, headers)
+        if query.get('view') == ['kona_playercard']:
+            top = (filters or {}).get('players', {}).get('filterStatsForTopScoringPeriodIds', {})
+            # Only full cards are kept; stat-less requests are served by trimming them.
+            if top.get('value'):
+                for card in body.get('players', []):
+                    self.cards[card['id']] = card
+            return
+        self.responses[request_key(path, query, filters)] = body
+
+    def respond(self, url: Any, params: Any = None, headers: Any = None) -> bytes:
+        """Encoded response body for a request; raises MissingFixture when there is none."""
+        path, query, filters = normalize_request(url, params, headers)
+        key = request_key(path, query, filters)
+        body = self._encoded.get(key)
+        if body is None:
+            data = self.responses.get(key)
+            if data is None:
+                handler = self.handlers.get(','.join(query.get('view', ())))
+                data = handler(path, query, filters) if handler else None
+            if data is None:
+                raise MissingFixture(key)
+            body = orjson.dumps(data)
+            self._encoded[key] = body
+        return body
+
+    def requests_get(self, url: str, params: Any = None, headers: Any = None, cookies: Any = None,
+                     **kwargs: Any) -> ReplayResponse:
+        return ReplayResponse(200, self.respond(url, params, headers))
+
+    def httpx_transport(self) -> httpx.MockTransport:
+        """Transport for httpx clients (AsyncESPNClient); unknown requests get a 404."""
+        def handle(request: httpx.Request) -> httpx.Response:
+            try:
+                body = self.respond(request.url.copy_with(query=None), request.url.params.multi_items(),
+                                    request.headers)
+            except MissingFixture as e:
+                return httpx.Response(404, json={'messages': [f"No fixture for {e}"]})
+            return httpx.Response(200, content=body, headers={'content-type': 'application/json'})
+        return httpx.MockTransport(handle)
+
+    def _player_cards(self, path: str, query: Dict[str, List[str]],
+                      filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        players = (filters or {}).get('players', {})
+        top = players.get('filterStatsForTopScoringPeriodIds', {})
+        keep = None if top.get('value') else set(top.get('additionalValue', ()))
+        cards = []
+        for player_id in players.get('filterIds', {}).get('value', ()):
+            card = self.cards.get(int(player_id))
+            if card is None:
+                continue
+            if keep is not None:
+                player = dict(card['player'], stats=[s for s in card['player'].get('stats', ()) if s.get('id') in keep])
+                card = dict(card, player=player)
+            cards.append(card)
+        return {'players': cards}
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {'meta': self.meta, 'responses': self.responses,
+                'cards': {str(player_id): card for player_id, card in self.cards.items()}}
+        with gzip.open(path, 'wb') as f:
+            f.write(orjson.dumps(data))
+
+    @classmethod
+    def load(cls, path: str) -> 'Fixture':
+        with gzip.open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+        meta = dict(data['meta'])
+        meta.setdefault('name', os.path.basename(path).split('.')[0])
+        return cls(meta, data['responses'], {int(player_id): card for player_id, card in data['cards'].items()})
+
+
+@contextmanager
+def replay(fixture: Fixture):
+    """Serve every espn_api request from `fixture` instead of ESPN."""
+    real = espn_requests.requests
+    espn_requests.requests = SimpleNamespace(get=fixture.requests_get)
+    try:
+        yield fixture
+    finally:
+        espn_requests.requests = real
+
+
+@contextmanager
+def recording(fixture: Fixture):
+    """Pass espn_api requests through to ESPN, adding every successful response to `fixture`."""
+    real = espn_requests.requests
+
+    def get(url, params=None, headers=None, cookies=None, **kwargs):
+        response = real.get(url, params=params, headers=headers, cookies=cookies, **kwargs)
+        if response.status_code == 200:
+            fixture.add(url, params, headers, response.json())
+        return response
+
+    espn_requests.requests = SimpleNamespace(get=get)
+    try:
+        yield fixture
+    finally:
+        espn_requests.requests = real
+
+
+def record(league_id: int, season: int, espn_s2: str = '', swid: str = '', name: Optional[str] = None) -> Fixture:
+    """Record the responses behind every ESPNClient call for one live league."""
+    from espn_api.basketball import League
+    from espn_client import resolve_periods
+
+    fixture = Fixture({'name': name, 'source': 'recorded', 'league_id': league_id, 'season': season,
+                       'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds')})
+    with recording(fixture):
+        league = League(league_id=league_id, year=season, espn_s2=espn_s2 or None, swid=swid or None)
+        league.scoreboard()
+        for matchup_period in range(1, league.currentMatchupPeriod + 1):
+            league.box_scores(*resolve_periods(league, matchup_period, None), matchup_total=True)
+        for scoring_period in range(1, league.current_week + 1):
+            league.box_scores(*resolve_periods(league, None, scoring_period), matchup_total=False)
+        for size in (50, 100):
+            league.free_agents(size=size)
+        league.transactions(types={"FREEAGENT", "WAIVER", "TRADE"})
+        player_ids = [player.playerId for team in league.teams for player in team.roster]
+        player_ids += [player.playerId for player in league.free_agents(size=100)]
+        for start in range(0, len(player_ids), 50):
+            league.player_info(playerId=player_ids[start:start + 50])
+    fixture.meta.update(teams=len(league.teams), current_matchup_period=league.currentMatchupPeriod,
+                        current_scoring_period=league.current_week,
+                        final_scoring_period=league.finalScoringPeriod)
+    return fixture
+
+
+# Synthetic leagues
+
+STAT_IDS = {'PTS': '0', 'BLK': '1', 'STL': '2', 'AST': '3', 'REB': '6', 'TO': '11', 'FGM': '13', 'FGA': '14',
+            'FTM': '15', 'FTA': '16', '3PM': '17', '3PA': '18', 'MIN': '40'}
+# Standard ESPN points scoring.
+POINTS = {'PTS': 1, 'REB': 1, 'AST': 2, 'STL': 4, 'BLK': 4, 'TO': -2, 'FGM': 2, 'FGA': -1, 'FTM': 1, 'FTA': -1,
+          '3PM': 1}
+# Starting slots (PG SG SF PF C G F UT UT UT), then the bench.
+LINEUP_SLOTS = (0, 1, 2, 3, 4, 5, 6, 11, 11, 11)
+BENCH_SLOT = 12
+ELIGIBLE_SLOTS = {1: [0, 5, 11, 12, 13], 2: [1, 5, 7, 8, 11, 12, 13], 3: [2, 6, 7, 8, 11, 12, 13],
+                  4: [3, 6, 9, 10, 11, 12, 13], 5: [4, 9, 10, 11, 12, 13]}
+FIRST_NAMES = ('Aaron', 'Andre', 'Bam', 'Cade', 'Chris', 'Darius', 'De\'Aaron', 'Derrick', 'Devin', 'Evan',
+               'Franz', 'Gary', 'Jalen', 'Jamal', 'Jaren', 'Jordan', 'Josh', 'Julius', 'Keegan', 'Kevin',
+               'Kyle', 'Lauri', 'Malik', 'Marcus', 'Mikal', 'Myles', 'Nic', 'Norman', 'OG', 'Paolo',
+               'Scottie', 'Tyrese', 'Trey', 'Victor', 'Walker', 'Zach')
+LAST_NAMES = ('Adams', 'Allen', 'Anderson', 'Barnes', 'Bridges', 'Brown', 'Carter', 'Collins', 'Davis',
+              'Edwards', 'Green', 'Harris', 'Holiday', 'Jackson', 'Johnson', 'Jones', 'Lopez', 'Markkanen',
+              'Mitchell', 'Murray', 'Porter', 'Robinson', 'Sabonis', 'Smith', 'Thomas', 'Thompson', 'Turner',
+              'Walker', 'White', 'Williams', 'Wright', 'Young')
+INJURY_STATUSES = ('ACTIVE',) * 17 + ('DAY_TO_DAY', 'OUT')
+
+
+def _game_line(rng: random.Random, quality: float) -> Tuple[float, Dict[str, float]]:
+    minutes = min(44.0, max(6.0, rng.gauss(16 + 14 * quality, 5)))
+    fga = int(minutes * 0.42 * quality * rng.uniform(0.7, 1.3))
+    fgm = int(fga * rng.uniform(0.38, 0.6))
+    tpa = int(fga * rng.uniform(0.15, 0.45))
+    tpm = min(fgm, int(tpa * rng.uniform(0.25, 0.45)))
+    fta = int(fga * rng.uniform(0.0, 0.4))
+    ftm = int(fta * rng.uniform(0.6, 0.92))
+    line = {'PTS': 2 * fgm + tpm + ftm, 'REB': int(minutes * rng.uniform(0.08, 0.35)),
+            'AST': int(minutes * rng.uniform(0.03, 0.28) * quality), 'STL': rng.randint(0, 3),
+            'BLK': rng.randint(0, 3), 'TO': rng.randint(0, 4), 'FGM': fgm, 'FGA': fga, 'FTM': ftm, 'FTA': fta,
+            '3PM': tpm, '3PA': tpa, 'MIN': round(minutes, 1)}
+    applied = float(sum(weight * line[name] for name, weight in POINTS.items()))
+    return applied, {STAT_IDS[name]: float(value) for name, value in line.items()}
+
+
+def _sum_lines(lines: List[Tuple[float, Dict[str, float]]]) -> Tuple[float, Dict[str, float]]:
+    totals: Dict[str, float] = {}
+    for _, stats in lines:
+        for stat_id, value in stats.items():
+            totals[stat_id] = totals.get(stat_id, 0.0) + value
+    return float(sum(applied for applied, _ in lines)), totals
+
+
+class _SyntheticLeague:
+    """Builds one deterministic H2H points league in ESPN's wire format."""
+
+    def __init__(self, teams: int, seed: int, season: int, league_id: int, matchup_periods: int,
+                 days_per_period: int, current_matchup_period: int, roster_size: int, pool_size: int):
+        if teams % 2:
+            raise ValueError("Synthetic leagues need an even number of teams")
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.teams = teams
+        self.season = season
+        self.league_id = league_id
+        self.matchup_periods = matchup_periods
+        self.days_per_period = days_per_period
+        self.current_matchup_period = current_matchup_period
+        self.final_scoring_period = matchup_periods * days_per_period
+        # Mid-week of the current matchup period; games before today are final.
+        self.current_scoring_period = (current_matchup_period - 1) * days_per_period + days_per_period // 2 + 1
+        self.start_ms = int(datetime(season - 1, 10, 21, 23, tzinfo=timezone.utc).timestamp() * 1000)
+        self.pro_games = self._pro_schedule()
+        self.players = self._players(max(pool_size, teams * roster_size * 2))
+        self.rosters = self._draft(roster_size)
+        self.owner = {pid: team_id for team_id, roster in self.rosters.items() for pid in roster}
+        self.free_agents = sorted((p for p in self.players.values() if p['id'] not in self.owner),
+                                  key=lambda p: -p['total'][0])
+        self.day_points = {team_id: self._day_points(roster) for team_id, roster in self.rosters.items()}
+        self.schedule = self._schedule()
+
+    def _period_days(self, matchup_period: int) -> range:
+        first = (matchup_period - 1) * self.days_per_period + 1
+        return range(first, first + self.days_per_period)
+
+    def _pro_schedule(self) -> Dict[int, Dict[int, Tuple[int, int]]]:
+        games: Dict[int, Dict[int, Tuple[int, int]]] = {pro_id: {} for pro_id in range(1, 31)}
+        for day in range(1, self.final_scoring_period + 1):
+            order = list(range(1, 31))
+            self.rng.shuffle(order)
+            playing = order[:2 * self.rng.randint(4, 13)]
+            for home, away in zip(playing[::2], playing[1::2]):
+                games[home][day] = games[away][day] = (home, away)
+        return games
+
+    def _players(self, count: int) -> Dict[int, Dict[str, Any]]:
+        names = [(first, last) for first in FIRST_NAMES for last in LAST_NAMES]
+        self.rng.shuffle(names)
+        players = {}
+        for idx in range(count):
+            first, last = names[idx % len(names)]
+            if idx >= len(names):
+                last = f"{last} {'I' * (idx // len(names) + 1)}"
+            player_id = 3_000_000 + idx
+            pro_team = self.rng.randint(1, 30)
+            quality = self.rng.lognormvariate(0, 0.35)
+            games = {day: _game_line(self.rng, quality)
+                     for day in sorted(self.pro_games[pro_team]) if day < self.current_scoring_period}
+            players[player_id] = {
+                'id': player_id, 'first': first, 'last': last, 'name': f"{first} {last}",
+                'position': self.rng.randint(1, 5), 'pro_team': pro_team,
+                'injury': self.rng.choice(INJURY_STATUSES), 'games': games,
+                'total': _sum_lines(list(games.values())),
+            }
+        return players
+
+    def _draft(self, roster_size: int) -> Dict[int, List[int]]:
+        ranked = sorted(self.players.values(), key=lambda p: -p['total'][0])
+        rosters: Dict[int, List[int]] = {team_id: [] for team_id in range(1, self.teams + 1)}
+        self.picks = []
+        for round_idx in range(roster_size):
+            order = list(rosters) if round_idx % 2 == 0 else list(rosters)[::-1]
+            for pick_idx, team_id in enumerate(order):
+                player = ranked[round_idx * self.teams + pick_idx]
+                rosters[team_id].append(player['id'])
+                self.picks.append({'teamId': team_id, 'playerId': player['id'], 'roundId': round_idx + 1,
+                                   'roundPickNumber': pick_idx + 1, 'bidAmount': 0, 'keeper': False,
+                                   'nominatingTeamId': 0})
+        return rosters
+
+    def _day_points(self, roster: List[int]) -> Dict[int, float]:
+        points: Dict[int, float] = {}
+        for player_id in roster[:len(LINEUP_SLOTS)]:
+            for day, (applied, _) in self.players[player_id]['games'].items():
+                points[day] = points.get(day, 0.0) + applied
+        return points
+
+    def _schedule(self) -> List[Dict[str, Any]]:
+        # Round robin by the circle method.
+        ring = list(range(1, self.teams + 1))
+        schedule = []
+        for matchup_period in range(1, self.matchup_periods + 1):
+            rotation = (matchup_period - 1) % (self.teams - 1)
+            order = [ring[0]] + (ring[1:][-rotation:] + ring[1:][:-rotation] if rotation else ring[1:])
+            half = self.teams // 2
+            days = [day for day in self._period_days(matchup_period) if day <= self.current_scoring_period]
+            for home, away in zip(order[:half], order[half:][::-1]):
+                sides = {}
+                for side, team_id in (('home', home), ('away', away)):
+                    by_day = {str(day): round(self.day_points[team_id].get(day, 0.0), 1) for day in days}
+                    sides[side] = {'teamId': team_id, 'totalPoints': round(sum(by_day.values()), 1),
+                                   'pointsByScoringPeriod': by_day}
+                winner = 'UNDECIDED'
+                if matchup_period < self.current_matchup_period:
+                    winner = 'HOME' if sides['home']['totalPoints'] >= sides['away']['totalPoints'] else 'AWAY'
+                schedule.append({'id': len(schedule) + 1, 'matchupPeriodId': matchup_period, 'winner': winner,
+                                 **sides})
+        return schedule
+
+    # Wire format
+
+    def _split(self, split_id: str, scoring_period: int, line: Tuple[float, Dict[str, float]],
+               games: int = 0) -> Dict[str, Any]:
+        applied, stats = line
+        split = {'id': f"{split_id}{self.season}", 'seasonId': self.season, 'scoringPeriodId': scoring_period,
+                 'statSourceId': 1 if split_id == '10' else 0, 'statSplitTypeId': 0 if split_id == '00' else 1,
+                 'appliedTotal': round(applied, 1), 'stats': stats}
+        if games:
+            split['appliedAverage'] = round(applied / games, 2)
+            split['averageStats'] = {stat_id: round(value / games, 2) for stat_id, value in stats.items()}
+        return split
+
+    def _season_splits(self, player: Dict[str, Any]) -> List[Dict[str, Any]]:
+        games = len(player['games'])
+        recent = [line for day, line in player['games'].items() if day > self.current_scoring_period - 8]
+        average = player['total'][0] / games if games else 0.0
+        projected = (round(average * 82, 1), {stat_id: round(value / max(games, 1) * 82, 1)
+                                              for stat_id, value in player['total'][1].items()})
+        return [self._split('00', 0, player['total'], games),
+                self._split('01', 0, _sum_lines(recent), len(recent)),
+                self._split('10', 0, projected, 82)]
+
+    def _game_splits(self, player: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [dict(self._split('05', day, line), statSplitTypeId=5) for day, line in player['games'].items()]
+
+    def _player(self, player: Dict[str, Any], splits: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {'id': player['id'], 'fullName': player['name'], 'firstName': player['first'],
+                'lastName': player['last'], 'defaultPositionId': player['position'],
+                'eligibleSlots': ELIGIBLE_SLOTS[player['position']], 'proTeamId': player['pro_team'],
+                'injuryStatus': player['injury'], 'injured': player['injury'] == 'OUT', 'stats': splits}
+
+    def _entry(self, player_id: int, slot: int, splits: List[Dict[str, Any]]) -> Dict[str, Any]:
+        player = self.players[player_id]
+        return {'playerId': player_id, 'lineupSlotId': slot, 'acquisitionType': 'DRAFT',
+                'injuryStatus': player['injury'],
+                'playerPoolEntry': {'id': player_id, 'onTeamId': self.owner.get(player_id, 0),
+                                    'player': self._player(player, splits)}}
+
+    def _slots(self, roster: List[int]) -> Iterable[Tuple[int, int]]:
+        for idx, player_id in enumerate(roster):
+            yield player_id, LINEUP_SLOTS[idx] if idx < len(LINEUP_SLOTS) else BENCH_SLOT
+
+    def league(self) -> Dict[str, Any]:
+        records = {team_id: {'wins': 0, 'losses': 0, 'ties': 0, 'pointsFor': 0.0, 'pointsAgainst': 0.0}
+                   for team_id in self.rosters}
+        for matchup in self.schedule:
+            if matchup['winner'] == 'UNDECIDED':
+                continue
+            for side, other in (('home', 'away'), ('away', 'home')):
+                record = records[matchup[side]['teamId']]
+                record['wins' if matchup['winner'] == side.upper() else 'losses'] += 1
+                record['pointsFor'] += matchup[side]['totalPoints']
+                record['pointsAgainst'] += matchup[other]['totalPoints']
+        seeds = sorted(records, key=lambda team_id: (-records[team_id]['wins'], -records[team_id]['pointsFor']))
+        members = [{'id': f"{{MEMBER-{team_id:04d}}}", 'displayName': f"manager{team_id}",
+                    'firstName': 'Manager', 'lastName': str(team_id)} for team_id in self.rosters]
+        teams = []
+        for team_id, roster in self.rosters.items():
+            record = records[team_id]
+            teams.append({
+                'id': team_id, 'abbrev': f"T{team_id}", 'name': f"Team {team_id}", 'divisionId': team_id % 2,
+                'owners': [members[team_id - 1]['id']], 'playoffSeed': seeds.index(team_id) + 1,
+                'rankCalculatedFinal': 0, 'logo': f"https://example.com/logos/{team_id}.png",
+                'record': {'overall': dict(record, pointsFor=round(record['pointsFor'], 1),
+                                           pointsAgainst=round(record['pointsAgainst'], 1))},
+                'transactionCounter': {'acquisitions': 0, 'drops': 0, 'trades': 0, 'acquisitionBudgetSpent': 0},
+                'roster': {'entries': [self._entry(player_id, slot, self._season_splits(self.players[player_id]))
+                                       for player_id, slot in self._slots(roster)]},
+            })
+        return {
+            'id': self.league_id, 'seasonId': self.season, 'scoringPeriodId': self.current_scoring_period,
+            'status': {'currentMatchupPeriod': self.current_matchup_period, 'firstScoringPeriod': 1,
+                       'finalScoringPeriod': self.final_scoring_period, 'previousSeasons': [self.season - 1]},
+            'settings': {
+                'name': f"Synthetic {self.teams}-team league", 'size': self.teams,
+                'scheduleSettings': {
+                    'matchupPeriodCount': self.matchup_periods,
+                    'matchupPeriods': {str(m): [m] for m in range(1, self.matchup_periods + 1)},
+                    'playoffTeamCount': min(self.teams, 6), 'playoffMatchupPeriodLength': 1,
+                    'playoffSeedingRule': 'TOTAL_POINTS_SCORED',
+                    'divisions': [{'id': 0, 'name': 'East'}, {'id': 1, 'name': 'West'}],
+                },
+                'tradeSettings': {'vetoVotesRequired': 4},
+                'draftSettings': {'keeperCount': 0},
+                'scoringSettings': {'matchupTieRule': 'NONE', 'playoffMatchupTieRule': 'NONE',
+                                    'scoringType': 'H2H_POINTS'},
+                'acquisitionSettings': {'isUsingAcquisitionBudget': False, 'acquisitionBudget': 0},
+            },
+            'members': members,
+            'teams': teams,
+            'schedule': self.schedule,
+        }
+
+    def pro_schedule(self) -> Dict[str, Any]:
+        pro_teams = [{'id': 0, 'abbrev': 'FA'}]
+        for pro_id, games in self.pro_games.items():
+            pro_teams.append({'id': pro_id, 'proGamesByScoringPeriod': {
+                str(day): [{'homeProTeamId': home, 'awayProTeamId': away,
+                            'date': self.start_ms + (day - 1) * 86_400_000, 'scoringPeriodId': day}]
+                for day, (home, away) in games.items()}})
+        return {'settings': {'proTeams': pro_teams}}
+
+    def pro_players(self) -> List[Dict[str, Any]]:
+        return [{'id': p['id'], 'fullName': p['name'], 'firstName': p['first'], 'lastName': p['last'],
+                 'defaultPositionId': p['position'], 'proTeamId': p['pro_team'], 'active': True}
+                for p in self.players.values()]
+
+    def cards(self) -> Dict[int, Any]:
+        return {player_id: {'id': player_id, 'onTeamId': self.owner.get(player_id, 0),
+                            'status': 'ONTEAM' if player_id in self.owner else 'FREEAGENT',
+                            'player': self._player(player, self._season_splits(player) + self._game_splits(player))}
+                for player_id, player in self.players.items()}
+
+    def box_scores(self, path: str, query: Dict[str, List[str]],
+                   filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        matchup_ids = set((filters or {}).get('schedule', {}).get('filterMatchupPeriodIds', {}).get('value', ()))
+        scoring_id = int(query.get('scoringPeriodId', [self.current_scoring_period])[0])
+        schedule = []
+        for matchup in self.schedule:
+            if matchup['matchupPeriodId'] not in matchup_ids:
+                continue
+            days = [day for day in self._period_days(matchup['matchupPeriodId']) if day <= scoring_id]
+            box = {'id': matchup['id'], 'matchupPeriodId': matchup['matchupPeriodId'], 'winner': matchup['winner']}
+            for side in ('home', 'away'):
+                box[side] = self._box_side(matchup[side]['teamId'], days, scoring_id)
+            schedule.append(box)
+        return {'schedule': schedule}
+
+    def _box_side(self, team_id: int, days: List[int], scoring_id: int) -> Dict[str, Any]:
+        period_entries, day_entries = [], []
+        period_total = day_total = 0.0
+        for player_id, slot in self._slots(self.rosters[team_id]):
+            games = self.players[player_id]['games']
+            period_line = _sum_lines([games[day] for day in days if day in games])
+            day_line = games.get(scoring_id, (0.0, {}))
+            if slot != BENCH_SLOT:
+                period_total += period_line[0]
+                day_total += day_line[0]
+            period_entries.append(self._entry(player_id, slot, [self._split('05', scoring_id, period_line)]))
+            day_entries.append(self._entry(player_id, slot, [self._split('05', scoring_id, day_line)]))
+        return {'teamId': team_id, 'totalPoints': round(period_total, 1), 'totalPointsLive': round(period_total, 1),
+                'rosterForMatchupPeriod': {'appliedStatTotal': round(period_total, 1), 'entries': period_entries},
+                'rosterForCurrentScoringPeriod': {'appliedStatTotal': round(day_total, 1), 'entries': day_entries}}
+
+    def free_agent_page(self, path: str, query: Dict[str, List[str]],
+                        filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        players = (filters or {}).get('players', {})
+        slots = set(players.get('filterSlotIds', {}).get('value', ()))
+        limit = players.get('limit', 50)
+        page = [p for p in self.free_agents if not slots or slots & set(ELIGIBLE_SLOTS[p['position']])][:limit]
+        return {'players': [{'id': p['id'], 'onTeamId': 0, 'status': 'FREEAGENT',
+                             'player': self._player(p, self._season_splits(p))} for p in page]}
+
+    def transactions(self, path: str, query: Dict[str, List[str]],
+                     filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        scoring_period = int(query.get('scoringPeriodId', [self.current_scoring_period])[0])
+        types = set((filters or {}).get('transactions', {}).get('filterType', {}).get('value', ()))
+        rng = random.Random(f"{self.seed}-{scoring_period}")
+        transactions = []
+        for idx in range(rng.randint(0, 4)):
+            team_id = rng.randint(1, self.teams)
+            kind = rng.choice(('FREEAGENT', 'WAIVER'))
+            if types and kind not in types:
+                continue
+            transactions.append({
+                'id': f"{scoring_period}-{idx}", 'teamId': team_id, 'type': kind, 'status': 'EXECUTED',
+                'scoringPeriodId': scoring_period, 'bidAmount': 0,
+                'processDate': self.start_ms + (scoring_period - 1) * 86_400_000 + idx * 60_000,
+                'items': [{'type': 'ADD', 'playerId': rng.choice(self.free_agents)['id'], 'fromTeamId': 0,
+                           'toTeamId': team_id},
+                          {'type': 'DROP', 'playerId': rng.choice(self.rosters[team_id]), 'fromTeamId': team_id,
+                           'toTeamId': 0}],
+            })
+        return {'transactions': transactions}
+
+
+def synthetic_league(teams: int = 12, seed: int = 1, season: int = 2026, league_id: int = 424242,
+                     matchup_periods: int = 20, days_per_period: int = 7, current_matchup_period: int = 11,
+                     roster_size: int = 13, pool_size: int = 500) -> Fixture:
+    """A deterministic `teams`-team points league, midway through its season, as a Fixture."""
+    league = _SyntheticLeague(teams, seed, season, league_id, matchup_periods, days_per_period,
+                              current_matchup_period, roster_size, pool_size)
+    fixture = Fixture({'name': f"synthetic-{teams}", 'source': 'synthetic', 'league_id': league_id,
+                       'season': season, 'teams': teams, 'seed': seed,
+                       'current_matchup_period': current_matchup_period,
+                       'current_scoring_period': league.current_scoring_period,
+                       'final_scoring_period': league.final_scoring_period},
+                      cards=league.cards())
+    league_path = f"{SPORT_ENDPOINT}seasons/{season}/segments/0/leagues/{league_id}"
+    season_path = f"{SPORT_ENDPOINT}seasons/{season}"
+    fixture.add(league_path, {'view': ['mTeam', 'mRoster', 'mMatchup', 'mSettings', 'mStandings']}, None,
+                league.league())
+    fixture.add(league_path, {'view': 'mMatchup'}, None, {'schedule': league.schedule})
+    fixture.add(league_path, {'view': 'mDraftDetail'}, None, {'draftDetail': {'drafted': True, 'picks': league.picks}})
+    fixture.add(season_path, {'view': 'proTeamSchedules_wl'}, None, league.pro_schedule())
+    fixture.add(f"{season_path}/players", {'view': 'players_wl'},
+                {'x-fantasy-filter': json.dumps({"filterActive": {"value": True}})}, league.pro_players())
+    fixture.handlers.update({
+        'mMatchupScore,mScoreboard': league.box_scores,
+        'kona_player_info': league.free_agent_page,
+        'mTransactions2': league.transactions,
+    })
+    return fixture
+
+
+def describe(fixture: Fixture) -> None:
+    print(fixture)
+    for key, value in sorted(fixture.meta.items()):
+        print(f"  {key}: {value}")
+    for key in sorted(fixture.responses):
+        print(f"  {len(orjson.dumps(fixture.responses[key])):>10}  {key}")
+    for view in sorted(set(fixture.handlers) - {'kona_playercard'}):
+        print(f"  {'generated':>10}  view={view}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    record_cmd = commands.add_parser('record', help="Record a live league into a fixture file")
+    record_cmd.add_argument('--out', required=True)
+    record_cmd.add_argument('--league-id', type=int, default=None)
+    record_cmd.add_argument('--season', type=int, default=None)
+    describe_cmd = commands.add_parser('describe', help="List the responses in a fixture")
+    describe_cmd.add_argument('path', nargs='?')
+    describe_cmd.add_argument('--teams', type=int, default=12)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        from dotenv import load_dotenv
+        load_dotenv()
+        started = time.perf_counter()
+        fixture = record(args.league_id or int(os.getenv("LEAGUE_ID", 9490871)),
+                         args.season or int(os.getenv("SEASON", 2026)),
+                         os.getenv("ESPN_S2", ""), os.getenv("SWID", ""),
+                         name=os.path.basename(args.out).split('.')[0])
+        fixture.save(args.out)
+        print(f"Recorded {fixture} in {time.perf_counter() - started:.1f}s -> {args.out}")
+    else:
+        describe(Fixture.load(args.path) if args.path else synthetic_league(args.teams))
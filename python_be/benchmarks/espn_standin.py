@@ -0,0 +1,132 @@
+"""Local stand-in for ESPN's fantasy API: replays a fixture with injected latency and errors.
+
+Serves /apis/v3/games/fba/... from a recorded fixture (or a synthetic league;
+see espn_fixtures.py), so the API can be load-tested without calling ESPN.
+Point the API at it with ESPN_BASE_URL, and use the fixture's league and season:
+
+    python benchmarks/espn_standin.py --teams 12 --latency-ms 120 --jitter-ms 60 --error-rate 0.01
+    ESPN_BASE_URL=http://127.0.0.1:8400/apis/v3/games/ LEAGUE_ID=424242 SEASON=2026 python main.py
+
+GET /__standin/stats returns request counts per view; POST /__standin/reset clears them.
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
+from espn_fixtures import Fixture, MissingFixture, normalize_request, synthetic_league
+
+
+LEAGUE_PATH = re.compile(r'/leagues/(\d+)')
+
+
+class StandInStats:
+    """Request counts per ESPN view, with injected errors and unknown requests."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = time.time()
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.missing: Counter = Counter()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'since': self.started,
+            'total': sum(self.requests.values()),
+            'errors': sum(self.errors.values()),
+            'missing': sum(self.missing.values()),
+            'requests': dict(self.requests),
+            'errors_by_view': dict(self.errors),
+            'missing_by_view': dict(self.missing),
+        }
+
+
+def create_app(fixtures: Union[Fixture, List[Fixture]], latency: float = 0.0, jitter: float = 0.0,
+               error_rate: float = 0.0, error_status: int = 503, seed: Optional[int] = None) -> FastAPI:
+    """ASGI app replaying `fixtures`; each response waits `latency` plus up to `jitter` seconds.
+
+    League requests go to the fixture for their league id; season-wide ones
+    (pro schedules and players) to the first fixture.
+    """
+    fixtures = fixtures if isinstance(fixtures, list) else [fixtures]
+    by_league = {str(fixture.meta['league_id']): fixture for fixture in fixtures}
+    app = FastAPI(title="ESPN stand-in", default_response_class=ORJSONResponse)
+    stats = StandInStats()
+    rng = random.Random(seed)
+    app.state.stats = stats
+
+    @app.get("/apis/v3/games/fba/{path:path}")
+    async def replay_request(request: Request, path: str):
+        params = request.query_params.multi_items()
+        _, query, _ = normalize_request(request.url.path, params)
+        view = ','.join(query.get('view', ())) or path.rsplit('/', 1)[-1]
+        stats.requests[view] += 1
+        delay = latency + (rng.uniform(0, jitter) if jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if error_rate and rng.random() < error_rate:
+            stats.errors[view] += 1
+            return ORJSONResponse({'messages': ['Injected error'], 'view': view}, status_code=error_status)
+        league = LEAGUE_PATH.search(path)
+        fixture = by_league.get(league.group(1)) if league else fixtures[0]
+        try:
+            if fixture is None:
+                raise MissingFixture(path)
+            body = fixture.respond(request.url.path, params, request.headers)
+        except MissingFixture as e:
+            stats.missing[view] += 1
+            return ORJSONResponse({'messages': [f"No fixture for {e}"]}, status_code=404)
+        return Response(content=body, media_type='application/json')
+
+    @app.get("/__standin/stats")
+    async def get_stats():
+        return stats.report()
+
+    @app.post("/__standin/reset")
+    async def reset_stats():
+        stats.reset()
+        return stats.report()
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixture', help="Recorded fixture file (default: a synthetic league)")
+    parser.add_argument('--teams', type=int, default=12, help="Synthetic league size")
+    parser.add_argument('--leagues', type=int, default=1,
+                        help="Synthetic leagues to serve, with consecutive league ids and seeds")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8400)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Uniform random extra latency, up to this")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    if args.fixture:
+        fixtures = [Fixture.load(args.fixture)]
+    else:
+        fixtures = [synthetic_league(args.teams, seed=1 + i, league_id=424242 + i) for i in range(args.leagues)]
+    fixture = fixtures[0]
+    league_ids = ' '.join(str(f.meta['league_id']) for f in fixtures)
+    print(f"Replaying {fixture} for leagues {league_ids}, season {fixture.meta['season']}")
+    print(f"  ESPN_BASE_URL=http://{args.host}:{args.port}/apis/v3/games/ "
+          f"LEAGUE_ID={fixture.meta['league_id']} SEASON={fixture.meta['season']}")
+    uvicorn.run(create_app(fixtures, args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate,
+                           args.error_status, args.seed),
+                host=args.host, port=args.port, log_level='warning', access_log=False)
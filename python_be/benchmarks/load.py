@@ -0,0 +1,242 @@
+"""Drive the API's /api/v1 routes at a target request rate and report what it sustained.
+
+Requests go out open-loop: request i is due at start + i / rps no matter how
+earlier ones fared. Latency is measured from that due time, so a saturated
+server shows up as growing latency, not as a quietly lower request rate.
+Team and player ids for parameterized routes are discovered from the API
+first. With --standin, the ESPN stand-in's counters are read before and after
+the run to report upstream requests per view and per API request.
+
+    python benchmarks/load.py --rps 50 --duration 30 --standin http://127.0.0.1:8400
+    python benchmarks/load.py --rps 200 --routes fantasycast=3 player_stats=1 --json report.json
+    python benchmarks/load.py --rps 50 --leagues 424242 424243 424244 424245
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# name: (weight, path template)
+ROUTES = {
+    'standings': (10, '/api/v1/league/standings'),
+    'scoreboard': (10, '/api/v1/league/scoreboard'),
+    'fantasycast': (15, '/api/v1/league/fantasycast'),
+    'teams': (5, '/api/v1/teams'),
+    'team': (10, '/api/v1/team/{team_id}'),
+    'player_stats': (20, '/api/v1/players/stats/{player_id}'),
+    'compare': (5, '/api/v1/players/compare?player1_id={player_id}&player2_id={other_player_id}'),
+    'search': (10, '/api/v1/players/search?q={query}'),
+    'rankings': (10, '/api/v1/players/rankings?limit=50'),
+    'hot_cold': (5, '/api/v1/players/hot-cold'),
+}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))]
+
+
+async def discover(http: httpx.AsyncClient) -> Dict[str, List[Any]]:
+    """Team ids, player ids and name prefixes to fill route templates with."""
+    teams = (await http.get('/api/v1/teams', params={'page_size': 50, 'fields': 'team_id'})).json()
+    players = (await http.get('/api/v1/players/rankings', params={'limit': 200, 'fields': 'playerId,name'})).json()
+    if not isinstance(players, list) or not players:
+        raise RuntimeError(f"Could not discover players from the API: {players}")
+    return {
+        'team_id': [team['team_id'] for team in teams['items']],
+        'player_id': [player['playerId'] for player in players],
+        'query': sorted({player['name'][:4].lower() for player in players if player.get('name')}),
+    }
+
+
+async def upstream_stats(standin: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not standin:
+        return None
+    async with httpx.AsyncClient(base_url=standin) as http:
+        return (await http.get('/__standin/stats')).json()
+
+
+class LoadRun:
+    """Schedules requests at a fixed rate and collects their outcomes per route."""
+
+    def __init__(self, http: httpx.AsyncClient, routes: Dict[str, Tuple[int, str]], values: Dict[str, List[Any]],
+                 rps: float, duration: float, warmup: float, seed: int, leagues: Optional[List[int]] = None):
+        self.http = http
+        self.leagues = leagues or []
+        self.names = list(routes)
+        self.weights = [routes[name][0] for name in self.names]
+        self.templates = {name: path for name, (_, path) in routes.items()}
+        self.values = values
+        self.rps = rps
+        self.duration = duration
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.bytes = 0
+        self.elapsed = 0.0
+
+    def _path(self, name: str) -> str:
+        player_ids = self.values['player_id']
+        player_id, other_player_id = self.rng.sample(player_ids, 2) if len(player_ids) > 1 else player_ids * 2
+        path = self.templates[name]
+        if self.leagues:
+            path = f"/api/v1/leagues/{self.rng.choice(self.leagues)}/" + path[len('/api/v1/'):]
+        return path.format(team_id=self.rng.choice(self.values['team_id']), player_id=player_id,
+                           other_player_id=other_player_id, query=self.rng.choice(self.values['query']))
+
+    async def _send(self, name: str, path: str, due: float, record: bool) -> None:
+        loop = asyncio.get_running_loop()
+        size = 0
+        try:
+            # Raw bytes: the client shouldn't spend the run decompressing.
+            async with self.http.stream('GET', path) as response:
+                async for chunk in response.aiter_raw():
+                    size += len(chunk)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if record:
+            self.latencies[name].append((loop.time() - due) * 1000)
+            self.statuses[name][status] += 1
+            self.bytes += size
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        total = int((self.warmup + self.duration) * self.rps)
+        start = loop.time() + 0.05
+        tasks = []
+        for i in range(total):
+            due = start + i / self.rps
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            name = self.rng.choices(self.names, self.weights)[0]
+            record = i >= self.warmup * self.rps
+            tasks.append(asyncio.create_task(self._send(name, self._path(name), due, record)))
+        await asyncio.gather(*tasks)
+        self.elapsed = loop.time() - start - self.warmup
+
+    def report(self) -> Dict[str, Any]:
+        routes = {}
+        for name in self.names:
+            samples = self.latencies.get(name, [])
+            if samples:
+                routes[name] = self._summary(samples, self.statuses[name])
+        everything = [sample for samples in self.latencies.values() for sample in samples]
+        statuses = sum(self.statuses.values(), Counter())
+        return {
+            'target_rps': self.rps,
+            'seconds': round(self.elapsed, 2),
+            'throughput_rps': round(len(everything) / self.elapsed, 1) if self.elapsed else 0.0,
+            'ok_rps': round(sum(n for s, n in statuses.items() if s.startswith('2')) / self.elapsed, 1)
+            if self.elapsed else 0.0,
+            'megabytes': round(self.bytes / 2**20, 2),
+            'overall': self._summary(everything, statuses),
+            'routes': routes,
+        }
+
+    @staticmethod
+    def _summary(samples: List[float], statuses: Counter) -> Dict[str, Any]:
+        return {
+            'requests': len(samples),
+            'p50_ms': round(percentile(samples, 0.50), 1),
+            'p90_ms': round(percentile(samples, 0.90), 1),
+            'p99_ms': round(percentile(samples, 0.99), 1),
+            'max_ms': round(max(samples), 1) if samples else 0.0,
+            'statuses': dict(statuses),
+        }
+
+
+def upstream_delta(before: Dict[str, Any], after: Dict[str, Any], api_requests: int) -> Dict[str, Any]:
+    views = {view: count - before['requests'].get(view, 0) for view, count in after['requests'].items()}
+    views = {view: count for view, count in views.items() if count}
+    total = sum(views.values())
+    return {
+        'requests': total,
+        'per_api_request': round(total / api_requests, 3) if api_requests else 0.0,
+        'errors': after['errors'] - before['errors'],
+        'missing': after['missing'] - before['missing'],
+        'views': dict(sorted(views.items(), key=lambda item: -item[1])),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    overall = report['overall']
+    print(f"\n{report['seconds']}s at target {report['target_rps']} rps: {report['throughput_rps']} rps completed, "
+          f"{report['ok_rps']} rps OK, {report['megabytes']} MB received")
+    print(f"{'route':<14} {'requests':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses")
+    for name, summary in list(report['routes'].items()) + [('all', overall)]:
+        statuses = ' '.join(f"{status}:{count}" for status, count in sorted(summary['statuses'].items()))
+        print(f"{name:<14} {summary['requests']:>8} {summary['p50_ms']:>8.1f} {summary['p90_ms']:>8.1f} "
+              f"{summary['p99_ms']:>8.1f} {summary['max_ms']:>8.1f}  {statuses}")
+    upstream = report.get('upstream')
+    if upstream:
+        print(f"\nupstream: {upstream['requests']} ESPN requests ({upstream['per_api_request']} per API request), "
+              f"{upstream['errors']} injected errors, {upstream['missing']} without a fixture")
+        for view, count in upstream['views'].items():
+            print(f"  {view:<40} {count:>7}")
+
+
+def parse_routes(specs: Optional[List[str]]) -> Dict[str, Tuple[int, str]]:
+    if not specs:
+        return ROUTES
+    routes = {}
+    for spec in specs:
+        name, _, weight = spec.partition('=')
+        if name not in ROUTES:
+            raise SystemExit(f"Unknown route {name!r}; choose from {', '.join(ROUTES)}")
+        routes[name] = (int(weight or 1), ROUTES[name][1])
+    return routes
+
+
+async def main(args) -> int:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout, pool=None)
+    headers = {'accept-encoding': 'br, gzip'}
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout, headers=headers) as http:
+        values = await discover(http)
+        print(f"Discovered {len(values['team_id'])} teams and {len(values['player_id'])} players; "
+              f"running {args.warmup + args.duration:.0f}s at {args.rps} rps "
+              f"({args.warmup:.0f}s warmup, up to {args.concurrency} connections)")
+        before = await upstream_stats(args.standin)
+        run = LoadRun(http, parse_routes(args.routes), values, args.rps, args.duration, args.warmup, args.seed,
+                      args.leagues)
+        await run.run()
+        report = run.report()
+    after = await upstream_stats(args.standin)
+    if before and after:
+        # Warmup requests are included here; the stand-in can't tell them apart.
+        report['upstream'] = upstream_delta(before, after, int((args.warmup + args.duration) * args.rps))
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default=os.getenv("API_URL", 'http://127.0.0.1:8000'))
+    parser.add_argument('--standin', default=None, help="ESPN stand-in URL, for upstream call counts")
+    parser.add_argument('--rps', type=float, default=20)
+    parser.add_argument('--duration', type=float, default=30, help="Measured seconds")
+    parser.add_argument('--warmup', type=float, default=0, help="Seconds at the same rate before measuring")
+    parser.add_argument('--concurrency', type=int, default=64, help="Maximum open connections")
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--routes', nargs='+', metavar='NAME=WEIGHT', help=f"Route mix from: {', '.join(ROUTES)}")
+    parser.add_argument('--leagues', type=int, nargs='+', metavar='LEAGUE_ID',
+                        help="Spread requests over /api/v1/leagues/{id}/... for these leagues")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help="Also write the report here")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,135 @@
+"""Compare memory held by a full season of box scores as dicts vs slotted records.
+
+Builds synthetic espn_api-like box scores for every scoring period (strings are
+fresh objects, as they would be after JSON decoding), maps them with the old
+per-player dict mapping and with `espn_client.map_box_scores`, drops the
+source objects and reports what each result keeps alive. Each mode runs in its
+own process so resident set sizes are comparable.
+
+    python benchmarks/record_memory.py --periods 165 --teams 12
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'G', 'F']
+PRO_TEAMS = ['LAL', 'BOS', 'GSW', 'DEN', 'MIL', 'PHX', 'DAL', 'MIA', 'NYK', 'OKC']
+STATUSES = ['ACTIVE', 'DAY_TO_DAY', 'OUT']
+LINEUP_SIZE = 13
+
+
+def fresh(value: str) -> str:
+    # A new string object with the same text, like json.loads would produce.
+    return json.loads(json.dumps(value))
+
+
+def make_season(periods: int, teams: int, seed: int = 3):
+    rng = random.Random(seed)
+    team_objs = [SimpleNamespace(team_id=t, team_name=f'Team {t}') for t in range(teams)]
+    stats = {}  # shared: the same Player.stats dict is referenced by both mappings
+    season = []
+    for period in range(1, periods + 1):
+        box_scores = []
+        for home, away in zip(team_objs[::2], team_objs[1::2]):
+            lineups = []
+            for team in (home, away):
+                lineups.append([SimpleNamespace(
+                    name=fresh(f'Player {team.team_id}-{slot}'),
+                    position=fresh(rng.choice(POSITIONS)),
+                    points=round(rng.uniform(0, 60), 1),
+                    projected_points=round(rng.uniform(0, 50), 1),
+                    stats=stats,
+                    injuryStatus=fresh(rng.choice(STATUSES)),
+                    starting=slot < 10,
+                    proTeam=fresh(rng.choice(PRO_TEAMS)),
+                ) for slot in range(LINEUP_SIZE)])
+            box_scores.append(SimpleNamespace(
+                home_team=home, away_team=away,
+                home_score=round(rng.uniform(80, 140), 1), away_score=round(rng.uniform(80, 140), 1),
+                home_projected=0, away_projected=0,
+                home_lineup=lineups[0], away_lineup=lineups[1],
+            ))
+        season.append(box_scores)
+    return season
+
+
+def map_box_scores_dicts(box_scores):
+    """The per-player dict mapping get_box_scores used before slotted records."""
+    def lineup(players):
+        return [{
+            'name': getattr(p, 'name', None),
+            'position': getattr(p, 'position', None),
+            'points': getattr(p, 'points', 0),
+            'projected': getattr(p, 'projected_points', 0),
+            'stats': getattr(p, 'stats', {}),
+            'injuryStatus': getattr(p, 'injuryStatus', None),
+            'starting': getattr(p, 'starting', False),
+            'proTeam': getattr(p, 'proTeam', None)
+        } for p in players]
+
+    return [{
+        side: {
+            'team_id': getattr(getattr(bs, side), 'team_id', None),
+            'team_name': getattr(getattr(bs, side), 'team_name', None),
+            'score': getattr(bs, side.replace('team', 'score'), 0),
+            'projected': getattr(bs, side.replace('team', 'projected'), 0),
+            'lineup': lineup(getattr(bs, side.replace('team', 'lineup'), [])),
+        } for side in ('home_team', 'away_team')
+    } for bs in box_scores]
+
+
+def rss_bytes() -> int:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def measure(mode: str, periods: int, teams: int) -> dict:
+    if mode == 'records':
+        from espn_client import map_box_scores
+    else:
+        map_box_scores = map_box_scores_dicts
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    season = make_season(periods, teams)
+    result = [map_box_scores(box_scores) for box_scores in season]
+    del season
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    players = sum(len(bs['home_team']['lineup']) + len(bs['away_team']['lineup']) for day in result for bs in day)
+    return {'mode': mode, 'players': players, 'held_bytes': held, 'rss_growth_bytes': rss_bytes() - rss_before}
+
+
+def main(periods: int, teams: int) -> int:
+    results = []
+    for mode in ('dicts', 'records'):
+        out = subprocess.run([sys.executable, __file__, '--mode', mode, '--periods', str(periods), '--teams', str(teams)],
+                             capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    print(f"{'mode':>8} {'player rows':>12} {'held MB':>9} {'RSS growth MB':>14}")
+    for r in results:
+        print(f"{r['mode']:>8} {r['players']:>12} {r['held_bytes'] / 2**20:>9.1f} {r['rss_growth_bytes'] / 2**20:>14.1f}")
+    dicts, records = results
+    print(f"records hold {100 * (1 - records['held_bytes'] / dicts['held_bytes']):.0f}% less memory")
+    return 0 if records['held_bytes'] < dicts['held_bytes'] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--periods', type=int, default=165)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--mode', choices=('dicts', 'records'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.periods, args.teams)))
+        sys.exit(0)
+    sys.exit(main(args.periods, args.teams))
@@ -0,0 +1,101 @@
+"""Compare JSON encoding paths on box-score-sized payloads.
+
+Builds one week of fantasycast box scores (records with full per-period stat
+lines), then measures bytes per second for FastAPI's default path
+(jsonable_encoder + json), jsonable_encoder + orjson, direct orjson encoding of
+the records, and a pre-encoded cache hit.
+
+    python benchmarks/response_encoding.py --teams 12 --periods 40
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from espn_client import map_box_scores
+from http_cache import EncodedCache, encode_json
+
+STATS = ['PTS', 'BLK', 'STL', 'AST', 'OREB', 'DREB', 'TO', 'FGM', 'FGA', 'FTM', 'FTA', '3PM', '3PA', 'REB', 'MIN']
+LINEUP_SIZE = 13
+
+
+def player_stats(rng: random.Random, periods: int) -> dict:
+    start = datetime(2025, 10, 21)
+    stats = {}
+    for period in range(1, periods + 1):
+        stats[str(period)] = {
+            'applied_total': round(rng.uniform(0, 60), 1),
+            'team': 'LAL',
+            'date': start + timedelta(days=period),
+            'total': {name: float(rng.randint(0, 12)) for name in STATS},
+        }
+    stats['2026_total'] = {'applied_total': round(rng.uniform(500, 2500), 1), 'applied_avg': 30.0,
+                           'total': {name: float(rng.randint(0, 400)) for name in STATS}}
+    return stats
+
+
+def make_box_scores(teams: int, periods: int, seed: int = 11):
+    rng = random.Random(seed)
+    team_objs = [SimpleNamespace(team_id=t, team_name=f'Team {t}') for t in range(teams)]
+    box_scores = []
+    for home, away in zip(team_objs[::2], team_objs[1::2]):
+        lineups = [[SimpleNamespace(
+            name=f'Player {team.team_id}-{slot}', position='PG', points=round(rng.uniform(0, 60), 1),
+            projected_points=round(rng.uniform(0, 50), 1), stats=player_stats(rng, periods),
+            injuryStatus='ACTIVE', starting=slot < 10, proTeam='LAL',
+        ) for slot in range(LINEUP_SIZE)] for team in (home, away)]
+        box_scores.append(SimpleNamespace(
+            home_team=home, away_team=away, home_score=110.5, away_score=98.0, home_projected=0, away_projected=0,
+            home_lineup=lineups[0], away_lineup=lineups[1],
+        ))
+    return map_box_scores(box_scores)
+
+
+def best_of(fn, repeat: int):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(teams: int, periods: int, repeat: int) -> int:
+    payload = make_box_scores(teams, periods)
+    cache = EncodedCache()
+    cache.set('"week"', encode_json(payload))
+
+    paths = [
+        ('jsonable_encoder + json', lambda: json.dumps(jsonable_encoder(payload), separators=(',', ':')).encode()),
+        ('jsonable_encoder + orjson', lambda: orjson.dumps(jsonable_encoder(payload))),
+        ('orjson (records)', lambda: encode_json(payload)),
+        ('pre-encoded cache hit', lambda: cache.get('"week"')),
+    ]
+    reference = json.loads(paths[0][1]())
+    print(f"{'path':>26} {'ms':>9} {'MB/s':>10} {'speedup':>8}")
+    baseline = None
+    ok = True
+    for name, fn in paths:
+        seconds, body = best_of(fn, repeat)
+        ok = ok and json.loads(body) == reference
+        baseline = baseline or seconds
+        print(f"{name:>26} {seconds * 1000:>9.2f} {len(body) / seconds / 2**20:>10.1f} {baseline / seconds:>7.1f}x")
+    print(f"payload: {len(body) / 2**20:.2f} MB, identical output: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--periods', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(main(args.teams, args.periods, args.repeat))
@@ -0,0 +1,79 @@
+"""Compare the loop and vectorized league/matchup statistics.
+
+Generates synthetic seasons (teams x weeks of matchups), checks that both
+engines return identical results, and times them as the matchup count grows.
+
+    python benchmarks/stats_engine.py --teams 12 --seasons 1 2 5 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stats import (
+    calculate_league_stats,
+    calculate_league_stats_vectorized,
+    MatchupColumns,
+    TeamColumns,
+)
+
+WEEKS_PER_SEASON = 20
+
+
+def make_league(teams: int, seasons: int, seed: int = 7):
+    rng = random.Random(seed)
+    team_rows = [{
+        'team_name': f'Team {i}',
+        'wins': rng.randint(0, 20),
+        'losses': rng.randint(0, 20),
+        'points_for': round(rng.uniform(8000, 12000), 2),
+    } for i in range(teams)]
+    matchups = []
+    for _ in range(seasons * WEEKS_PER_SEASON):
+        order = list(range(teams))
+        rng.shuffle(order)
+        for home, away in zip(order[::2], order[1::2]):
+            matchups.append({
+                'home_team': {'team_name': f'Team {home}', 'score': round(rng.uniform(400, 700), 2)},
+                'away_team': {'team_name': f'Team {away}', 'score': round(rng.uniform(400, 700), 2)},
+            })
+    return team_rows, matchups
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(teams: int, seasons_list, repeat: int) -> int:
+    print(f"{'matchups':>10} {'loop ms':>10} {'numpy ms':>10} {'numpy (prebuilt) ms':>20} {'speedup':>8}")
+    ok = True
+    for seasons in seasons_list:
+        team_rows, matchups = make_league(teams, seasons)
+        expected = calculate_league_stats(team_rows, matchups)
+        actual = calculate_league_stats_vectorized(team_rows, matchups)
+        ok &= expected == actual
+
+        team_cols, matchup_cols = TeamColumns(team_rows), MatchupColumns(matchups)
+        loop = best_of(lambda: calculate_league_stats(team_rows, matchups), repeat)
+        vectorized = best_of(lambda: calculate_league_stats_vectorized(team_rows, matchups), repeat)
+        prebuilt = best_of(lambda: calculate_league_stats_vectorized(team_cols, matchup_cols), repeat)
+        print(f"{len(matchups):>10} {loop * 1000:>10.3f} {vectorized * 1000:>10.3f} {prebuilt * 1000:>20.3f} {loop / prebuilt:>7.1f}x")
+    print("outputs identical" if ok else "OUTPUTS DIFFER")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 5, 25, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(main(args.teams, args.seasons, args.repeat))
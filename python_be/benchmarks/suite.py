@@ -0,0 +1,513 @@
+"""Upstream-free benchmark suite: ESPNClient mapping, stats, player stats and every API route.
+
+Replays ESPN fixtures (synthetic leagues of several sizes, or recorded ones;
+see espn_fixtures.py) through espn_api, so nothing leaves the process. Each
+case reports latency percentiles over many runs and the peak memory one run
+allocates (tracemalloc, in a separate pass so tracing doesn't skew timings).
+Route cases call the ASGI app directly on one event loop (no sockets, and no
+client-side decompression in the numbers), warm (caches populated) and cold
+(response, encoded-body and page caches dropped before every request, so each
+one replays ESPN, maps, encodes and compresses). Every case stops after
+--budget seconds once it has at least MIN_RUNS samples.
+
+Save a baseline, then compare later runs against it; a case whose p50 or
+allocation grows by more than the threshold makes the run exit non-zero.
+
+    python benchmarks/suite.py --save-baseline
+    python benchmarks/suite.py --compare --threshold 0.25
+    python benchmarks/suite.py --teams 12 --group routes --filter fantasycast
+    python benchmarks/suite.py --fixture benchmarks/fixtures/my-league.json.gz
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from espn_fixtures import Fixture, replay, synthetic_league
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+GROUPS = ('mapping', 'client', 'stats', 'player_stats', 'routes')
+WARMUP = 3
+MIN_RUNS = 5
+# Differences below these are noise, whatever the percentage.
+MIN_MS_DELTA = 0.05
+MIN_KIB_DELTA = 16.0
+
+
+class Case:
+    """One benchmarked call. `setup` runs untimed before every call."""
+
+    def __init__(self, group: str, name: str, fn: Callable[[], Any],
+                 setup: Optional[Callable[[], None]] = None, cold: bool = False):
+        self.group = group
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.cold = cold
+
+    @property
+    def key(self) -> str:
+        return f"{self.group}/{self.name}"
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))]
+
+
+def measure(case: Case, iterations: int, alloc_runs: int, budget: float) -> Dict[str, float]:
+    # Cold runs repeat the same work every time, so they need no warming up.
+    for _ in range(0 if case.cold else WARMUP):
+        if case.setup:
+            case.setup()
+        case.fn()
+    samples = []
+    deadline = time.perf_counter() + budget
+    for _ in range(iterations):
+        if case.setup:
+            case.setup()
+        started = time.perf_counter_ns()
+        case.fn()
+        samples.append((time.perf_counter_ns() - started) / 1e6)
+        if len(samples) >= MIN_RUNS and time.perf_counter() > deadline:
+            break
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_runs):
+            if case.setup:
+                case.setup()
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            case.fn()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return {
+        'runs': len(samples),
+        'p50_ms': round(percentile(samples, 0.50), 4),
+        'p95_ms': round(percentile(samples, 0.95), 4),
+        'p99_ms': round(percentile(samples, 0.99), 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'peak_kib': round(statistics.median(peaks) / 1024, 1),
+    }
+
+
+class ASGIResponse:
+    def __init__(self, status_code: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(errors='replace')
+
+
+class ASGIClient:
+    """Sends GET requests straight to an ASGI app on a private event loop."""
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self.loop.close()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> ASGIResponse:
+        return self.loop.run_until_complete(self._get(url, headers or {}))
+
+    async def _get(self, url: str, headers: Dict[str, str]) -> ASGIResponse:
+        parts = urlsplit(url)
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': parts.path, 'raw_path': parts.path.encode(),
+            'query_string': parts.query.encode(), 'root_path': '',
+            'headers': [(b'host', b'benchmark')] + [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            'client': ('127.0.0.1', 50000), 'server': ('benchmark', 80),
+        }
+        done = asyncio.Event()
+        sent = False
+        status, response_headers, chunks = 0, [], []
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Streaming responses listen for a disconnect; it only comes once the response is done.
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message['type'] == 'http.response.start':
+                status, response_headers = message['status'], message.get('headers', [])
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+                if not message.get('more_body'):
+                    done.set()
+
+        await self.app(scope, receive, send)
+        done.set()
+        return ASGIResponse(status, response_headers, b''.join(chunks))
+
+
+class FixtureApp:
+    """The client, async client and API routes wired to one fixture."""
+
+    def __init__(self, fixture: Fixture):
+        import espn_client
+        import async_espn_client
+        import client_pool
+
+        self.fixture = fixture
+        os.environ.update(LEAGUE_ID=str(fixture.meta['league_id']), SEASON=str(fixture.meta['season']),
+                          SEASON_STORE_PATH='', LEAGUE_REFRESH_INTERVAL='0')
+        # Both clients are singletons; drop the previous fixture's instances and pool.
+        espn_client.ESPNClient._instance = None
+        async_espn_client.AsyncESPNClient._instance = None
+        client_pool.pool = client_pool.ClientPool()
+        if 'routes' in sys.modules:
+            self.routes = importlib.reload(sys.modules['routes'])
+        else:
+            self.routes = importlib.import_module('routes')
+        self.league = client_pool.pool.default()
+        self.client = self.league.client
+        client_pool.pool._http = httpx.AsyncClient(transport=fixture.httpx_transport())
+
+        from fastapi import FastAPI
+        from fastapi.responses import ORJSONResponse
+        app = FastAPI(default_response_class=ORJSONResponse)
+        app.include_router(self.routes.router)
+        self.app = app
+
+    def reset_caches(self) -> None:
+        """Forget everything served so far, as after a restart (the league snapshot stays)."""
+        import http_cache
+        from pagination import PageIndexes
+        from player_table import PlayerTable
+
+        self.client.cache.invalidate()
+        self.client.player_table = PlayerTable()
+        http_cache.encoded_cache = http_cache.EncodedCache()
+        self.league.page_indexes = PageIndexes()
+        self.league.row_versions = http_cache.RowVersions()
+
+
+def player_data(player: Dict[str, Any], season: int) -> Dict[str, Any]:
+    """Reshape a player record into the dict calculate_player_stats reads."""
+    stats = player.get('stats') or {}
+    total = stats.get(f"{season}_total", {})
+    games = [{'points': value.get('applied_total', 0), 'opponent': value.get('team')}
+             for _, value in sorted((int(key), value) for key, value in stats.items() if str(key).isdigit())]
+    return dict(player, stats={'gameStats': games, 'totalStats': total.get('total') or {},
+                               'averageStats': total.get('avg') or {}})
+
+
+def mapping_cases(app: FixtureApp) -> List[Case]:
+    from espn_client import (TRANSACTION_TYPES, map_box_scores, map_free_agents, map_players, map_scoreboard,
+                             map_standings, map_transactions)
+
+    league = app.client.league
+    standings = league.standings()
+    matchups = league.scoreboard()
+    box_scores = league.box_scores()
+    roster_ids = [player.playerId for team in league.teams for player in team.roster]
+    players = league.player_info(playerId=roster_ids)
+    free_agents = league.free_agents(size=100)
+    transactions = league.transactions(types=TRANSACTION_TYPES)
+    return [
+        Case('mapping', 'map_standings', lambda: map_standings(standings)),
+        Case('mapping', 'map_scoreboard', lambda: map_scoreboard(matchups)),
+        Case('mapping', 'map_box_scores', lambda: map_box_scores(box_scores)),
+        Case('mapping', 'map_players', lambda: map_players(players)),
+        Case('mapping', 'map_players(no stats)', lambda: map_players(players, include_stats=False)),
+        Case('mapping', 'map_free_agents', lambda: map_free_agents(free_agents)),
+        Case('mapping', 'map_transactions', lambda: map_transactions(transactions)),
+    ]
+
+
+def client_cases(app: FixtureApp) -> List[Case]:
+    from player_table import PlayerTable
+
+    client = app.client
+    league = client.league
+    roster_ids = [player.playerId for player in league.teams[0].roster]
+    past_period = max(1, league.currentMatchupPeriod - 2)
+    name = league.teams[0].roster[0].name
+
+    def fresh_table():
+        client.cache.invalidate()
+        client.player_table = PlayerTable()
+
+    cold = lambda: client.cache.invalidate()
+    return [
+        Case('client', 'League()', client._build_league, cold=True),
+        Case('client', 'get_standings', client.get_standings, cold, cold=True),
+        Case('client', 'get_scoreboard', client.get_scoreboard, cold, cold=True),
+        Case('client', 'get_box_scores', client.get_box_scores, cold, cold=True),
+        Case('client', 'get_box_scores(past)', lambda: client.get_box_scores(matchup_period=past_period), cold,
+             cold=True),
+        Case('client', 'get_box_scores(daily)',
+             lambda: client.get_box_scores(scoring_period=league.current_week - 1, matchup_total=False), cold,
+             cold=True),
+        Case('client', 'get_free_agents', lambda: client.get_free_agents(size=100), cold, cold=True),
+        Case('client', 'get_player_info', lambda: client.get_player_info(player_ids=roster_ids), cold, cold=True),
+        Case('client', 'get_player_info(no stats)',
+             lambda: client.get_player_info(player_ids=roster_ids, include_stats=False), cold, cold=True),
+        Case('client', 'get_player_table', client.get_player_table, fresh_table, cold=True),
+        Case('client', 'get_team', lambda: client.get_team(1)),
+        Case('client', 'get_player_id_by_name', lambda: client.get_player_id_by_name(name)),
+        Case('client', 'search_players', lambda: client.search_players(name[:4].lower())),
+    ]
+
+
+def stats_cases(app: FixtureApp) -> List[Case]:
+    import stats
+
+    client = app.client
+    teams = client.get_standings()
+    matchups = [matchup for period in range(1, client.league.currentMatchupPeriod + 1)
+                for matchup in client.get_scoreboard(period) or ()]
+    rosters = [client.get_player_info(player_ids=[p.playerId for p in team.roster]) for team in client.league.teams]
+    matchup_columns = stats.MatchupColumns(matchups)
+    team_columns = stats.TeamColumns(teams)
+    return [
+        Case('stats', 'calculate_team_stats', lambda: [stats.calculate_team_stats(team) for team in teams]),
+        Case('stats', 'calculate_roster_stats', lambda: [stats.calculate_roster_stats(roster) for roster in rosters]),
+        Case('stats', 'calculate_matchup_stats', lambda: stats.calculate_matchup_stats(matchups)),
+        Case('stats', 'calculate_league_stats', lambda: stats.calculate_league_stats(teams, matchups)),
+        Case('stats', 'MatchupColumns', lambda: stats.MatchupColumns(matchups)),
+        Case('stats', 'TeamColumns', lambda: stats.TeamColumns(teams)),
+        Case('stats', 'calculate_matchup_stats_vectorized',
+             lambda: stats.calculate_matchup_stats_vectorized(matchup_columns)),
+        Case('stats', 'calculate_league_stats_vectorized',
+             lambda: stats.calculate_league_stats_vectorized(team_columns, matchup_columns)),
+    ]
+
+
+def player_stats_cases(app: FixtureApp) -> List[Case]:
+    import player_stats
+
+    client = app.client
+    season = client.league.year
+    players = client.get_player_table().ranked() + (client.get_free_agents(size=100) or [])
+    data = [player_data(player, season) for player in players]
+    calculated = [player_stats.calculate_player_stats(player) for player in data]
+    pairs = list(zip(calculated[::2], calculated[1::2]))
+    opponent = {'proTeam': 'BOS'}
+    matrix = player_stats.build_game_matrix(players, columns=8)
+    return [
+        Case('player_stats', 'calculate_player_stats',
+             lambda: [player_stats.calculate_player_stats(player) for player in data]),
+        Case('player_stats', 'get_player_comparison',
+             lambda: [player_stats.get_player_comparison(a, b) for a, b in pairs]),
+        Case('player_stats', 'calculate_position_rankings', lambda: player_stats.calculate_position_rankings(data)),
+        Case('player_stats', 'calculate_position_rankings(PG)',
+             lambda: player_stats.calculate_position_rankings(data, position='PG')),
+        Case('player_stats', 'get_player_trends',
+             lambda: [player_stats.get_player_trends(player) for player in calculated]),
+        Case('player_stats', 'get_matchup_analysis',
+             lambda: [player_stats.get_matchup_analysis(player, opponent) for player in calculated]),
+        Case('player_stats', 'get_game_points', lambda: [player_stats.get_game_points(p, last=8) for p in players]),
+        Case('player_stats', 'build_game_matrix', lambda: player_stats.build_game_matrix(players)),
+        Case('player_stats', 'get_league_trends', lambda: player_stats.get_league_trends(players)),
+        Case('player_stats', 'get_league_trends(matrix)', lambda: player_stats.get_league_trends(players, matrix=matrix)),
+        Case('player_stats', 'get_trending_board', lambda: player_stats.get_trending_board(players)),
+    ]
+
+
+def route_paths(app: FixtureApp) -> Dict[str, str]:
+    league = app.client.league
+    player1, player2 = (player.playerId for player in league.teams[0].roster[:2])
+    end = league.current_week - 1
+    return {
+        '/league/standings': '/api/v1/league/standings',
+        '/league/scoreboard': '/api/v1/league/scoreboard',
+        '/league/fantasycast': '/api/v1/league/fantasycast',
+        '/league/fantasycast?fields': '/api/v1/league/fantasycast?fields=name,points',
+        '/league/export/box-scores': f"/api/v1/league/export/box-scores?start={max(1, end - 6)}&end={end}",
+        '/teams': '/api/v1/teams?sort_by=points_for',
+        '/team/{team_id}': f"/api/v1/team/{league.teams[0].team_id}?include_schedule=true",
+        '/players/stats/{player_id}': f"/api/v1/players/stats/{player1}",
+        '/players/search': f"/api/v1/players/search?q={league.teams[0].roster[0].name[:4].lower()}",
+        '/players/compare': f"/api/v1/players/compare?player1_id={player1}&player2_id={player2}",
+        '/players/rankings': '/api/v1/players/rankings?limit=50',
+        '/players/trending': '/api/v1/players/trending',
+        '/players/hot-cold': '/api/v1/players/hot-cold',
+        '/leagues/{league_id}/league/standings': f"/api/v1/leagues/{league.league_id}/league/standings",
+    }
+
+
+def route_cases(app: FixtureApp, http) -> List[Case]:
+    cases = []
+    for name, path in route_paths(app).items():
+        request = lambda path=path: http.get(path, headers={'accept-encoding': 'br, gzip'})
+        cases.append(Case('routes', f"{name} warm", request))
+        cases.append(Case('routes', f"{name} cold", request, app.reset_caches, cold=True))
+    return cases
+
+
+def uncovered_routes(app: FixtureApp) -> List[str]:
+    covered = {name.split('?')[0] for name in route_paths(app)}
+    prefix = app.routes.router.prefix
+    # Routes under /leagues/{league_id} run the same handlers as the unprefixed ones.
+    paths = {route.path[len(prefix):].removeprefix('/leagues/{league_id}') for route in app.routes.router.routes}
+    return sorted(paths - covered)
+
+
+def check(case: Case) -> Optional[str]:
+    """Run a case once; a None result or an error status means the fixture can't serve it."""
+    if case.setup:
+        case.setup()
+    try:
+        result = case.fn()
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    if result is None:
+        return "returned None"
+    status = getattr(result, 'status_code', 200)
+    return f"HTTP {status}: {result.text[:120]}" if status >= 400 else None
+
+
+def load_baseline(name: str) -> Dict[str, Any]:
+    path = os.path.join(BASELINES_DIR, f"{name}.json")
+    if not os.path.exists(path):
+        return {'results': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(name: str, results: Dict[str, Dict[str, float]]) -> str:
+    baseline = load_baseline(name)
+    baseline['results'].update(results)
+    baseline['meta'] = {
+        'saved_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()} {platform.processor()}".strip(),
+        'cpus': os.cpu_count(),
+    }
+    os.makedirs(BASELINES_DIR, exist_ok=True)
+    path = os.path.join(BASELINES_DIR, f"{name}.json")
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+    return path
+
+
+def regression(result: Dict[str, float], base: Optional[Dict[str, float]], threshold: float) -> Optional[str]:
+    if not base:
+        return None
+    problems = []
+    if (result['p50_ms'] > base['p50_ms'] * (1 + threshold)
+            and result['p50_ms'] - base['p50_ms'] > MIN_MS_DELTA):
+        problems.append('p50')
+    if (result['peak_kib'] > base['peak_kib'] * (1 + threshold)
+            and result['peak_kib'] - base['peak_kib'] > MIN_KIB_DELTA):
+        problems.append('alloc')
+    return '+'.join(problems) or None
+
+
+def change(value: float, base: Optional[float]) -> str:
+    if not base:
+        return ''
+    return f"{(value - base) / base * 100:+.0f}%"
+
+
+def run_fixture(fixture: Fixture, groups: List[str], name_filter: Optional[str], iterations: int,
+                cold_iterations: int, alloc_runs: int, budget: float, baseline: Dict[str, Any], threshold: float):
+    results, failures, regressions = {}, [], []
+    with replay(fixture):
+        started = time.perf_counter()
+        app = FixtureApp(fixture)
+        print(f"\n== {fixture.name}: {len(app.client.league.teams)} teams, "
+              f"{len(app.client.league.player_map) // 2} players, loaded in {time.perf_counter() - started:.2f}s ==")
+        http = ASGIClient(app.app)
+        try:
+            builders = {'mapping': mapping_cases, 'client': client_cases, 'stats': stats_cases,
+                        'player_stats': player_stats_cases, 'routes': lambda a: route_cases(a, http)}
+            if 'routes' in groups:
+                for path in uncovered_routes(app):
+                    print(f"  warning: route {path} has no benchmark case")
+            print(f"{'case':<52} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9} "
+                  f"{'Δp50':>6} {'Δpeak':>6}")
+            for group in groups:
+                for case in builders[group](app):
+                    if name_filter and name_filter not in case.key:
+                        continue
+                    key = f"{fixture.name}/{case.key}"
+                    error = check(case)
+                    if error:
+                        failures.append(key)
+                        print(f"{case.key:<52} FAILED {error}")
+                        continue
+                    result = measure(case, cold_iterations if case.cold else iterations, alloc_runs, budget)
+                    results[key] = result
+                    base = baseline['results'].get(key)
+                    flagged = regression(result, base, threshold)
+                    if flagged:
+                        regressions.append(f"{key} ({flagged})")
+                    print(f"{case.key:<52} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} "
+                          f"{result['p99_ms']:>9.3f} {result['peak_kib']:>9.1f} "
+                          f"{change(result['p50_ms'], (base or {}).get('p50_ms')):>6} "
+                          f"{change(result['peak_kib'], (base or {}).get('peak_kib')):>6}"
+                          f"{'  REGRESSION' if flagged else ''}")
+        finally:
+            http.close()
+    return results, failures, regressions
+
+
+def main(args) -> int:
+    # Measure the code, not console logging.
+    logging.disable(logging.INFO)
+    fixtures = [Fixture.load(path) for path in args.fixture] or [synthetic_league(teams) for teams in args.teams]
+    baseline = load_baseline(args.compare) if args.compare else {'results': {}}
+    results, failures, regressions = {}, [], []
+    for fixture in fixtures:
+        fixture_results, fixture_failures, fixture_regressions = run_fixture(
+            fixture, args.group, args.filter, args.iterations, args.cold_iterations, args.alloc_runs,
+            args.budget, baseline, args.threshold)
+        results.update(fixture_results)
+        failures += fixture_failures
+        regressions += fixture_regressions
+
+    if args.save_baseline:
+        print(f"\nSaved {len(results)} results to {save_baseline(args.save_baseline, results)}")
+    if failures:
+        print(f"\n{len(failures)} case(s) failed: {', '.join(failures)}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%} against '{args.compare}':")
+        for regressed in regressions:
+            print(f"  {regressed}")
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, nargs='+', default=[8, 12, 20],
+                        help="Synthetic league sizes (ignored with --fixture)")
+    parser.add_argument('--fixture', nargs='+', default=[], help="Recorded fixture files")
+    parser.add_argument('--group', nargs='+', choices=GROUPS, default=list(GROUPS))
+    parser.add_argument('--filter', help="Only cases whose group/name contains this")
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--cold-iterations', type=int, default=20)
+    parser.add_argument('--alloc-runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=2.0, help="Seconds of timed runs per case")
+    parser.add_argument('--save-baseline', nargs='?', const='local', metavar='NAME')
+    parser.add_argument('--compare', nargs='?', const='local', metavar='NAME')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    sys.exit(main(parser.parse_args()))
@@ -1,18 +1,23 @@
 import os
+import time
 import discord
 from discord.ext import commands
 # import httpx
 from dotenv import load_dotenv
 from espn_client import ESPNClient
+from client_pool import pool
+from bot_executor import CommandExecutor
+import metrics
 
 
 # from discord_py_interactions import SlashCommand
-import logging
+from logger_config import configure_logging
 
 load_dotenv()
 
 TOKEN = os.getenv('DISCORD_BOT_TOKEN')
-client = ESPNClient()
+# ESPN lookups are blocking, so commands run them here instead of on the event loop
+executor = CommandExecutor()
 
 
 intents = discord.Intents.default()
@@ -20,6 +25,14 @@ intents.message_content = True
 intents.members = True
 bot = commands.Bot(command_prefix='!', intents=intents)
 
+def espn() -> ESPNClient:
+    """The configured league's client, shared with the API.
+
+    Built by the lifecycle (or run_bot) before the bot connects, not at import,
+    so importing this module costs no ESPN fetch.
+    """
+    return pool.default().client
+
 @bot.event
 async def on_ready():
     print(f'Logged in as {bot.user}')
@@ -44,6 +57,16 @@ async def on_message(message):
     await bot.process_commands(message)
 
 
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.command_started = time.perf_counter()
+
+@bot.after_invoke
+async def record_command_latency(ctx):
+    # Runs after failed commands too; ctx.command_failed tells them apart.
+    metrics.record_command(ctx.command.qualified_name, time.perf_counter() - ctx.command_started,
+                           not ctx.command_failed)
+
 @bot.command()
 async def hello(ctx):
     await ctx.send(f'Hello {ctx.author.mention}!')
@@ -55,29 +78,45 @@ async def ping(ctx):
 @bot.command()
 async def playerStats(ctx, player_name):
     await ctx.send(f'Player Stats for {player_name}!')
-    player_id = client.get_player_id_by_name(player_name)
+    client = espn()
+    player_id = await executor.run(ctx, client.get_player_id_by_name, player_name)
     if player_id:
         await ctx.send(f'Player ID: {player_id}')
     else:
-        await ctx.send(f'Player not found!')
-    player_stats = client.get_player_info(player_ids=[player_id])
+        candidates = client.search_players(player_name, limit=5)
+        if candidates:
+            suggestions = ', '.join(c['name'] for c in candidates)
+            await ctx.send(f'Player not found! Did you mean: {suggestions}?')
+        else:
+            await ctx.send(f'Player not found!')
+        return
+    player_stats = await executor.run(ctx, client.get_player_info, player_ids=[player_id])
     if player_stats:
+        # Plain dicts, so the message reads the same as before records replaced them.
+        player_stats = [player.to_dict() for player in player_stats]
         await ctx.send(f'Player Stats: {player_stats}')
     else:
         await ctx.send(f'Player stats not found!')
 
-    
-
-def run_bot():
-    # Configure logging to output to console
-    handler = logging.StreamHandler()
-    handler.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
+@bot.command()
+async def botStats(ctx):
+    executor_stats = executor.metrics()
+    await ctx.send(', '.join(f'{key}: {value}' for key, value in executor_stats.items()))
 
-    logger = logging.getLogger('discord')
-    logger.setLevel(logging.DEBUG)
-    logger.addHandler(handler)
+async def start_bot():
+    """Run the bot on the current event loop (used by main.py's lifecycle)."""
+    await bot.start(TOKEN)
 
-    bot.run(token=TOKEN, log_level=logging.DEBUG)
+async def stop_bot():
+    if not bot.is_closed():
+        await bot.close()
 
+def run_bot():
+    """Run the bot standalone, blocking until it exits."""
+    # discord.py logs through the shared queue; raise its level with LOG_LEVELS=discord=DEBUG.
+    configure_logging()
+    espn()
+    bot.run(token=TOKEN, log_handler=None)
+
+if __name__ == "__main__":
+    run_bot()
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('bot_executor')
+
+
+class _KeyedLimiter:
+    """One asyncio.Semaphore per key (user or channel), dropped once nobody holds or awaits it."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots: Dict[Hashable, list] = {}
+
+    def acquire(self, key: Hashable) -> asyncio.Semaphore:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = [asyncio.Semaphore(self.limit), 0]
+        slot[1] += 1
+        return slot[0]
+
+    def release(self, key: Hashable) -> None:
+        slot = self._slots[key]
+        slot[1] -= 1
+        if slot[1] == 0:
+            del self._slots[key]
+
+
+class CommandExecutor:
+    """Runs blocking ESPN work for bot commands off the discord.py event loop.
+
+    Work goes to a bounded thread pool. Each user and each channel may only run
+    a limited number of commands at once; extra commands wait their turn
+    without blocking anyone else.
+    """
+
+    def __init__(self,
+                 max_workers: int = int(os.getenv("BOT_WORKERS", 8)),
+                 per_user: int = int(os.getenv("BOT_USER_CONCURRENCY", 1)),
+                 per_channel: int = int(os.getenv("BOT_CHANNEL_CONCURRENCY", 4))):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bot-command')
+        self._users = _KeyedLimiter(per_user)
+        self._channels = _KeyedLimiter(per_channel)
+        self._lock = threading.Lock()
+        self.waiting = 0  # held back by a per-user or per-channel limit
+        self.queued = 0  # submitted to the pool, not yet started
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.total_seconds = 0.0
+
+    async def run(self, ctx, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run `fn(*args, **kwargs)` on the pool under the limits of `ctx.author` and `ctx.channel`."""
+        user_key = getattr(ctx.author, 'id', ctx.author)
+        channel_key = getattr(ctx.channel, 'id', ctx.channel)
+        user_slot = self._users.acquire(user_key)
+        channel_slot = self._channels.acquire(channel_key)
+        self.waiting += 1
+        admitted = False
+        try:
+            async with user_slot, channel_slot:
+                self.waiting -= 1
+                admitted = True
+                with self._lock:
+                    self.queued += 1
+                    self.max_queue_depth = max(self.max_queue_depth, self.queued + self.waiting)
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._pool, partial(self._call, fn, *args, **kwargs))
+        finally:
+            if not admitted:
+                self.waiting -= 1
+            self._users.release(user_key)
+            self._channels.release(channel_key)
+
+    def _call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            with self._lock:
+                self.completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.total_seconds += time.perf_counter() - started
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                'max_workers': self.max_workers,
+                'waiting': self.waiting,
+                'queued': self.queued,
+                'active': self.active,
+                'queue_depth': self.waiting + self.queued,
+                'max_queue_depth': self.max_queue_depth,
+                'completed': self.completed,
+                'failed': self.failed,
+                'avg_seconds': round(self.total_seconds / finished, 4) if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        logger.info("Shutting down bot command executor")
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,205 @@
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+from singleflight import SingleFlight, AsyncSingleFlight
+import metrics
+
+MISSING = object()
+
+# Seconds each kind of ESPN data stays fresh. Override with CACHE_TTL_<VIEW>,
+# e.g. CACHE_TTL_BOX_SCORES=5.
+DEFAULT_TTLS = {
+    'standings': 300,
+    'scoreboard': 30,
+    'box_scores': 10,
+    'free_agents': 120,
+    'transactions': 60,
+    'player_info': 300,
+}
+
+# Maximum number of distinct argument combinations kept per view.
+DEFAULT_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", 256))
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn lists, sets and dicts into hashable equivalents for cache keys."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, ttl: float, maxsize: int = DEFAULT_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Concurrent misses for the same key share one upstream fetch.
+        self.flight = SingleFlight()
+        self.async_flight = AsyncSingleFlight()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'ttl': self.ttl,
+                'maxsize': self.maxsize,
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'upstream_calls': self.flight.executions + self.async_flight.executions,
+                'deduplicated': self.flight.deduplicated + self.async_flight.deduplicated,
+            }
+
+
+def _env_ttl(view: str, default: float) -> float:
+    """TTL for a view, honouring the CACHE_TTL_<VIEW> override."""
+    return float(os.getenv(f"CACHE_TTL_{view.upper()}", default))
+
+
+class ResponseCache:
+    """One TTLCache per ESPN view, so each kind of data expires on its own schedule."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, maxsize: int = DEFAULT_MAXSIZE):
+        ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.maxsize = maxsize
+        self._views: Dict[str, TTLCache] = {}
+        self._lock = threading.Lock()
+        for view, ttl in ttls.items():
+            self._views[view] = TTLCache(ttl=_env_ttl(view, ttl), maxsize=maxsize)
+
+    def view(self, name: str) -> TTLCache:
+        with self._lock:
+            if name not in self._views:
+                ttl = _env_ttl(name, DEFAULT_TTLS.get(name, 60))
+                self._views[name] = TTLCache(ttl=ttl, maxsize=self.maxsize)
+            return self._views[name]
+
+    def invalidate(self, view: Optional[str] = None) -> None:
+        """Drop every entry of one view, or of all views when no view is given."""
+        if view is not None:
+            self.view(view).invalidate()
+            return
+        for cache in list(self._views.values()):
+            cache.invalidate()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: cache.stats() for name, cache in list(self._views.items())}
+
+
+def make_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> Hashable:
+    """Build a cache key that is the same whether arguments are passed by position or name."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return tuple((name, _freeze(value)) for name, value in bound.arguments.items() if name != 'self')
+
+
+def cached(view: str):
+    """Cache an ESPNClient method's result in `self.cache` under the given view.
+
+    `None` results signal an upstream error in ESPNClient and are never cached.
+    Lists are returned as shallow copies so callers can sort or filter them freely.
+    Coroutine methods are supported too; they share entries with a sync method
+    of the same name and parameters cached under the same view. Concurrent
+    misses for the same key are coalesced into a single call of the method,
+    which is timed and counted in `metrics`.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                cache = self.cache.view(view)
+                key = make_key(signature, (self,) + args, kwargs)
+                value = cache.get(key)
+                if value is MISSING:
+                    async def load():
+                        started = time.perf_counter()
+                        result = None
+                        try:
+                            result = await func(self, *args, **kwargs)
+                        finally:
+                            metrics.record_upstream(type(self).__name__, func.__name__,
+                                                    time.perf_counter() - started, result is not None)
+                        if result is not None:
+                            cache.set(key, result)
+                        return result
+                    value = await cache.async_flight.do(key, load)
+                    if value is None:
+                        return None
+                return list(value) if isinstance(value, list) else value
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = self.cache.view(view)
+            key = make_key(signature, (self,) + args, kwargs)
+            value = cache.get(key)
+            if value is MISSING:
+                def load():
+                    started = time.perf_counter()
+                    result = None
+                    try:
+                        result = func(self, *args, **kwargs)
+                    finally:
+                        metrics.record_upstream(type(self).__name__, func.__name__,
+                                                time.perf_counter() - started, result is not None)
+                    if result is not None:
+                        cache.set(key, result)
+                    return result
+                value = cache.flight.do(key, load)
+                if value is None:
+                    return None
+            return list(value) if isinstance(value, list) else value
+        return wrapper
+    return decorator
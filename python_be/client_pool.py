@@ -0,0 +1,330 @@
+import asyncio
+import gc
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from espn_client import ESPNClient, season_over
+from async_espn_client import AsyncESPNClient, connection_pool
+from http_cache import RowVersions
+from pagination import PageIndexes
+from singleflight import SingleFlight
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('client_pool')
+
+# Leagues kept resident besides the environment's default league, and the memory
+# their snapshots may take before the least recently used ones are dropped.
+LEAGUE_POOL_SIZE = int(os.getenv("LEAGUE_POOL_SIZE", 32))
+LEAGUE_POOL_MB = float(os.getenv("LEAGUE_POOL_MB", 1024))
+# New leagues the pool may load per minute, and how long a league that failed to
+# load answers with the same error instead of asking ESPN again.
+LEAGUE_POOL_LOADS_PER_MINUTE = float(os.getenv("LEAGUE_POOL_LOADS_PER_MINUTE", 30))
+LEAGUE_POOL_FAILURE_TTL = float(os.getenv("LEAGUE_POOL_FAILURE_TTL", 60))
+MAX_FAILURES = 1024
+
+# Never part of a league's data, and often the way into process-wide state.
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+               types.CodeType, types.FrameType, logging.Logger, logging.Handler)
+
+# Response cache counters that add up across leagues.
+_SUMMED_STATS = ('hits', 'misses', 'size', 'evictions', 'expirations', 'upstream_calls', 'deduplicated')
+
+LeagueKey = Tuple[int, int, str]
+
+
+class LoadThrottled(Exception):
+    """Raised instead of loading a new league while the pool is over its load rate."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many new leagues; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def credentials_id(espn_s2: str, swid: str) -> str:
+    """A short digest standing in for ESPN cookies in pool keys, ETags and logs."""
+    if not espn_s2 and not swid:
+        return 'public'
+    return hashlib.sha256(f"{espn_s2}|{swid}".encode()).hexdigest()[:16]
+
+
+def estimate_size(*roots: Any) -> int:
+    """Approximate bytes reachable from `roots`, counting shared objects once."""
+    seen = set()
+    pending = list(roots)
+    size = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return size
+
+
+class PooledLeague:
+    """One league's clients plus the per-league state the routes keep."""
+
+    def __init__(self, key: LeagueKey, client: ESPNClient, async_client: AsyncESPNClient):
+        self.key = key
+        self.client = client
+        self.async_client = async_client
+        self.page_indexes = PageIndexes()
+        self.row_versions = RowVersions()
+        # Scopes ETags and encoded bodies, so no league or credentials see another's responses.
+        self.cache_scope = ':'.join(map(str, key))
+        self.size = 0
+        self.last_used = time.monotonic()
+
+    def measure(self, league: Any = None) -> int:
+        """Re-estimate the memory held by the league snapshot and player lookups."""
+        league = league or self.client.league
+        data = [value for name, value in vars(league).items() if name not in ('espn_request', 'logger')]
+        self.size = estimate_size(data, self.client.player_index, self.client.player_table)
+        return self.size
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'league_id': self.key[0],
+            'season': self.key[1],
+            'snapshot_version': self.client.snapshot_version,
+            'bytes': self.size,
+            'idle_seconds': round(time.monotonic() - self.last_used, 1),
+        }
+
+
+class ClientPool:
+    """ESPN clients keyed by (league_id, season, credentials), created on first use.
+
+    The environment's league is always resident. Other leagues are evicted least
+    recently used first once there are more than `max_leagues` of them or their
+    estimated snapshot memory passes `max_bytes`. Every league's async fetches
+    share one connection pool.
+
+    The environment's ESPN credentials are only used for the environment's
+    league; other leagues are read anonymously unless the caller sends cookies.
+    New leagues load at most `loads_per_minute` times a minute, and a league
+    that failed to load keeps failing for `failure_ttl` seconds without another
+    ESPN call.
+    """
+
+    def __init__(self, max_leagues: int = LEAGUE_POOL_SIZE, max_bytes: int = int(LEAGUE_POOL_MB * 2**20),
+                 loads_per_minute: float = LEAGUE_POOL_LOADS_PER_MINUTE,
+                 failure_ttl: float = LEAGUE_POOL_FAILURE_TTL):
+        self.max_leagues = max_leagues
+        self.max_bytes = max_bytes
+        self.loads_per_minute = loads_per_minute
+        self.failure_ttl = failure_ttl
+        self._load_tokens = loads_per_minute
+        self._load_checked = time.monotonic()
+        # (failed at, exception type, exception args): raised afresh each time, so no
+        # request's traceback is pinned or shared.
+        self._failures: "OrderedDict[LeagueKey, Tuple[float, type, tuple]]" = OrderedDict()
+        self._default: Optional[PooledLeague] = None
+        self._leagues: "OrderedDict[LeagueKey, PooledLeague]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._http: Optional[httpx.AsyncClient] = None
+        # Response cache counters of evicted leagues, so summed counters never go backwards.
+        self._retired: Dict[str, Dict[str, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.failures = 0
+        self.throttled = 0
+
+    def http(self) -> httpx.AsyncClient:
+        # Created lazily so the pool binds to the event loop that first uses it.
+        if self._http is None or self._http.is_closed:
+            self._http = connection_pool()
+        return self._http
+
+    def default(self) -> PooledLeague:
+        """The league configured in the environment, shared with the Discord bot."""
+        if self._default is None:
+            self._flight.do('default', self._create_default)
+        return self._default
+
+    def _create_default(self) -> None:
+        if self._default is not None:
+            return
+        client = ESPNClient()
+        league = PooledLeague((client.league_id, client.season, credentials_id(client.espn_s2, client.swid)),
+                              client, AsyncESPNClient(client, http=self.http))
+        league.measure()
+        client.add_refresh_listener(league.measure)
+        self._default = league
+
+    def _key(self, league_id: Optional[int], season: Optional[int], espn_s2: Optional[str],
+             swid: Optional[str]) -> Tuple[LeagueKey, str, str]:
+        default = self._default.client
+        if espn_s2 is None and swid is None and league_id in (None, default.league_id):
+            espn_s2, swid = default.espn_s2, default.swid
+        espn_s2, swid = espn_s2 or '', swid or ''
+        key = (league_id or default.league_id, season or default.season, credentials_id(espn_s2, swid))
+        return key, espn_s2, swid
+
+    def find(self, league_id: Optional[int] = None, season: Optional[int] = None,
+             espn_s2: Optional[str] = None, swid: Optional[str] = None) -> Optional[PooledLeague]:
+        """The resident league for these arguments, or None if it would have to be built first."""
+        if self._default is None:
+            return None
+        key, _, _ = self._key(league_id, season, espn_s2, swid)
+        with self._lock:
+            league = self._default if key == self._default.key else self._leagues.get(key)
+            if league is None:
+                return None
+            if league is not self._default:
+                self._leagues.move_to_end(key)
+            self.hits += 1
+        league.last_used = time.monotonic()
+        return league
+
+    def get(self, league_id: Optional[int] = None, season: Optional[int] = None,
+            espn_s2: Optional[str] = None, swid: Optional[str] = None) -> PooledLeague:
+        """The league for these arguments, building it (a blocking ESPN fetch) if it isn't resident.
+
+        Unset arguments fall back to the default league's. ESPN errors such as
+        ESPNInvalidLeague or ESPNAccessDenied propagate to every waiting caller,
+        and are raised again without an ESPN call until `failure_ttl` passes.
+        LoadThrottled is raised when too many new leagues were loaded recently.
+        """
+        self.default()
+        league = self.find(league_id, season, espn_s2, swid)
+        if league is not None:
+            return league
+        key, espn_s2, swid = self._key(league_id, season, espn_s2, swid)
+        self._raise_recent_failure(key)
+        return self._flight.do(key, lambda: self._create(key, espn_s2, swid))
+
+    def _raise_recent_failure(self, key: LeagueKey) -> None:
+        with self._lock:
+            failure = self._failures.get(key)
+            if failure is None:
+                return
+            if time.monotonic() - failure[0] >= self.failure_ttl:
+                del self._failures[key]
+                return
+        _, error_type, args = failure
+        raise error_type(*args)
+
+    def _take_load_token(self) -> None:
+        if not self.loads_per_minute:
+            return
+        rate = self.loads_per_minute / 60
+        with self._lock:
+            now = time.monotonic()
+            self._load_tokens = min(self.loads_per_minute, self._load_tokens + (now - self._load_checked) * rate)
+            self._load_checked = now
+            if self._load_tokens < 1:
+                self.throttled += 1
+                raise LoadThrottled((1 - self._load_tokens) / rate)
+            self._load_tokens -= 1
+
+    async def aget(self, league_id: Optional[int] = None, season: Optional[int] = None,
+                   espn_s2: Optional[str] = None, swid: Optional[str] = None) -> PooledLeague:
+        """`get` for the event loop: resident leagues come back directly, new ones are built in a thread."""
+        league = self.find(league_id, season, espn_s2, swid)
+        if league is not None:
+            return league
+        return await asyncio.to_thread(self.get, league_id, season, espn_s2, swid)
+
+    def _create(self, key: LeagueKey, espn_s2: str, swid: str) -> PooledLeague:
+        with self._lock:
+            league = self._leagues.get(key)
+        if league is not None:
+            return league
+        self._take_load_token()
+        started = time.monotonic()
+        default = self._default.client
+        try:
+            client = ESPNClient(league_id=key[0], season=key[1], espn_s2=espn_s2, swid=swid,
+                                season_store=default.season_store)
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                self._failures[key] = (time.monotonic(), type(e), e.args)
+                while len(self._failures) > MAX_FAILURES:
+                    self._failures.popitem(last=False)
+            raise
+        league = PooledLeague(key, client, AsyncESPNClient(client, http=self.http))
+        league.measure()
+        client.add_refresh_listener(league.measure)
+        # A finished season's snapshot never changes, so it needs no refresher.
+        if not season_over(client.league):
+            client.start_refresher()
+        with self._lock:
+            self._leagues[key] = league
+            self.misses += 1
+        logger.info(f"Loaded league {key[0]} season {key[1]} in {time.monotonic() - started:.2f}s "
+                    f"({league.size / 2**20:.1f} MB)")
+        self._evict()
+        return league
+
+    def _evict(self) -> None:
+        evicted: List[PooledLeague] = []
+        with self._lock:
+            total = self._default.size + sum(league.size for league in self._leagues.values())
+            # The newest league stays even if it alone is over the memory budget.
+            while len(self._leagues) > 1 and (len(self._leagues) > self.max_leagues or total > self.max_bytes):
+                _, league = self._leagues.popitem(last=False)
+                total -= league.size
+                self.evictions += 1
+                evicted.append(league)
+                for view, stats in league.client.cache_stats().items():
+                    retired = self._retired.setdefault(view, dict.fromkeys(_SUMMED_STATS, 0))
+                    for name in _SUMMED_STATS:
+                        if name != 'size':
+                            retired[name] += stats.get(name, 0)
+        for league in evicted:
+            logger.info(f"Evicted league {league.key[0]} season {league.key[1]} "
+                        f"({league.size / 2**20:.1f} MB, idle {time.monotonic() - league.last_used:.0f}s)")
+            league.client.stop_refresher()
+
+    def leagues(self) -> List[PooledLeague]:
+        with self._lock:
+            return ([self._default] if self._default else []) + list(self._leagues.values())
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Response cache counters per view, summed over every league loaded since startup."""
+        totals = {view: dict(stats) for view, stats in self._retired.items()}
+        for league in self.leagues():
+            for view, stats in league.client.cache_stats().items():
+                summed = totals.setdefault(view, dict.fromkeys(_SUMMED_STATS, 0))
+                for name in _SUMMED_STATS:
+                    summed[name] += stats.get(name, 0)
+        return totals
+
+    def stats(self) -> Dict[str, Any]:
+        leagues = self.leagues()
+        return {
+            'entries': len(leagues),
+            'bytes': sum(league.size for league in leagues),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'failures': self.failures,
+            'throttled': self.throttled,
+            'max_leagues': self.max_leagues,
+            'max_bytes': self.max_bytes,
+            'leagues': [league.describe() for league in leagues],
+        }
+
+    async def aclose(self) -> None:
+        """Stop every league's refresher and close the shared connection pool."""
+        for league in self.leagues():
+            league.client.stop_refresher()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+pool = ClientPool()
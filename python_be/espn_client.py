@@ -1,44 +1,345 @@
 from espn_api.basketball import League
-from typing import Optional, List, Dict, Any, Set, Union
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+from typing import Optional, List, Dict, Any, Iterator, Set, Tuple, Union, Callable
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from logger_config import setup_logger
 from fastapi import HTTPException
+from cache import ResponseCache, cached
+import metrics
+import profiling
+from refresher import LeagueRefresher
+from player_index import PlayerIndex
+from player_table import PlayerTable
+from season_store import SeasonStore, open_season_store
+from records import (BoxScore, BoxScoreTeam, FreeAgent, LineupPlayer, Matchup, PlayerInfo,
+                     ScoreboardTeam, intern)
 
 # Set up logger
 logger = setup_logger('espn_client')
 
 load_dotenv()
 
+def _scoreboard_team(team: Any, score: Any, projected: Any) -> ScoreboardTeam:
+    return ScoreboardTeam(getattr(team, 'team_id', None) if team else None,
+                          getattr(team, 'team_name', None) if team else None,
+                          score, projected)
+
+def map_scoreboard(matchups: List[Any]) -> List[Matchup]:
+    """Convert espn_api Matchup objects into scoreboard records."""
+    return [Matchup(getattr(m, 'matchup_id', None),
+                    _scoreboard_team(m.home_team, getattr(m, 'home_score', 0), getattr(m, 'home_projected', 0)),
+                    _scoreboard_team(m.away_team, getattr(m, 'away_score', 0), getattr(m, 'away_projected', 0)))
+            for m in matchups]
+
+def _map_lineup(players: List[Any]) -> Tuple[LineupPlayer, ...]:
+    return tuple(LineupPlayer(
+        intern(getattr(p, 'name', None)),
+        intern(getattr(p, 'position', None)),
+        getattr(p, 'points', 0),
+        getattr(p, 'projected_points', 0),
+        getattr(p, 'stats', {}),
+        intern(getattr(p, 'injuryStatus', None)),
+        getattr(p, 'starting', False),
+        intern(getattr(p, 'proTeam', None)),
+        getattr(p, 'playerId', None),
+    ) for p in players)
+
+def _box_score_team(team: Any, score: Any, projected: Any, lineup: List[Any]) -> BoxScoreTeam:
+    return BoxScoreTeam(getattr(team, 'team_id', None), getattr(team, 'team_name', None),
+                        score, projected, _map_lineup(lineup))
+
+def map_box_scores(box_scores: List[Any]) -> List[BoxScore]:
+    """Convert espn_api BoxScore objects into box score records with full lineups."""
+    return [BoxScore(
+        _box_score_team(bs.home_team, getattr(bs, 'home_score', 0), getattr(bs, 'home_projected', 0),
+                        getattr(bs, 'home_lineup', [])),
+        _box_score_team(bs.away_team, getattr(bs, 'away_score', 0), getattr(bs, 'away_projected', 0),
+                        getattr(bs, 'away_lineup', [])),
+    ) for bs in box_scores]
+
+def map_standings(standings: List[Any]) -> List[Dict[str, Any]]:
+    """Convert espn_api Team objects (in standings order) into standings dicts."""
+    return [{
+        'team_id': team.team_id,
+        'team_name': team.team_name,
+        'division_id': team.division_id,
+        'division_name': team.division_name,
+        'wins': team.wins,
+        'losses': team.losses,
+        'ties': team.ties,
+        'points_for': float(team.points_for) if team.points_for else 0,
+        'points_against': float(team.points_against) if team.points_against else 0,
+        'streak_length': int(team.streak_length) if hasattr(team, 'streak_length') else 0,
+        'streak_type': team.streak_type if hasattr(team, 'streak_type') else None,
+        'standing': int(team.standing) if team.standing else 0,
+        'games_back': float(team.games_back) if hasattr(team, 'games_back') else 0,
+        'final_standing': int(team.final_standing) if team.final_standing else 0,
+        'waiver_position': int(team.waiver_position) if hasattr(team, 'waiver_position') else 0,
+        'number_of_moves': int(team.number_of_moves) if hasattr(team, 'number_of_moves') else 0,
+        'number_of_trades': int(team.number_of_trades) if hasattr(team, 'number_of_trades') else 0,
+        'roster_moves': int(team.roster_moves) if hasattr(team, 'roster_moves') else 0,
+        'clinched_playoffs': bool(team.clinched_playoffs) if hasattr(team, 'clinched_playoffs') else False,
+        'logo_url': team.logo_url if hasattr(team, 'logo_url') else None,
+    } for team in standings]
+
+# Transaction types fetched by default; espn_api's own default leaves out trades.
+TRANSACTION_TYPES = {"FREEAGENT", "WAIVER", "TRADE"}
+
+def map_transactions(transactions: List[Any]) -> List[Dict[str, Any]]:
+    """Convert espn_api Transaction objects into transaction dicts, one per player moved."""
+    return [{
+        'type': getattr(trans, 'type', None),
+        'team': getattr(trans.team, 'team_name', None) if trans.team else None,
+        'player': getattr(item, 'player', None),
+        'action': getattr(item, 'type', None),
+        'bid_amount': getattr(trans, 'bid_amount', None),
+        'status': getattr(trans, 'status', None),
+        'date': getattr(trans, 'date', None)
+    } for trans in transactions for item in getattr(trans, 'items', [])]
+
+def resolve_periods(league: Any, matchup_period: Optional[int], scoring_period: Optional[int]):
+    """Resolve (matchup_period, scoring_period) the same way espn_api's League.box_scores does."""
+    matchup_id = league.currentMatchupPeriod
+    scoring_id = league.current_week
+    if matchup_period and scoring_period:
+        matchup_id = matchup_period
+        scoring_id = scoring_period
+    elif matchup_period and matchup_period < matchup_id:
+        matchup_id = matchup_period
+        scoring_id = league.matchup_ids[matchup_period][-1] if matchup_period in league.matchup_ids else 1
+    elif scoring_period and scoring_period <= scoring_id:
+        scoring_id = scoring_period
+        for matchup in league.matchup_ids.keys():
+            if str(scoring_id) in league.matchup_ids[matchup]:
+                matchup_id = matchup
+                break
+    return matchup_id, scoring_id
+
+def season_over(league: Any) -> bool:
+    """Whether the league's season has finished: it precedes the configured SEASON, or
+    ESPN's scoring period has moved past the final one.
+
+    espn_api caps current_week at the final scoring period once a season is
+    over, so comparing periods against it never marks the last one final.
+    """
+    if league.year < int(os.getenv("SEASON", 2026)):
+        return True
+    final = getattr(league, 'finalScoringPeriod', None)
+    return bool(final) and getattr(league, 'scoringPeriodId', 0) > final
+
+def is_final_period(league: Any, matchup_id: int, scoring_id: int, matchup_total: bool) -> bool:
+    """Whether a box score period is over, so its stored copy will never change."""
+    if season_over(league):
+        return True
+    if matchup_total:
+        return matchup_id < league.currentMatchupPeriod
+    return int(scoring_id) < league.current_week
+
+def map_players(players: List[Any], include_stats: bool = True) -> List[PlayerInfo]:
+    """Convert espn_api Player objects into player info records; `stats` is None unless included."""
+    return [PlayerInfo(
+        getattr(p, 'playerId', None),
+        intern(getattr(p, 'name', None)),
+        intern(getattr(p, 'position', None)),
+        intern(getattr(p, 'proTeam', None)),
+        intern(getattr(p, 'injuryStatus', None)),
+        getattr(p, 'stats', {}) if include_stats else None,
+        getattr(p, 'total_points', 0),
+        getattr(p, 'avg_points', 0),
+        getattr(p, 'percent_owned', 0),
+        getattr(p, 'percent_started', 0),
+        getattr(p, 'projected_points', 0),
+    ) for p in players]
+
+def map_free_agents(players: List[Any]) -> List[FreeAgent]:
+    """Convert espn_api Player objects into free agent records."""
+    return [FreeAgent(
+        intern(getattr(p, 'name', None)),
+        intern(getattr(p, 'position', None)),
+        intern(getattr(p, 'proTeam', None)),
+        intern(getattr(p, 'injuryStatus', None)),
+        getattr(p, 'stats', {}),
+        getattr(p, 'total_points', 0),
+        getattr(p, 'avg_points', 0),
+        getattr(p, 'percent_owned', 0),
+        getattr(p, 'percent_started', 0),
+        getattr(p, 'projected_points', 0),
+    ) for p in players]
+
+
+def rebase_endpoints(espn_request: Any, base_url: str) -> None:
+    """Point an espn_api request object's fantasy endpoints at `base_url` instead of ESPN."""
+    base_url = base_url.rstrip('/') + '/'
+    for attr in ('ENDPOINT', 'LEAGUE_ENDPOINT'):
+        setattr(espn_request, attr, getattr(espn_request, attr).replace(FANTASY_BASE_ENDPOINT, base_url, 1))
+
 class ESPNClient:
+    """Client for one ESPN league and season.
+
+    `ESPNClient()` is the process-wide client for the league configured in the
+    environment; passing a league, season or credentials builds an independent
+    client instead (see client_pool.ClientPool).
+    """
     _instance = None
     _initialized = False
 
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
+        if args or kwargs:
+            return super(ESPNClient, cls).__new__(cls)
         if cls._instance is None:
             cls._instance = super(ESPNClient, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self):
+    def __init__(self,
+                 league_id: Optional[int] = None,
+                 season: Optional[int] = None,
+                 espn_s2: Optional[str] = None,
+                 swid: Optional[str] = None,
+                 season_store: Optional[SeasonStore] = None):
         if not self._initialized:
             logger.info("Initializing ESPNClient")
-            self.league_id = int(os.getenv("LEAGUE_ID", 9490871))
-            self.season = int(os.getenv("SEASON", 2026))
-            self.swid = os.getenv("SWID", "")
-            self.espn_s2 = os.getenv("ESPN_S2", "")
+            self.league_id = league_id if league_id is not None else int(os.getenv("LEAGUE_ID", 9490871))
+            self.season = season if season is not None else int(os.getenv("SEASON", 2026))
+            self.swid = swid if swid is not None else os.getenv("SWID", "")
+            self.espn_s2 = espn_s2 if espn_s2 is not None else os.getenv("ESPN_S2", "")
+            self.refresh_interval = float(os.getenv("LEAGUE_REFRESH_INTERVAL", 300))
+            # Send ESPN requests to a stand-in instead, e.g. benchmarks/espn_standin.py
+            self.espn_base_url = os.getenv("ESPN_BASE_URL", "")
+            self.cache = ResponseCache()
+            self.snapshot_version = 0
+            self.refreshed_at = None
+            self._refresh_lock = threading.Lock()
+            self._refresh_listeners: List[Callable[[Any], None]] = []
+            self._refresher: Optional[LeagueRefresher] = None
+            self.player_index = PlayerIndex()
+            self.player_table = PlayerTable()
+            self._table_lock = threading.Lock()
+            self.season_store: Optional[SeasonStore] = season_store or open_season_store()
 
             try:
                 logger.info(f"Connecting to ESPN Fantasy League {self.league_id} for season {self.season}")
-                self.league = League(league_id=self.league_id,
-                                    year=self.season,
-                                    espn_s2=self.espn_s2,
-                                    swid=self.swid)
+                self._swap_league(self._build_league())
+                self._build_player_index(self.league)
+                self.add_refresh_listener(self._build_player_index)
+                self.add_refresh_listener(self._refresh_player_table)
                 self._initialized = True
                 logger.info("Successfully initialized ESPNClient")
             except Exception as e:
                 logger.error(f"Error initializing league: {str(e)}")
                 raise
 
+    def _build_league(self, season: Optional[int] = None) -> League:
+        league = League(league_id=self.league_id,
+                        year=season or self.season,
+                        espn_s2=self.espn_s2,
+                        swid=self.swid,
+                        fetch_league=False)
+        if self.espn_base_url:
+            rebase_endpoints(league.espn_request, self.espn_base_url)
+        if profiling.enabled():
+            profiling.instrument_upstream(league.espn_request)
+        league.fetch_league()
+        return league
+
+    def league_for_season(self, season: int) -> League:
+        """The live League for the configured season, or a freshly built one for any other season."""
+        if season == self.season:
+            return self.league
+        logger.info(f"Connecting to ESPN Fantasy League {self.league_id} for season {season}")
+        return self._build_league(season)
+
+    def _swap_league(self, league: League) -> None:
+        # A single attribute assignment, so readers of self.league always see a
+        # complete snapshot: either the old League or the new one.
+        self.league = league
+        self.snapshot_version += 1
+        self.refreshed_at = time.time()
+
+    def refresh_league(self) -> bool:
+        """Fetch a fresh League snapshot and swap it in, keeping the old one on failure."""
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.info("League refresh already in progress, skipping")
+            return False
+        try:
+            started = time.monotonic()
+            try:
+                league = self._build_league()
+            except Exception as e:
+                metrics.record_upstream(type(self).__name__, 'refresh_league', time.monotonic() - started, False)
+                logger.error(f"Error refreshing league, serving previous snapshot: {str(e)}")
+                return False
+            metrics.record_upstream(type(self).__name__, 'refresh_league', time.monotonic() - started, True)
+            self._swap_league(league)
+            self.invalidate_cache('standings')
+            for listener in list(self._refresh_listeners):
+                try:
+                    listener(league)
+                except Exception as e:
+                    logger.error(f"Error in league refresh listener: {str(e)}")
+            logger.info(f"Refreshed league snapshot v{self.snapshot_version} in {time.monotonic() - started:.2f}s")
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def _build_player_index(self, league: League) -> None:
+        players = {pid: name for pid, name in league.player_map.items() if isinstance(pid, int)}
+        for team in league.teams:
+            for player in team.roster:
+                players[player.playerId] = player.name
+        self.player_index.build(players.items())
+        logger.info(f"Indexed {len(self.player_index)} player names")
+
+    def _sync_player_table(self, league: League) -> None:
+        rostered = {player.playerId: player for team in league.teams for player in team.roster}
+        counts = self.player_table.sync(rostered, lambda ids: self.get_player_info(player_ids=ids))
+        logger.info(f"Synced player table: {counts['added']} added, {counts['removed']} removed, {counts['total']} total")
+
+    def _refresh_player_table(self, league: League) -> None:
+        # Tables nobody has asked for yet are built lazily by get_player_table.
+        if self.player_table.built:
+            with self._table_lock:
+                self._sync_player_table(league)
+
+    def get_player_table(self) -> PlayerTable:
+        """Get the materialized table of rostered players, building it on first use."""
+        if not self.player_table.built:
+            with self._table_lock:
+                if not self.player_table.built:
+                    self._sync_player_table(self.league)
+        return self.player_table
+
+    def add_refresh_listener(self, listener: Callable[[Any], None]) -> None:
+        """Register a callback invoked with the new League after every successful refresh."""
+        self._refresh_listeners.append(listener)
+
+    def start_refresher(self, interval: Optional[float] = None) -> None:
+        """Refresh the league snapshot in the background every `interval` seconds (0 disables)."""
+        interval = self.refresh_interval if interval is None else interval
+        if interval <= 0:
+            logger.info("League refresher disabled")
+            return
+        if self._refresher is None or self._refresher.interval != interval:
+            self.stop_refresher()
+            self._refresher = LeagueRefresher(self, interval)
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        if self._refresher is not None:
+            self._refresher.stop()
+
+    def invalidate_cache(self, view: Optional[str] = None) -> None:
+        """Drop cached responses for one view (e.g. 'box_scores'), or for all views."""
+        logger.info(f"Invalidating cache for view: {view or 'all'}")
+        self.cache.invalidate(view)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get hit/miss counters and sizes for every cached view."""
+        return self.cache.stats()
+
+    @cached('standings')
     def get_standings(self) -> List[Dict[str, Any]]:
         """Get current league standings."""
         try:
@@ -48,32 +349,7 @@ class ESPNClient:
                 logger.warning("No standings data found")
                 return None
             
-            standings_data = []
-            for team in standings:
-                logger.debug(f"Processing standings data for team {team.team_name}")
-                team_data = {
-                    'team_id': team.team_id,
-                    'team_name': team.team_name,
-                    'division_id': team.division_id,
-                    'division_name': team.division_name,
-                    'wins': team.wins,
-                    'losses': team.losses,
-                    'ties': team.ties,
-                    'points_for': float(team.points_for) if team.points_for else 0,
-                    'points_against': float(team.points_against) if team.points_against else 0,
-                    'streak_length': int(team.streak_length) if hasattr(team, 'streak_length') else 0,
-                    'streak_type': team.streak_type if hasattr(team, 'streak_type') else None,
-                    'standing': int(team.standing) if team.standing else 0,
-                    'games_back': float(team.games_back) if hasattr(team, 'games_back') else 0,
-                    'final_standing': int(team.final_standing) if team.final_standing else 0,
-                    'waiver_position': int(team.waiver_position) if hasattr(team, 'waiver_position') else 0,
-                    'number_of_moves': int(team.number_of_moves) if hasattr(team, 'number_of_moves') else 0,
-                    'number_of_trades': int(team.number_of_trades) if hasattr(team, 'number_of_trades') else 0,
-                    'roster_moves': int(team.roster_moves) if hasattr(team, 'roster_moves') else 0,
-                    'clinched_playoffs': bool(team.clinched_playoffs) if hasattr(team, 'clinched_playoffs') else False,
-                    'logo_url': team.logo_url if hasattr(team, 'logo_url') else None,
-                }
-                standings_data.append(team_data)
+            standings_data = map_standings(standings)
             
             logger.info(f"Successfully retrieved standings for {len(standings_data)} teams")
             return standings_data
@@ -81,44 +357,29 @@ class ESPNClient:
             logger.error(f"Error getting standings: {str(e)}")
             return None
 
+    @cached('free_agents')
     def get_free_agents(self, position: Optional[str] = None, size: int = 50) -> List[Dict[str, Any]]:
         """Get list of free agents, optionally filtered by position."""
         try:
             free_agents = self.league.free_agents(position=position, size=size)
-            return [{
-                'name': getattr(player, 'name', None),
-                'position': getattr(player, 'position', None),
-                'proTeam': getattr(player, 'proTeam', None),
-                'injuryStatus': getattr(player, 'injuryStatus', None),
-                'stats': getattr(player, 'stats', {}),
-                'total_points': getattr(player, 'total_points', 0),
-                'avg_points': getattr(player, 'avg_points', 0),
-                'percent_owned': getattr(player, 'percent_owned', 0),
-                'percent_started': getattr(player, 'percent_started', 0),
-                'projected_points': getattr(player, 'projected_points', 0)
-            } for player in free_agents]
+            return map_free_agents(free_agents)
         except Exception as e:
             print(f"Error getting free agents: {str(e)}")
             return None
 
+    @cached('transactions')
     def get_transactions(self, 
                         scoring_period: Optional[int] = None, 
-                        types: Set[str] = {"FREEAGENT", "WAIVER", "TRADE"}) -> List[Dict[str, Any]]:
+                        types: Set[str] = TRANSACTION_TYPES) -> List[Dict[str, Any]]:
         """Get list of transactions."""
         try:
             transactions = self.league.transactions(scoring_period=scoring_period, types=types)
-            return [{
-                'type': getattr(trans, 'type', None),
-                'team': getattr(trans.team, 'team_name', None) if trans.team else None,
-                'player': getattr(trans.player, 'name', None) if trans.player else None,
-                'bid_amount': getattr(trans, 'bid_amount', None),
-                'status': getattr(trans, 'status', None),
-                'date': getattr(trans, 'date', None)
-            } for trans in transactions]
+            return map_transactions(transactions)
         except Exception as e:
             print(f"Error getting transactions: {str(e)}")
             return None
 
+    @cached('scoreboard')
     def get_scoreboard(self, matchup_period: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get scoreboard for specific week or current week."""
         try:
@@ -126,81 +387,111 @@ class ESPNClient:
             if not matchups:
                 return None
                 
-            return [{
-                'matchup_id': getattr(m, 'matchup_id', None),
-                'home_team': {
-                    'team_id': getattr(m.home_team, 'team_id', None),
-                    'team_name': getattr(m.home_team, 'team_name', None),
-                    'score': getattr(m, 'home_score', 0),
-                    'projected': getattr(m, 'home_projected', 0)
-                },
-                'away_team': {
-                    'team_id': getattr(m.away_team, 'team_id', None) if m.away_team else None,
-                    'team_name': getattr(m.away_team, 'team_name', None) if m.away_team else None,
-                    'score': getattr(m, 'away_score', 0),
-                    'projected': getattr(m, 'away_projected', 0)
-                }
-            } for m in matchups]
+            return map_scoreboard(matchups)
         except Exception as e:
             print(f"Error getting scoreboard: {str(e)}")
             return None
 
+    @cached('box_scores')
     def get_box_scores(self, 
                       matchup_period: Optional[int] = None, 
                       scoring_period: Optional[int] = None, 
                       matchup_total: bool = True) -> List[Dict[str, Any]]:
-        """Get detailed box scores with player stats."""
+        """Get detailed box scores with player stats. Finished periods come from the season store."""
         try:
-            box_scores = self.league.box_scores(
-                matchup_period=matchup_period,
-                scoring_period=scoring_period,
-                matchup_total=matchup_total
-            )
-            if not box_scores:
-                return None
-                
-            return [{
-                'home_team': {
-                    'team_id': getattr(bs.home_team, 'team_id', None),
-                    'team_name': getattr(bs.home_team, 'team_name', None),
-                    'score': getattr(bs, 'home_score', 0),
-                    'projected': getattr(bs, 'home_projected', 0),
-                    'lineup': [{
-                        'name': getattr(p, 'name', None),
-                        'position': getattr(p, 'position', None),
-                        'points': getattr(p, 'points', 0),
-                        'projected': getattr(p, 'projected_points', 0),
-                        'stats': getattr(p, 'stats', {}),
-                        'injuryStatus': getattr(p, 'injuryStatus', None),
-                        'starting': getattr(p, 'starting', False),
-                        'proTeam': getattr(p, 'proTeam', None)
-                    } for p in getattr(bs, 'home_lineup', [])]
-                },
-                'away_team': {
-                    'team_id': getattr(bs.away_team, 'team_id', None),
-                    'team_name': getattr(bs.away_team, 'team_name', None),
-                    'score': getattr(bs, 'away_score', 0),
-                    'projected': getattr(bs, 'away_projected', 0),
-                    'lineup': [{
-                        'name': getattr(p, 'name', None),
-                        'position': getattr(p, 'position', None),
-                        'points': getattr(p, 'points', 0),
-                        'projected': getattr(p, 'projected_points', 0),
-                        'stats': getattr(p, 'stats', {}),
-                        'injuryStatus': getattr(p, 'injuryStatus', None),
-                        'starting': getattr(p, 'starting', False),
-                        'proTeam': getattr(p, 'proTeam', None)
-                    } for p in getattr(bs, 'away_lineup', [])]
-                }
-            } for bs in box_scores]
+            league = self.league
+            matchup_id, scoring_id = resolve_periods(league, matchup_period, scoring_period)
+            return self._load_box_scores(league, matchup_id, scoring_id, matchup_total)
         except Exception as e:
             print(f"Error getting box scores: {str(e)}")
             return None
 
+    def _load_box_scores(self, league: League, matchup_id: int, scoring_id: int,
+                         matchup_total: bool) -> Optional[List[BoxScore]]:
+        stored = self.load_stored_box_scores(league, matchup_id, scoring_id, matchup_total)
+        if stored is not None:
+            return stored
+        box_scores = league.box_scores(
+            matchup_period=matchup_id,
+            scoring_period=scoring_id,
+            matchup_total=matchup_total
+        )
+        if not box_scores:
+            return None
+
+        box_score_data = map_box_scores(box_scores)
+        self.store_box_scores(league, matchup_id, scoring_id, matchup_total, box_score_data)
+        return box_score_data
+
+    def iter_box_scores(self,
+                        start: int = 1,
+                        end: Optional[int] = None,
+                        matchup_total: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield box scores matchup by matchup over a range of periods, one period in memory at a time.
+
+        The range is in scoring periods, or in matchup periods when `matchup_total`
+        is set, and stops at the current one. Results bypass the response cache so
+        a long export doesn't fill it. If a period can't be loaded, the last item is
+        {'error': ..., 'period': ...} instead, so a partial export can be told apart.
+        """
+        league = self.league
+        current = league.currentMatchupPeriod if matchup_total else league.current_week
+        # resolve_periods falls back to the current period for later ones, which would repeat it.
+        end = min(end or current, current)
+        for period in range(start, end + 1):
+            if matchup_total:
+                matchup_id, scoring_id = resolve_periods(league, period, None)
+            else:
+                matchup_id, scoring_id = resolve_periods(league, None, period)
+            try:
+                box_scores = self._load_box_scores(league, matchup_id, scoring_id, matchup_total)
+            except Exception as e:
+                logger.error(f"Error getting box scores for period {period}, stopping export: {str(e)}")
+                yield {'error': str(e), 'period': period}
+                return
+            for box_score in box_scores or []:
+                yield {
+                    'season': league.year,
+                    'matchup_period': matchup_id,
+                    'scoring_period': int(scoring_id),
+                    'home_team': box_score['home_team'],
+                    'away_team': box_score['away_team'],
+                }
+
+    def load_stored_box_scores(self, league: League, matchup_id: int, scoring_id: int,
+                               matchup_total: bool) -> Optional[List[Dict[str, Any]]]:
+        """Box scores for a finished period from the season store, or None to fetch from ESPN."""
+        store = self.season_store
+        if store is None:
+            return None
+        try:
+            if not store.has_final_period(league.league_id, league.year, matchup_id, scoring_id, matchup_total):
+                return None
+            return store.load_box_scores(league.league_id, league.year, matchup_id, scoring_id, matchup_total)
+        except Exception as e:
+            logger.error(f"Error reading season store: {str(e)}")
+            return None
+
+    def store_box_scores(self, league: League, matchup_id: int, scoring_id: int,
+                         matchup_total: bool, box_scores: List[Dict[str, Any]]) -> None:
+        store = self.season_store
+        if store is None:
+            return
+        try:
+            store.save_box_scores(league.league_id, league.year, matchup_id, scoring_id, matchup_total,
+                                  box_scores, final=is_final_period(league, matchup_id, scoring_id, matchup_total))
+        except Exception as e:
+            logger.error(f"Error writing season store: {str(e)}")
+
+    @cached('player_info')
     def get_player_info(self, 
                        name: Optional[str] = None, 
-                       player_ids: Optional[Union[int, List[int]]] = None) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
-        """Get detailed player information. Can fetch multiple players at once."""
+                       player_ids: Optional[Union[int, List[int]]] = None,
+                       include_stats: bool = True) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Get detailed player information. Can fetch multiple players at once.
+
+        Without `include_stats` the per-game stat splits are left out of the result.
+        """
         try:
             logger.info(f"Fetching player information for player IDs: {player_ids}")
             players = self.league.player_info(
@@ -215,18 +506,7 @@ class ESPNClient:
             if not isinstance(players, list):
                 players = [players]
                 
-            player_data = [{
-                'name': getattr(p, 'name', None),
-                'position': getattr(p, 'position', None),
-                'proTeam': getattr(p, 'proTeam', None),
-                'injuryStatus': getattr(p, 'injuryStatus', None),
-                'stats': getattr(p, 'stats', {}),
-                'total_points': getattr(p, 'total_points', 0),
-                'avg_points': getattr(p, 'avg_points', 0),
-                'percent_owned': getattr(p, 'percent_owned', 0),
-                'percent_started': getattr(p, 'percent_started', 0),
-                'projected_points': getattr(p, 'projected_points', 0)
-            } for p in players]
+            player_data = map_players(players, include_stats=include_stats)
             
             logger.info(f"Successfully retrieved player information for {len(player_data)} players")
             return player_data
@@ -263,14 +543,22 @@ class ESPNClient:
             return None
 
     def get_player_id_by_name(self, name: str) -> Optional[int]:
-        """Get player ID by name."""
+        """Get player ID by name, resolving from the local index before asking ESPN."""
         try:
-            logger.info(f"Fetching player ID for name: {name}")
+            player_id = self.player_index.resolve(name)
+            if player_id is not None:
+                return player_id
+            logger.info(f"Player index miss, fetching player ID for name: {name}")
             player = self.league.player_info(name=name)
             if not player:
                 logger.warning(f"No player found for name: {name}")
                 return None
+            self.player_index.add(player.playerId, player.name)
             return player.playerId
         except Exception as e:
             logger.error(f"Error getting player ID: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def search_players(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get ranked player name candidates for autocomplete or typo correction."""
+        return self.player_index.search(query, limit=limit)
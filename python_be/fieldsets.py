@@ -0,0 +1,51 @@
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+from records import FreeAgent, LineupPlayer, PlayerInfo
+
+# Fields a `fields=` parameter may name on each kind of route.
+PLAYER_FIELDS = frozenset(PlayerInfo.__slots__) | frozenset(FreeAgent.__slots__)
+LINEUP_FIELDS = frozenset(LineupPlayer.__slots__)
+TEAM_FIELDS = frozenset((
+    'team_id', 'team_name', 'division_id', 'division_name', 'wins', 'losses', 'ties', 'points_for',
+    'points_against', 'standing', 'roster_size', 'logo_url', 'roster', 'schedule',
+))
+
+
+def parse_fields(value: Optional[str], allowed: FrozenSet[str]) -> Optional[FrozenSet[str]]:
+    """Parse a comma-separated `fields=` value; None means every field. Raises ValueError on unknown names."""
+    if value is None:
+        return None
+    fields = frozenset(name.strip() for name in value.split(',') if name.strip())
+    unknown = fields - allowed
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def wants_stats(fields: Optional[FrozenSet[str]]) -> bool:
+    return fields is None or 'stats' in fields
+
+
+def project(row: Mapping, fields: Optional[FrozenSet[str]]) -> Any:
+    """Keep only `fields` of a record or dict, in the row's own field order."""
+    if fields is None:
+        return row
+    return {name: row[name] for name in row if name in fields}
+
+
+def project_rows(rows: Iterable[Mapping], fields: Optional[FrozenSet[str]]) -> Any:
+    if fields is None:
+        return rows
+    return [project(row, fields) for row in rows]
+
+
+def project_box_score(box_score: Mapping, fields: Optional[FrozenSet[str]]) -> Any:
+    """Apply `fields` to every lineup player; team-level fields are always kept."""
+    if fields is None:
+        return box_score
+    projected: Dict[str, Any] = dict(box_score)
+    for side in ('home_team', 'away_team'):
+        team = dict(box_score[side])
+        team['lineup'] = [project(player, fields) for player in team.get('lineup', ())]
+        projected[side] = team
+    return projected
@@ -0,0 +1,230 @@
+import gzip
+import hashlib
+import itertools
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+import brotli
+import orjson
+from fastapi import Request, Response
+import profiling
+
+# Seconds clients may reuse a response before revalidating with If-None-Match.
+# Override with HTTP_MAX_AGE_<NAME>, e.g. HTTP_MAX_AGE_SCOREBOARD=5.
+DEFAULT_MAX_AGES = {
+    'standings': 30,
+    'teams': 30,
+    'team': 30,
+    'scoreboard': 10,
+    'fantasycast': 5,
+    'player_stats': 60,
+    'rankings': 30,
+}
+
+# Total size of pre-encoded response bodies kept in memory.
+ENCODED_CACHE_BYTES = int(os.getenv("ENCODED_CACHE_MB", 64)) * 2**20
+
+# Bodies smaller than this are sent uncompressed.
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+
+# Compressed bodies are cached per data version, so spend a little more CPU for smaller output.
+COMPRESSORS = {
+    'br': lambda body: brotli.compress(body, quality=7),
+    'gzip': lambda body: gzip.compress(body, compresslevel=6),
+}
+
+# Versions restart with the process; this keeps ETags from two runs apart.
+BOOT_ID = uuid.uuid4().hex[:8]
+
+
+def max_age(name: str) -> int:
+    return int(os.getenv(f"HTTP_MAX_AGE_{name.upper()}", DEFAULT_MAX_AGES.get(name, 0)))
+
+
+def make_etag(request: Request, version: Hashable) -> str:
+    """Strong ETag for this path and query string at a data version.
+
+    `request.state.cache_scope` (set per league and credentials) keeps bodies
+    cached for one league client from being served to another.
+    """
+    query = sorted(request.query_params.multi_items())
+    scope = getattr(request.state, 'cache_scope', '')
+    raw = f"{BOOT_ID}|{scope}|{request.url.path}|{query}|{version}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:24] + '"'
+
+
+def variant_etag(etag: str, coding: Optional[str]) -> str:
+    """Each content coding is its own representation, so it gets its own strong ETag."""
+    return f'{etag[:-1]}-{coding}"' if coding else etag
+
+
+def matching_etag(request: Request, *etags: str) -> Optional[str]:
+    """The first of `etags` the client already holds according to If-None-Match."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return None
+    if header.strip() == '*':
+        return etags[0]
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    held = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return next((etag for etag in etags if etag in held), None)
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    """Best supported coding from Accept-Encoding (brotli wins ties), or None for identity.
+
+    q=0 marks a coding as not acceptable; `*` covers codings the header doesn't name.
+    """
+    header = request.headers.get('accept-encoding', '')
+    weights: Dict[str, float] = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                continue
+        if coding:
+            weights[coding] = q
+    best, best_q = None, 0.0
+    for coding in COMPRESSORS:
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q <= 0:
+            continue
+        if q > best_q or (q == best_q and coding == 'br'):
+            best, best_q = coding, q
+    return best
+
+
+def cache_headers(request: Request, name: str, etag: str) -> Dict[str, str]:
+    # Responses read with the caller's own ESPN cookies must never be stored by shared caches.
+    audience = 'private' if getattr(request.state, 'credentialed', False) else 'public'
+    return {
+        'ETag': etag,
+        'Cache-Control': f"{audience}, max-age={max_age(name)}, must-revalidate",
+        'Vary': 'Accept-Encoding, X-ESPN-S2, X-ESPN-SWID',
+    }
+
+
+def _default(value: Any) -> Any:
+    # Records (and any other mapping) serialize as objects; orjson recurses into the result.
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_json(content: Any) -> bytes:
+    """orjson encoding for route payloads, records included, without a jsonable_encoder pass."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class EncodedCache:
+    """LRU of encoded response bodies keyed by ETag, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = ENCODED_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str) -> Optional[bytes]:
+        with self._lock:
+            body = self._data.get(etag)
+            if body is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(etag)
+            self.hits += 1
+            return body
+
+    def set(self, etag: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._data.pop(etag, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._data[etag] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._data), 'bytes': self.size, 'hits': self.hits, 'misses': self.misses}
+
+
+encoded_cache = EncodedCache()
+
+
+def respond(request: Request, name: str, version: Hashable, build: Callable[[], Any]) -> Response:
+    """Serve `build()` as JSON with ETag caching, reusing the encoded body for as long as `version` holds.
+
+    A matching If-None-Match gets a 304; a cached body skips both `build()` and encoding.
+    Bodies of at least COMPRESSION_MIN_BYTES are compressed with the negotiated coding,
+    and the compressed bytes are cached next to the plain ones.
+    """
+    etag = make_etag(request, version)
+    coding = negotiate_encoding(request)
+    compressed_etag = variant_etag(etag, coding)
+    held = matching_etag(request, compressed_etag, etag)
+    if held:
+        return Response(status_code=304, headers=cache_headers(request, name, held))
+
+    body = encoded_cache.get(compressed_etag) if coding else None
+    if body is not None:
+        return _json_response(request, body, name, compressed_etag, coding)
+    body = encoded_cache.get(etag)
+    if body is None:
+        body = profiling.timed('serialize', encode_json, build())
+        encoded_cache.set(etag, body)
+    if coding is None or len(body) < COMPRESSION_MIN_BYTES:
+        return _json_response(request, body, name, etag, None)
+    body = profiling.timed('serialize', COMPRESSORS[coding], body)
+    encoded_cache.set(compressed_etag, body)
+    return _json_response(request, body, name, compressed_etag, coding)
+
+
+def _json_response(request: Request, body: bytes, name: str, etag: str, coding: Optional[str]) -> Response:
+    headers = cache_headers(request, name, etag)
+    if coding:
+        headers['Content-Encoding'] = coding
+    return Response(content=body, media_type='application/json', headers=headers)
+
+
+class RowVersions:
+    """Version numbers for live, cached row lists (scoreboard, box scores).
+
+    Cached rows are shared objects until the response cache refetches them, so
+    a list whose rows are the same objects as last time is the same version.
+    References are kept so a freed row's id can never be mistaken for a new one.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._seen: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def version(self, key: Hashable, rows: Sequence[Any]) -> int:
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None:
+                version, previous = seen
+                if len(previous) == len(rows) and all(a is b for a, b in zip(previous, rows)):
+                    self._seen.move_to_end(key)
+                    return version
+            version = next(self._counter)
+            self._seen[key] = (version, tuple(rows))
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.maxsize:
+                self._seen.popitem(last=False)
+            return version
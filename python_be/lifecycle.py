@@ -0,0 +1,144 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from espn_client import ESPNClient
+from async_espn_client import AsyncESPNClient
+from client_pool import pool
+import bot
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('lifecycle')
+
+
+class StartupTimer:
+    """Records how long each startup phase took plus process CPU use since startup."""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.started_wall = time.time() - (time.perf_counter() - self.started)
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_at: Optional[float] = None
+        self.ready_cpu: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self.record(name, time.perf_counter() - started, error)
+
+    def record(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        entry = {'phase': name, 'seconds': round(seconds, 4)}
+        if error:
+            entry['error'] = error
+        self.phases.append(entry)
+        logger.info(f"Startup phase {name} took {seconds:.3f}s" + (f" (failed: {error})" if error else ""))
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.perf_counter()
+        self.ready_cpu = time.process_time()
+
+    def report(self) -> Dict[str, Any]:
+        now = time.perf_counter()
+        cpu = time.process_time()
+        report = {
+            'started_at': self.started_wall,
+            'phases': list(self.phases),
+            'startup_seconds': round(self.ready_at - self.started, 4) if self.ready_at else None,
+            'uptime_seconds': round(now - self.started, 2),
+            'process_cpu_seconds': round(cpu, 3),
+        }
+        if self.ready_at:
+            # Average CPU share since startup finished, i.e. steady-state load.
+            report['steady_state_cpu_percent'] = round(100 * (cpu - self.ready_cpu) / max(now - self.ready_at, 1e-9), 2)
+        return report
+
+
+class Lifecycle:
+    """Starts and stops everything the process runs on the uvicorn event loop.
+
+    The API and the Discord bot share the ESPNClient singleton (the pool's
+    default league), so the cache warmed here and the background league
+    refresher serve both. Nothing builds it at import, so the espn_client
+    phase measures the initial League fetch.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.timer = StartupTimer(started)
+        self.client: Optional[ESPNClient] = None
+        self.async_client: Optional[AsyncESPNClient] = None
+        self._bot_task: Optional[asyncio.Task] = None
+        self._bot_ready_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self.timer.phase('espn_client'):
+            # Building the League is a blocking fetch the first time round.
+            league = await loop.run_in_executor(None, pool.default)
+            self.client = league.client
+            self.async_client = league.async_client
+        with self.timer.phase('cache_warmup'):
+            await self._warm_cache(loop)
+        with self.timer.phase('league_refresher'):
+            self.client.start_refresher()
+        with self.timer.phase('discord_bot'):
+            self._start_bot()
+        self.timer.mark_ready()
+        logger.info(f"Startup complete in {self.timer.report()['startup_seconds']}s")
+
+    async def _warm_cache(self, loop) -> None:
+        results = await asyncio.gather(
+            loop.run_in_executor(None, self.client.get_standings),
+            loop.run_in_executor(None, self.client.get_player_table),
+            self.async_client.get_scoreboard(),
+            self.async_client.get_box_scores(),
+            return_exceptions=True,
+        )
+        for name, result in zip(('standings', 'player_table', 'scoreboard', 'box_scores'), results):
+            if isinstance(result, Exception) or result is None:
+                logger.warning(f"Cache warmup for {name} failed: {result}")
+
+    def _start_bot(self) -> None:
+        if not bot.TOKEN:
+            logger.warning("DISCORD_BOT_TOKEN not set, not starting the Discord bot")
+            return
+        self._bot_task = asyncio.create_task(bot.start_bot(), name='discord-bot')
+        self._bot_task.add_done_callback(self._on_bot_exit)
+        self._bot_ready_task = asyncio.create_task(self._record_bot_ready(bot.bot))
+
+    async def _record_bot_ready(self, discord_bot) -> None:
+        started = time.perf_counter()
+        await discord_bot.wait_until_ready()
+        self.timer.record('discord_bot_ready', time.perf_counter() - started)
+
+    @staticmethod
+    def _on_bot_exit(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Discord bot stopped with an error: {task.exception()}")
+
+    async def stop(self) -> None:
+        logger.info("Shutting down")
+        if self._bot_task is not None:
+            await bot.stop_bot()
+            for task in (self._bot_ready_task, self._bot_task):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(self._bot_task, self._bot_ready_task, return_exceptions=True)
+        bot.executor.shutdown()
+        # Stops every league's refresher and closes the shared ESPN connection pool.
+        await pool.aclose()
+
+    def report(self) -> Dict[str, Any]:
+        report = self.timer.report()
+        report['bot_running'] = self._bot_task is not None and not self._bot_task.done()
+        if self.client is not None:
+            report['snapshot_version'] = self.client.snapshot_version
+        report['league_pool'] = pool.stats()
+        return report
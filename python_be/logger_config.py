@@ -1,18 +1,190 @@
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+import orjson
+
+# Logging is configured once per process: loggers hand records to a bounded queue
+# and a listener thread formats and writes them, so request handlers never wait on
+# stderr. Environment:
+#   LOG_LEVEL         root level (default INFO)
+#   LOG_LEVELS        per-logger levels, e.g. "espn_client=DEBUG,discord=WARNING"
+#   LOG_FORMAT        "text" (default) or "json"
+#   LOG_RATE_LIMIT    records per second each logger may emit, 0 for no limit (default 50)
+#   LOG_RATE_BURST    records a logger may emit at once before the limit applies (default 100)
+#   LOG_SAMPLE        per-logger fraction of records below WARNING to keep, e.g. "espn_client=0.1"
+#   LOG_QUEUE_SIZE    records waiting for the listener before new ones are dropped (default 10000)
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Loggers that servers and libraries give handlers of their own; configure_logging
+# sends them through the queue instead.
+OWN_HANDLER_LOGGERS = ('uvicorn', 'uvicorn.error', 'uvicorn.access')
+
+# Attributes every LogRecord has; anything else came in through `extra=`. uvicorn's
+# color_message duplicates the message with terminal escapes.
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'color_message'}
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _parse_map(value: str) -> Dict[str, str]:
+    pairs = (item.split('=', 1) for item in value.split(',') if '=' in item)
+    return {name.strip(): setting.strip() for name, setting in pairs}
+
+
+def extra_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra=` fields as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+            **extra_fields(record),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class TextFormatter(logging.Formatter):
+    """The classic one-line format, followed by any `extra=` fields as key=value."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = extra_fields(record)
+        if extras:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in extras.items())
+        return line
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-logger token bucket plus sampling of records below WARNING.
+
+    Runs on the calling thread before a record is queued, so dropped records
+    cost a dict lookup. The next record a logger gets through reports how many
+    of its records were suppressed in between.
+    """
+
+    def __init__(self, rate: float, burst: float, samples: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.samples = samples or {}
+        self._buckets: Dict[str, list] = {}
+        self._sampled: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = record.name
+        if record.levelno < logging.WARNING and name in self.samples:
+            fraction = self.samples[name]
+            # Deterministic 1-in-N rather than random, so rare paths still show up.
+            every = max(int(round(1 / fraction)), 1) if fraction > 0 else 0
+            with self._lock:
+                seen = self._sampled.get(name, 0) + 1
+                self._sampled[name] = seen
+            if not every or seen % every:
+                return False
+        if not self.rate:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                bucket = self._buckets[name] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking or raising when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(force: bool = False) -> Optional[logging.handlers.QueueListener]:
+    """Route every logger through one queue and listener thread. Safe to call repeatedly."""
+    global _listener
+    with _lock:
+        if _listener is not None and not force:
+            return _listener
+        if _listener is not None:
+            _listener.stop()
+
+        stream = logging.StreamHandler()
+        if os.getenv("LOG_FORMAT", "text").lower() == "json":
+            stream.setFormatter(JSONFormatter())
+        else:
+            stream.setFormatter(TextFormatter(TEXT_FORMAT))
+
+        handler = DroppingQueueHandler(queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", 10000))))
+        handler.addFilter(RateLimitFilter(
+            rate=float(os.getenv("LOG_RATE_LIMIT", 50)),
+            burst=float(os.getenv("LOG_RATE_BURST", 100)),
+            samples={name: float(fraction) for name, fraction in _parse_map(os.getenv("LOG_SAMPLE", "")).items()},
+        ))
+
+        root = logging.getLogger()
+        for existing in [h for h in root.handlers if isinstance(h, DroppingQueueHandler)]:
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        # `uvicorn main:app` installs its logging config before importing the app;
+        # its stream handlers would write every access line synchronously.
+        for name in OWN_HANDLER_LOGGERS:
+            own = logging.getLogger(name)
+            for existing in list(own.handlers):
+                own.removeHandler(existing)
+            own.propagate = True
+        for name, level in _parse_map(os.getenv("LOG_LEVELS", "")).items():
+            logging.getLogger(name).setLevel(level.upper())
+
+        _listener = logging.handlers.QueueListener(handler.queue, stream, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(shutdown_logging)
+
 
 def setup_logger(name):
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Create console handler
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.INFO)
-    
-    # Create formatter and add it to the handler
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    ch.setFormatter(formatter)
-    
-    # Add the handler to the logger
-    logger.addHandler(ch)
-    
-    return logger
\ No newline at end of file
+    configure_logging()
+    return logging.getLogger(name)
@@ -1,12 +1,28 @@
-from fastapi import FastAPI
+import time
+started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response
 from routes import router
-from bot import run_bot
-import asyncio
+from lifecycle import Lifecycle
+from metrics import MetricsMiddleware, render
+import profiling
 import logging
 
 logger = logging.getLogger(__name__)
-app = FastAPI(title="Fantasy Basketball API")
+lifecycle = Lifecycle(started=started)
+lifecycle.timer.record('imports', time.perf_counter() - started)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The bot, the league refresher and the API all run on uvicorn's event loop.
+    await lifecycle.start()
+    yield
+    await lifecycle.stop()
+
+app = FastAPI(title="Fantasy Basketball API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -16,6 +32,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency and status counts for /metrics
+app.add_middleware(MetricsMiddleware)
+# On-demand request profiling; not installed at all unless PROFILE_TOKEN is set
+if profiling.enabled():
+    app.add_middleware(profiling.ProfilingMiddleware)
 
 app.include_router(router)
 
@@ -26,18 +47,51 @@ async def root():
     logger.warning("Root endpoint hit")
     logger.error("Root endpoint hit")
     logger.critical("Root endpoint hit")
-    loop = asyncio.get_event_loop()
-    loop.create_task(run_bot())
     return {"message": "Fantasy Basketball API is running"}
-    
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("Starting up the bot")
-    loop = asyncio.get_event_loop()
-    loop.create_task(run_bot())
+@app.get("/status")
+async def status():
+    """Startup phase timings and steady-state CPU use."""
+    return lifecycle.report()
+
+def require_admin(token: str) -> None:
+    if not profiling.is_admin(token):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@app.get("/debug/profiles")
+async def list_profiles(x_profile_token: str = Header(None)):
+    """Recent request profiles, newest first."""
+    require_admin(x_profile_token)
+    return profiling.store.list()
+
+@app.get("/debug/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_profile_token: str = Header(None)):
+    """One profile's phase timings and hottest functions."""
+    require_admin(x_profile_token)
+    profile = profiling.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile.report()
+
+@app.get("/debug/profiles/{profile_id}/folded")
+async def get_profile_stacks(profile_id: str, x_profile_token: str = Header(None)):
+    """One profile's stack samples in collapsed-stack format, for flame graphs."""
+    require_admin(x_profile_token)
+    profile = profiling.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.folded())
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics for routes, ESPN client calls, caches and bot commands."""
+    body, content_type = render()
+    return Response(content=body, media_type=content_type)
 
 if __name__ == "__main__":
     # Start the FastAPI server
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    from logger_config import configure_logging
+    configure_logging()
+    # log_config=None keeps uvicorn's own handlers out, so its logs go through the queue too.
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
\ No newline at end of file
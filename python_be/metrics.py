@@ -0,0 +1,142 @@
+import time
+from typing import Any, Callable, Dict, List
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.routing import Match
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('metrics')
+
+# Route latencies are mostly cache hits, so the buckets start well below the client defaults.
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_DURATION = Histogram('api_request_duration_seconds', 'API request latency by route template',
+                             ['method', 'route'], buckets=LATENCY_BUCKETS)
+REQUESTS = Counter('api_requests', 'API responses by route template and status', ['method', 'route', 'status'])
+UPSTREAM_DURATION = Histogram('espn_client_call_duration_seconds',
+                              'Duration of ESPN client calls that missed the response cache',
+                              ['client', 'method'])
+UPSTREAM_CALLS = Counter('espn_client_calls', 'ESPN client calls that missed the response cache, by outcome',
+                         ['client', 'method', 'outcome'])
+COMMAND_DURATION = Histogram('discord_command_duration_seconds', 'Discord bot command latency', ['command'])
+COMMANDS = Counter('discord_commands', 'Discord bot commands by outcome', ['command', 'outcome'])
+
+
+def record_upstream(client: str, method: str, seconds: float, ok: bool) -> None:
+    """Count one upstream call of an ESPN client method; `ok` is False for errors and empty results."""
+    UPSTREAM_DURATION.labels(client, method).observe(seconds)
+    UPSTREAM_CALLS.labels(client, method, 'ok' if ok else 'error').inc()
+
+
+def record_command(command: str, seconds: float, ok: bool) -> None:
+    COMMAND_DURATION.labels(command).observe(seconds)
+    COMMANDS.labels(command, 'ok' if ok else 'error').inc()
+
+
+class CacheCollector:
+    """Reports cache counters at scrape time, so cache lookups pay nothing extra for metrics.
+
+    Each source returns stats per view: {view: {'hits', 'misses', 'size' or 'entries', ...}}.
+    """
+
+    def __init__(self):
+        self.sources: Dict[str, Callable[[], Dict[str, Dict[str, Any]]]] = {}
+
+    def watch(self, cache: str, stats: Callable[[], Dict[str, Dict[str, Any]]]) -> None:
+        # Keyed by name, so re-registering (e.g. a reloaded module) replaces the old source.
+        self.sources[cache] = stats
+
+    def collect(self):
+        labels = ['cache', 'view']
+        hits = CounterMetricFamily('cache_hits', 'Cache lookups that found a fresh entry', labels=labels)
+        misses = CounterMetricFamily('cache_misses', 'Cache lookups that missed or found an expired entry',
+                                     labels=labels)
+        ratio = GaugeMetricFamily('cache_hit_ratio', 'Hits over lookups since startup', labels=labels)
+        entries = GaugeMetricFamily('cache_entries', 'Entries currently cached', labels=labels)
+        size = GaugeMetricFamily('cache_bytes', 'Bytes currently cached', labels=labels)
+        evictions = CounterMetricFamily('cache_evictions', 'Entries evicted to stay under the size limit',
+                                        labels=labels)
+        deduplicated = CounterMetricFamily('cache_deduplicated', 'Misses that shared a concurrent upstream call',
+                                           labels=labels)
+        for cache, source in list(self.sources.items()):
+            try:
+                views = source()
+            except Exception as e:
+                logger.error(f"Error reading {cache} cache stats: {str(e)}")
+                continue
+            for view, stats in views.items():
+                values = [cache, view]
+                lookups = stats['hits'] + stats['misses']
+                hits.add_metric(values, stats['hits'])
+                misses.add_metric(values, stats['misses'])
+                ratio.add_metric(values, stats['hits'] / lookups if lookups else 0.0)
+                entries.add_metric(values, stats.get('size', stats.get('entries', 0)))
+                if 'bytes' in stats:
+                    size.add_metric(values, stats['bytes'])
+                if 'evictions' in stats:
+                    evictions.add_metric(values, stats['evictions'])
+                if 'deduplicated' in stats:
+                    deduplicated.add_metric(values, stats['deduplicated'])
+        return [hits, misses, ratio, entries, size, evictions, deduplicated]
+
+
+caches = CacheCollector()
+REGISTRY.register(caches)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request, labelled by route template rather than raw path.
+
+    Unmatched paths share one label so scanners can't grow the series count.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[Any, List[Any]] = {}
+
+    def _route(self, scope: Dict[str, Any]) -> str:
+        endpoint = scope.get('endpoint')
+        if endpoint is None:
+            return 'unmatched'
+        routes = self._routes.get(endpoint)
+        if routes is None:
+            self._routes = {}
+            for route in getattr(scope.get('app'), 'routes', []):
+                if hasattr(route, 'endpoint'):
+                    self._routes.setdefault(route.endpoint, []).append(route)
+            routes = self._routes.setdefault(endpoint, [])
+        if len(routes) == 1:
+            return routes[0].path
+        # One endpoint can be mounted under several paths (e.g. per-league routes),
+        # so pick the one that matched this request.
+        for route in routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return 'unmatched'
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self._route(scope)
+            REQUEST_DURATION.labels(scope['method'], route).observe(time.perf_counter() - started)
+            REQUESTS.labels(scope['method'], route, str(status)).inc()
+
+
+def render() -> tuple:
+    """The Prometheus text exposition of every registered metric, and its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
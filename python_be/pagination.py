@@ -0,0 +1,167 @@
+import base64
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('pagination')
+
+# sort name -> (key function, descending); a None key function keeps source order
+SortSpec = Dict[str, Tuple[Optional[Callable[[Dict[str, Any]], Any]], bool]]
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Opaque, URL-safe cursor token."""
+    raw = json.dumps(state, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """Decode a cursor from encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        state = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(state, dict) or not isinstance(state.get('o'), int) or state['o'] < 0:
+        raise ValueError("Invalid cursor")
+    return state
+
+
+def _freeze_key(key: Any) -> Any:
+    # Sort keys go through JSON in cursors, which turns tuples into lists.
+    return tuple(_freeze_key(k) for k in key) if isinstance(key, (list, tuple)) else key
+
+
+def _first_after(keys: List[Any], key: Any, descending: bool) -> int:
+    """Position of the first key that sorts strictly after `key`."""
+    lo, hi = 0, len(keys)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (keys[mid] >= key) if descending else (keys[mid] <= key):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class PageIndex:
+    """Rows plus presorted position arrays for every sort key and filter value.
+
+    Orders are built once per snapshot, so a page is a slice of a prebuilt
+    array. Cursors carry the index version and the last sort key seen: on the
+    same version they resume by offset, on a newer one by binary search.
+    """
+
+    def __init__(self, rows: Sequence[Dict[str, Any]], sorts: SortSpec,
+                 filters: Sequence[str] = (), version: Hashable = 0):
+        self.rows = list(rows)
+        self.version = version
+        self.sorts = sorts
+        self.filters = tuple(filters)
+        self._orders: Dict[Tuple[str, Optional[str], Any], List[int]] = {}
+        self._keys: Dict[Tuple[str, Optional[str], Any], List[Any]] = {}
+        for sort, (key_fn, descending) in sorts.items():
+            if key_fn is None:
+                keys = list(range(len(self.rows)))
+            else:
+                keys = [_freeze_key(key_fn(row)) for row in self.rows]
+            # Stable: rows with equal keys keep their source order.
+            order = sorted(range(len(self.rows)), key=keys.__getitem__, reverse=descending)
+            self._store(sort, None, None, order, keys)
+            for field in self.filters:
+                groups: Dict[Any, List[int]] = {}
+                for pos in order:
+                    groups.setdefault(self.rows[pos].get(field), []).append(pos)
+                for value, positions in groups.items():
+                    self._store(sort, field, value, positions, keys)
+
+    def _store(self, sort: str, field: Optional[str], value: Any, order: List[int], keys: List[Any]) -> None:
+        self._orders[(sort, field, value)] = order
+        self._keys[(sort, field, value)] = [keys[pos] for pos in order]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def page(self,
+             sort: str,
+             filter_field: Optional[str] = None,
+             filter_value: Any = None,
+             cursor: Optional[Dict[str, Any]] = None,
+             page: int = 1,
+             page_size: int = 10) -> Dict[str, Any]:
+        """One page in the same shape as routes.paginate_results, plus next/previous cursors."""
+        if sort not in self.sorts:
+            raise ValueError(f"Unknown sort: {sort}")
+        if filter_value is None:
+            filter_field = None
+        elif filter_field not in self.filters:
+            raise ValueError(f"Unknown filter: {filter_field}")
+        slot = (sort, filter_field, filter_value)
+        order = self._orders.get(slot, [])
+        keys = self._keys.get(slot, [])
+        descending = self.sorts[sort][1]
+        total_items = len(order)
+        # Source-order positions mean nothing in a newer snapshot, so those cursors resume by offset.
+        keyed = self.sorts[sort][0] is not None
+
+        if cursor is not None and cursor.get('s') != [sort, filter_field, filter_value]:
+            raise ValueError("Cursor does not match the requested sort or filter")
+        if cursor is None:
+            start = (page - 1) * page_size
+        elif cursor.get('v') == self.version or cursor.get('k') is None or not keyed:
+            start = cursor['o']
+        else:
+            start = _first_after(keys, _freeze_key(cursor['k']), descending)
+        end = min(start + page_size, total_items)
+
+        def cursor_at(position: int) -> str:
+            return encode_cursor({
+                'v': self.version,
+                's': [sort, filter_field, filter_value],
+                'o': position,
+                'k': keys[position - 1] if position > 0 and keyed else None,
+            })
+
+        return {
+            'items': [self.rows[pos] for pos in order[start:end]],
+            'pagination': {
+                'total_items': total_items,
+                'total_pages': (total_items + page_size - 1) // page_size,
+                'current_page': start // page_size + 1,
+                'page_size': page_size,
+                'has_next': end < total_items,
+                'has_previous': start > 0,
+                'next_cursor': cursor_at(end) if end < total_items else None,
+                'previous_cursor': cursor_at(max(start - page_size, 0)) if start > 0 else None,
+            }
+        }
+
+
+class PageIndexes:
+    """Named PageIndex objects, rebuilt only when their source version changes."""
+
+    def __init__(self):
+        self._indexes: Dict[str, PageIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self,
+            name: str,
+            version: Hashable,
+            rows: Callable[[], Optional[Sequence[Dict[str, Any]]]],
+            sorts: SortSpec,
+            filters: Sequence[str] = ()) -> Optional[PageIndex]:
+        """The index for `name` at `version`, calling `rows()` to rebuild it when stale."""
+        index = self._indexes.get(name)
+        if index is not None and index.version == version:
+            return index
+        with self._lock:
+            index = self._indexes.get(name)
+            if index is None or index.version != version:
+                data = rows()
+                if data is None:
+                    return None
+                index = self._indexes[name] = PageIndex(data, sorts, filters, version)
+                logger.info(f"Built page index {name} ({len(index)} rows, version {version})")
+            return index
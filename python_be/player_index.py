@@ -0,0 +1,264 @@
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Name suffixes ignored when matching, so "Jaren Jackson" finds "Jaren Jackson Jr."
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Common first-name short forms, expanded before matching.
+FIRST_NAME_ALIASES = {
+    'steph': 'stephen',
+    'nic': 'nicolas',
+    'nick': 'nicolas',
+    'mike': 'michael',
+    'chris': 'christopher',
+    'matt': 'matthew',
+    'alex': 'alexander',
+    'cam': 'cameron',
+    'zach': 'zachary',
+    'tim': 'timothy',
+    'pj': 'p j',
+    'og': 'o g',
+}
+
+# Well-known player nicknames mapped to full names; normalized below, like index keys.
+NICKNAMES = {
+    'king james': 'lebron james',
+    'the king': 'lebron james',
+    'chef curry': 'stephen curry',
+    'the joker': 'nikola jokic',
+    'joker': 'nikola jokic',
+    'greek freak': 'giannis antetokounmpo',
+    'the greek freak': 'giannis antetokounmpo',
+    'the process': 'joel embiid',
+    'kd': 'kevin durant',
+    'the brow': 'anthony davis',
+    'ad': 'anthony davis',
+    'dame': 'damian lillard',
+    'kat': 'karl anthony towns',
+    'sga': 'shai gilgeous alexander',
+    'jimmy buckets': 'jimmy butler',
+    'spida': 'donovan mitchell',
+    'cp3': 'chris paul',
+    'wemby': 'victor wembanyama',
+    'ant': 'anthony edwards',
+    'ant man': 'anthony edwards',
+    'luka': 'luka doncic',
+    'trae': 'trae young',
+    'zion': 'zion williamson',
+    'giannis': 'giannis antetokounmpo',
+    'jokic': 'nikola jokic',
+}
+
+# Minimum trigram similarity for a fuzzy candidate, and for resolving a typo to an ID.
+MIN_FUZZY_SCORE = 0.3
+MIN_RESOLVE_SCORE = 0.6
+
+_NON_ALNUM = re.compile(r'[^a-z0-9 ]+')
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents, punctuation and suffixes: "Luka Dončić" -> "luka doncic"."""
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    name = name.lower().replace('-', ' ').replace('.', '').replace("'", '')
+    name = _NON_ALNUM.sub(' ', name)
+    tokens = [t for t in name.split() if t not in SUFFIXES]
+    if tokens and tokens[0] in FIRST_NAME_ALIASES:
+        tokens[0] = FIRST_NAME_ALIASES[tokens[0]]
+    return ' '.join(tokens)
+
+
+# "cp3" must resolve to "christopher paul", the key "Chris Paul" is indexed under.
+NICKNAMES = {normalize_name(nickname): normalize_name(name) for nickname, name in NICKNAMES.items()}
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _IndexState:
+    """Immutable-once-built lookup tables; PlayerIndex swaps whole states atomically."""
+
+    def __init__(self):
+        self.names: Dict[int, str] = {}
+        self.normalized: Dict[int, str] = {}
+        self.exact: Dict[str, Set[int]] = defaultdict(set)
+        self.trie: Dict[str, Any] = {}
+        self.grams: Dict[str, Set[int]] = defaultdict(set)
+        self.gram_counts: Dict[int, int] = {}
+
+    @staticmethod
+    def _keys(key: str) -> Tuple[List[str], List[str]]:
+        """Exact keys and trie completions for a normalized name."""
+        tokens = key.split()
+        exact = [key]
+        # Initials ("sga", "kat") resolve exactly as well.
+        if len(tokens) > 1:
+            exact.append(''.join(t[0] for t in tokens))
+        # Index the full name and every token, so "cur" and "steph" both complete "Stephen Curry".
+        return exact, [' '.join(tokens[start:]) for start in range(len(tokens))]
+
+    def add(self, player_id: int, name: str) -> None:
+        """Add a player while building a state nobody reads yet."""
+        key = normalize_name(name)
+        if not key:
+            return
+        self.names[player_id] = name
+        self.normalized[player_id] = key
+        exact, completions = self._keys(key)
+        for text in exact:
+            self.exact[text].add(player_id)
+        for text in completions:
+            node = self.trie
+            for char in text:
+                node = node.setdefault(char, {})
+            node.setdefault('$', set()).add(player_id)
+        grams = trigrams(key)
+        self.gram_counts[player_id] = len(grams)
+        for gram in grams:
+            self.grams[gram].add(player_id)
+
+    def insert(self, player_id: int, name: str) -> None:
+        """Add a player to a live state without disturbing concurrent readers.
+
+        Containers readers iterate are replaced rather than mutated, and the
+        per-player fields are set before anything points readers at the player.
+        """
+        key = normalize_name(name)
+        if not key:
+            return
+        grams = trigrams(key)
+        self.names[player_id] = name
+        self.normalized[player_id] = key
+        self.gram_counts[player_id] = len(grams)
+        exact, completions = self._keys(key)
+        for text in exact:
+            self.exact[text] = self.exact.get(text, set()) | {player_id}
+        for gram in grams:
+            self.grams[gram] = self.grams.get(gram, set()) | {player_id}
+        trie = self.trie
+        for text in completions:
+            trie = self._copy_path(trie, text, player_id)
+        self.trie = trie
+
+    @staticmethod
+    def _copy_path(root: Dict[str, Any], text: str, player_id: int) -> Dict[str, Any]:
+        """A trie sharing every node with `root` except the copied path to `text`."""
+        new_root = node = dict(root)
+        for char in text:
+            child = dict(node.get(char, {}))
+            node[char] = child
+            node = child
+        node['$'] = node.get('$', set()) | {player_id}
+        return new_root
+
+
+class PlayerIndex:
+    """In-memory name index over every player in the league.
+
+    Supports exact lookup on normalized names, nicknames and initials, prefix
+    autocomplete through a character trie and trigram fuzzy matching for typos.
+    """
+
+    def __init__(self):
+        self._state = _IndexState()
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._state.names)
+
+    def build(self, players: Iterable[Tuple[int, str]]) -> None:
+        """Rebuild the index from (player_id, name) pairs and swap it in atomically."""
+        state = _IndexState()
+        for player_id, name in players:
+            state.add(player_id, name)
+        with self._write_lock:
+            self._state = state
+
+    def add(self, player_id: int, name: str) -> None:
+        """Add a single player discovered outside of a full rebuild."""
+        with self._write_lock:
+            self._state.insert(player_id, name)
+
+    def name(self, player_id: int) -> Optional[str]:
+        return self._state.names.get(player_id)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Get the player ID for an exact name, nickname or initials, falling back to a confident fuzzy match."""
+        state = self._state
+        key = normalize_name(name)
+        key = NICKNAMES.get(key, key)
+        ids = state.exact.get(key)
+        if ids:
+            return min(ids)
+        matches = self._fuzzy(state, key, 1)
+        if matches and matches[0][1] >= MIN_RESOLVE_SCORE:
+            return matches[0][0]
+        return None
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get ranked candidates for a partial or misspelled name: exact, then prefix, then fuzzy."""
+        state = self._state
+        key = normalize_name(query)
+        key = NICKNAMES.get(key, key)
+        if not key:
+            return []
+
+        results: List[Dict[str, Any]] = []
+        seen: Set[int] = set()
+
+        def add(player_id: int, score: float, match: str) -> None:
+            if player_id not in seen and len(results) < limit:
+                seen.add(player_id)
+                results.append({
+                    'player_id': player_id,
+                    'name': state.names[player_id],
+                    'score': round(score, 3),
+                    'match': match,
+                })
+
+        for player_id in sorted(state.exact.get(key, ())):
+            add(player_id, 1.0, 'exact')
+        for player_id in sorted(self._prefix(state, key), key=lambda pid: state.normalized[pid]):
+            add(player_id, len(key) / max(len(state.normalized[player_id]), 1), 'prefix')
+        if len(results) < limit:
+            for player_id, score in self._fuzzy(state, key, limit):
+                add(player_id, score, 'fuzzy')
+        return results
+
+    @staticmethod
+    def _prefix(state: _IndexState, key: str) -> Set[int]:
+        node = state.trie
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                return set()
+        found: Set[int] = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char == '$':
+                    found.update(child)
+                else:
+                    stack.append(child)
+        return found
+
+    @staticmethod
+    def _fuzzy(state: _IndexState, key: str, limit: int) -> List[Tuple[int, float]]:
+        grams = trigrams(key)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for player_id in state.grams.get(gram, ()):
+                shared[player_id] += 1
+        # Dice coefficient over trigram sets.
+        scored = [
+            (player_id, 2 * count / (len(grams) + state.gram_counts[player_id]))
+            for player_id, count in shared.items()
+        ]
+        scored = [item for item in scored if item[1] >= MIN_FUZZY_SCORE]
+        scored.sort(key=lambda item: (-item[1], state.normalized[item[0]]))
+        return scored[:limit]
@@ -1,4 +1,5 @@
 from typing import Dict, Any, List, Optional
+import numpy as np
 
 def calculate_player_stats(player_data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate detailed player statistics."""
@@ -210,3 +211,101 @@ def get_matchup_analysis(player_stats: Dict[str, Any], opponent_team: Dict[str,
             analysis['matchup_rating'] = 'unfavorable'
     
     return analysis
+
+def get_game_points(player: Dict[str, Any], last: Optional[int] = None) -> List[float]:
+    """Get a player's per-game fantasy points (optionally only the `last` N), oldest first.
+
+    Reads `stats['gameStats']` like get_player_trends, falling back to the
+    per-scoring-period entries ESPN returns (keys like '42' with 'applied_total').
+    """
+    raw_stats = player.get('stats') or {}
+    if 'gameStats' in raw_stats:
+        games = raw_stats['gameStats']
+        if last is not None:
+            games = games[-last:] if last else []
+        return [g.get('points', 0) for g in games]
+    periods = sorted((int(key), value) for key, value in raw_stats.items() if str(key).isdigit())
+    points = [value.get('applied_total', 0) for _, value in periods if isinstance(value, dict)]
+    if last is not None:
+        points = points[-last:] if last else []
+    return points
+
+def build_game_matrix(players: List[Dict[str, Any]], columns: Optional[int] = None) -> np.ndarray:
+    """Right-aligned, NaN-padded matrix of game points: one row per player, latest game last."""
+    games = [get_game_points(p, last=columns) for p in players]
+    width = columns if columns is not None else max((len(g) for g in games), default=0)
+    matrix = np.full((len(players), width), np.nan)
+    for row, points in enumerate(games):
+        if points:
+            matrix[row, width - len(points):] = points
+    return matrix
+
+def _trend_arrays(matrix: np.ndarray, weeks: int) -> Dict[str, np.ndarray]:
+    """Recent/previous averages, trend masks and change percentages for a right-aligned game matrix."""
+    window = matrix[:, -weeks * 2:] if matrix.shape[1] >= weeks * 2 else np.full((matrix.shape[0], weeks * 2), np.nan)
+    eligible = ~np.isnan(window).any(axis=1)
+    filled = np.nan_to_num(window)
+    recent = filled[:, weeks:].sum(axis=1) / weeks
+    previous = filled[:, :weeks].sum(axis=1) / weeks
+    has_change = eligible & (previous > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = np.where(has_change, (recent - previous) / previous * 100, 0.0)
+    return {
+        'eligible': eligible,
+        'recent': recent,
+        'previous': previous,
+        'has_change': has_change,
+        'change': change,
+        'up': eligible & (recent > previous * 1.1),
+        'down': eligible & (recent < previous * 0.9),
+    }
+
+def _trend_row(player: Dict[str, Any], arrays: Dict[str, np.ndarray], idx: int) -> Dict[str, Any]:
+    eligible = bool(arrays['eligible'][idx])
+    return {
+        'playerId': player.get('playerId'),
+        'name': player.get('name'),
+        'position': player.get('position'),
+        'proTeam': player.get('proTeam'),
+        'scoring': {
+            'trend': 'up' if arrays['up'][idx] else 'down' if arrays['down'][idx] else 'stable',
+            'avg_last_n_weeks': round(float(arrays['recent'][idx]), 2) if eligible else 0,
+            'avg_previous_n_weeks': round(float(arrays['previous'][idx]), 2) if eligible else 0,
+            'change_percentage': round(float(arrays['change'][idx]), 1) if arrays['has_change'][idx] else 0
+        }
+    }
+
+def get_league_trends(players: List[Dict[str, Any]],
+                      weeks: int = 4,
+                      matrix: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+    """Analyze recent vs previous scoring for many players in one vectorized pass.
+
+    Produces the same 'scoring' section as get_player_trends for every player,
+    comparing the last `weeks` games against the `weeks` before them. Pass a
+    prebuilt `matrix` from build_game_matrix to reuse it across window sizes.
+    """
+    if matrix is None:
+        # Only the last 2 * weeks games matter, so the matrix is built that wide.
+        matrix = build_game_matrix(players, columns=weeks * 2)
+    arrays = _trend_arrays(matrix, weeks)
+    return [_trend_row(player, arrays, idx) for idx, player in enumerate(players)]
+
+def get_trending_board(players: List[Dict[str, Any]],
+                       weeks: int = 4,
+                       limit: int = 10,
+                       matrix: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """Get the biggest risers and fallers, only building rows for the players returned."""
+    if matrix is None:
+        matrix = build_game_matrix(players, columns=weeks * 2)
+    arrays = _trend_arrays(matrix, weeks)
+    change = arrays['change']
+    risers = np.flatnonzero(arrays['up'])
+    risers = risers[np.argsort(-change[risers], kind='stable')][:limit]
+    fallers = np.flatnonzero(arrays['down'])
+    fallers = fallers[np.argsort(change[fallers], kind='stable')][:limit]
+    return {
+        'weeks': weeks,
+        'players_analyzed': len(players),
+        'trending_up': [_trend_row(players[idx], arrays, idx) for idx in risers.tolist()],
+        'trending_down': [_trend_row(players[idx], arrays, idx) for idx in fallers.tolist()]
+    }
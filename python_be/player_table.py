@@ -0,0 +1,87 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Row fields with a precomputed sort order, overall and per position.
+SORT_KEYS = ('total_points', 'avg_points')
+
+# Fields refreshed in place from the league snapshot for players already in the table.
+SNAPSHOT_FIELDS = ('total_points', 'avg_points', 'injuryStatus', 'position', 'proTeam')
+
+
+class _TableState:
+    """Rows plus every presorted order derived from them; rebuilt as a unit and swapped atomically."""
+
+    def __init__(self, rows: Dict[int, Dict[str, Any]]):
+        self.rows = rows
+        self.orders: Dict[Tuple[str, Optional[str], bool], List[Dict[str, Any]]] = {}
+        by_position: Dict[Optional[str], List[Dict[str, Any]]] = {None: list(rows.values())}
+        for row in rows.values():
+            by_position.setdefault(row.get('position'), []).append(row)
+        for key in SORT_KEYS:
+            for position, players in by_position.items():
+                self.orders[(key, position, True)] = sorted(players, key=lambda p: p.get(key, 0), reverse=True)
+                self.orders[(key, position, False)] = sorted(players, key=lambda p: p.get(key, 0))
+
+
+class PlayerTable:
+    """Materialized table of every rostered player in the league.
+
+    Rows have the same shape as `ESPNClient.get_player_info`. Sort orders by
+    total and average points, overall and per position, are computed once per
+    rebuild so ranking reads are a slice instead of a fetch plus a sort.
+    """
+
+    def __init__(self):
+        self._state: Optional[_TableState] = None
+        self.version = 0
+
+    @property
+    def built(self) -> bool:
+        return bool(self._state and self._state.rows)
+
+    def __len__(self) -> int:
+        return len(self._state.rows) if self._state else 0
+
+    def rebuild(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Replace every row, keyed by playerId."""
+        self._swap({row['playerId']: row for row in rows if row.get('playerId') is not None})
+
+    def sync(self,
+             rostered: Dict[int, Any],
+             fetch: Callable[[List[int]], Optional[List[Dict[str, Any]]]]) -> Dict[str, int]:
+        """Bring the table in line with the current rosters.
+
+        `rostered` maps playerId to the roster Player from the latest league
+        snapshot. Only newly rostered players are fetched; dropped players are
+        removed and everyone else has their snapshot fields updated in place.
+        """
+        current = self._state.rows if self._state else {}
+        added = [pid for pid in rostered if pid not in current]
+        removed = sum(1 for pid in current if pid not in rostered)
+        rows = {}
+        for pid, row in current.items():
+            if pid not in rostered:
+                continue
+            updates = {field: getattr(rostered[pid], field)
+                       for field in SNAPSHOT_FIELDS if hasattr(rostered[pid], field)}
+            rows[pid] = row.replace(**updates) if hasattr(row, 'replace') else {**row, **updates}
+        if added:
+            for row in fetch(added) or []:
+                if row.get('playerId') is not None:
+                    rows[row['playerId']] = row
+        self._swap(rows)
+        return {'added': len(added), 'removed': removed, 'total': len(rows)}
+
+    def ranked(self,
+               key: str = 'total_points',
+               position: Optional[str] = None,
+               limit: Optional[int] = None,
+               descending: bool = True) -> List[Dict[str, Any]]:
+        """Get players in a presorted order, optionally for one position and capped at `limit`."""
+        if self._state is None:
+            return []
+        order = self._state.orders.get((key, position, descending), [])
+        return order[:limit] if limit is not None else list(order)
+
+    def _swap(self, rows: Dict[int, Dict[str, Any]]) -> None:
+        self._state = _TableState(rows)
+        self.version += 1
@@ -0,0 +1,301 @@
+import hmac
+import itertools
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('profiling')
+
+# Profiling is off unless an admin token is set. Requests opt in with the token in the
+# X-Profile-Token header or the `profile` query param; PROFILE_SAMPLE_RATE=N also
+# profiles every Nth request.
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = int(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", 1)) / 1000
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 50))
+MAX_DEPTH = 64
+
+# Leaf frames of pool threads waiting for work; their samples are dropped.
+IDLE_FRAMES = {('threading.py', 'wait'), ('queue.py', 'get')}
+
+_current: ContextVar[Optional['Profile']] = ContextVar('profile', default=None)
+
+
+def enabled() -> bool:
+    return bool(PROFILE_TOKEN)
+
+
+def is_admin(token: Optional[str]) -> bool:
+    return bool(PROFILE_TOKEN) and token is not None and hmac.compare_digest(token, PROFILE_TOKEN)
+
+
+def active() -> Optional['Profile']:
+    """The profile of the request being served, if it is being profiled."""
+    return _current.get()
+
+
+def timed(phase: str, fn: Callable, *args) -> Any:
+    """Call `fn(*args)`, charging its time to `phase` when the current request is profiled."""
+    profile = _current.get()
+    if profile is None:
+        return fn(*args)
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        profile.add(phase, time.perf_counter() - started)
+
+
+@contextmanager
+def phase(name: str):
+    """Charge the block's time to phase `name` when the current request is profiled."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    profile.threads.add(threading.get_ident())
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, time.perf_counter() - started)
+
+
+def instrument_upstream(espn_request: Any) -> None:
+    """Charge an espn_api request object's HTTP calls to the upstream phase."""
+    for name in ('get', 'league_get', 'news_get'):
+        method = getattr(espn_request, name, None)
+        if method is not None:
+            setattr(espn_request, name, _upstream(method))
+
+
+def _upstream(method: Callable) -> Callable:
+    def wrapper(*args, **kwargs):
+        with phase('upstream'):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+class Profile:
+    """Phase timings and wall-clock stack samples for one request.
+
+    Upstream and serialize are measured where they happen; compute is the rest
+    of the request's wall time. Stacks are sampled from the event loop thread,
+    the threadpool and any thread a phase ran on, so under concurrent traffic
+    they include other requests' work too.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.created_at = time.time()
+        self.started = time.perf_counter()
+        self.wall = None
+        self.status = None
+        self.phases: Dict[str, float] = defaultdict(float)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.threads = {threading.get_ident()}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] += seconds
+
+    def finish(self, status: int) -> None:
+        self.wall = time.perf_counter() - self.started
+        self.status = status
+
+    def phase_ms(self) -> Dict[str, float]:
+        measured = {name: seconds * 1000 for name, seconds in self.phases.items()}
+        # Concurrent upstream calls overlap, so their sum can exceed the wall time.
+        compute = max(self.wall * 1000 - sum(measured.values()), 0.0)
+        return {name: round(ms, 3) for name, ms in {**measured, 'compute': compute}.items()}
+
+    def top_functions(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """Hottest functions by samples at the top of the stack (self), with samples anywhere in it (total)."""
+        own, total = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return [{'function': frame, 'self': count, 'total': total[frame]}
+                for frame, count in own.most_common(limit)]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'trigger': self.trigger,
+            'created_at': self.created_at,
+            'status': self.status,
+            'wall_ms': round(self.wall * 1000, 3) if self.wall is not None else None,
+            'phases_ms': self.phase_ms() if self.wall is not None else None,
+            'samples': self.samples,
+            'interval_ms': PROFILE_INTERVAL * 1000,
+        }
+
+    def report(self) -> Dict[str, Any]:
+        return {**self.summary(), 'top_functions': self.top_functions()}
+
+    def folded(self) -> str:
+        """Samples in collapsed-stack format, for flamegraph.pl or speedscope."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def server_timing(self) -> str:
+        timings = {**self.phase_ms(), 'total': round(self.wall * 1000, 3)}
+        return ', '.join(f"{name};dur={ms}" for name, ms in timings.items())
+
+
+def _stack(frame) -> Optional[str]:
+    frames = []
+    while frame is not None and len(frames) < MAX_DEPTH:
+        code = frame.f_code
+        frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    if not frames:
+        return None
+    if tuple(frames[0].split(':', 1)) in IDLE_FRAMES:
+        return None
+    return ';'.join(reversed(frames))
+
+
+class Sampler:
+    """One background thread sampling thread stacks for every profile in progress."""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self._active: set = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: Profile) -> None:
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while True:
+            pool = {thread.ident for thread in threading.enumerate() if thread.name.startswith('AnyIO worker thread')}
+            stacks = {ident: _stack(frame) for ident, frame in sys._current_frames().items() if ident != me}
+            # Under the lock, so a profile gets no samples once remove() has returned.
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                for profile in self._active:
+                    for ident in profile.threads | pool:
+                        stack = stacks.get(ident)
+                        if stack:
+                            profile.stacks[stack] += 1
+                    profile.samples += 1
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """The most recent finished profiles, for download."""
+
+    def __init__(self, keep: int = PROFILE_KEEP):
+        self.keep = keep
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.keep:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles.values())]
+
+
+sampler = Sampler()
+store = ProfileStore()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that carry the admin token, plus every Nth request.
+
+    Only installed when PROFILE_TOKEN is set. Requested profiles answer with
+    Server-Timing phase timings and an X-Profile-Id for downloading the full
+    profile from /debug/profiles/{id}; sampled ones are only stored.
+    """
+
+    def __init__(self, app, sample_rate: int = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+        self._counter = itertools.count(1)
+
+    def _trigger(self, scope: Dict[str, Any]) -> Optional[str]:
+        for name, value in scope['headers']:
+            if name == b'x-profile-token':
+                return 'header' if is_admin(value.decode('latin-1')) else None
+        query = scope.get('query_string', b'')
+        if b'profile=' in query:
+            token = parse_qs(query.decode('latin-1')).get('profile', [None])[0]
+            if is_admin(token):
+                return 'query'
+        if self.sample_rate and next(self._counter) % self.sample_rate == 0:
+            return 'sampled'
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'].startswith('/debug/profiles'):
+            await self.app(scope, receive, send)
+            return
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(scope['method'], scope['path'], trigger)
+        token = _current.set(profile)
+        sampler.add(profile)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if trigger != 'sampled':
+                    # Timings up to the response head; the stored profile covers the whole body.
+                    profile.finish(status)
+                    message = {**message, 'headers': list(message.get('headers', [])) + [
+                        (b'server-timing', profile.server_timing().encode('latin-1')),
+                        (b'x-profile-id', profile.id.encode('latin-1')),
+                    ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            sampler.remove(profile)
+            _current.reset(token)
+            profile.finish(status)
+            store.add(profile)
+            logger.info(f"Profiled {profile.method} {profile.path} ({trigger}): {profile.wall * 1000:.1f} ms, "
+                        f"phases {profile.phase_ms()}, id {profile.id}")
@@ -0,0 +1,95 @@
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+
+def intern(value: Optional[str]) -> Optional[str]:
+    """Intern short repeated strings (positions, pro teams, injury statuses, names)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record(Mapping):
+    """Compact read-only record with `__slots__` storage.
+
+    Records behave like the dicts they replace (`row['name']`, `row.get(...)`,
+    `dict(row)`), so callers and FastAPI's encoder need no changes; `to_dict()`
+    converts them to plain JSON-ready dicts at the edge.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values: Any, **fields: Any):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+        for name in self.__slots__[len(values):]:
+            object.__setattr__(self, name, fields.get(name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={getattr(self, k)!r}' for k in self.__slots__)})"
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, name) for name in self.__slots__))
+
+    def replace(self, **changes: Any) -> 'Record':
+        """Copy with some fields changed."""
+        return type(self)(*(changes.get(name, getattr(self, name)) for name in self.__slots__))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+class LineupPlayer(Record):
+    """One player in a box score lineup."""
+    __slots__ = ('name', 'position', 'points', 'projected', 'stats', 'injuryStatus', 'starting', 'proTeam',
+                 'playerId')
+
+
+class BoxScoreTeam(Record):
+    """One side of a box score; `lineup` is a tuple of LineupPlayer."""
+    __slots__ = ('team_id', 'team_name', 'score', 'projected', 'lineup')
+
+
+class BoxScore(Record):
+    __slots__ = ('home_team', 'away_team')
+
+
+class ScoreboardTeam(Record):
+    __slots__ = ('team_id', 'team_name', 'score', 'projected')
+
+
+class Matchup(Record):
+    __slots__ = ('matchup_id', 'home_team', 'away_team')
+
+
+class PlayerInfo(Record):
+    """A player as returned by get_player_info."""
+    __slots__ = ('playerId', 'name', 'position', 'proTeam', 'injuryStatus', 'stats', 'total_points',
+                 'avg_points', 'percent_owned', 'percent_started', 'projected_points')
+
+
+class FreeAgent(Record):
+    """A player as returned by get_free_agents."""
+    __slots__ = ('name', 'position', 'proTeam', 'injuryStatus', 'stats', 'total_points', 'avg_points',
+                 'percent_owned', 'percent_started', 'projected_points')
+
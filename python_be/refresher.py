@@ -0,0 +1,44 @@
+import threading
+from typing import Optional
+from logger_config import setup_logger
+
+# Set up logger
+logger = setup_logger('refresher')
+
+
+class LeagueRefresher:
+    """Daemon thread that periodically rebuilds the ESPNClient league snapshot.
+
+    Requests keep reading the previous snapshot while a refresh is in flight;
+    the client only swaps in the new League once it has been fully fetched.
+    """
+
+    def __init__(self, client, interval: float):
+        self.client = client
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        logger.info(f"Starting league refresher with a {self.interval}s interval")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='league-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if not self.running:
+            return
+        logger.info("Stopping league refresher")
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.client.refresh_league()
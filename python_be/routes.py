@@ -1,6 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query
+import math
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from espn_api.requests.espn_requests import ESPNAccessDenied, ESPNInvalidLeague
 from espn_client import ESPNClient
-from typing import Any, Optional, List, Dict
+from client_pool import LoadThrottled, PooledLeague, pool
+from player_stats import get_trending_board
+from pagination import decode_cursor
+from http_cache import encode_json, encoded_cache, respond
+import metrics
+from fieldsets import (LINEUP_FIELDS, PLAYER_FIELDS, TEAM_FIELDS, parse_fields, project, project_box_score,
+                       project_rows, wants_stats)
+from typing import Any, Optional, List, Dict, FrozenSet, Iterator
 # from player_stats import (
 #     # calculate_player_stats,
 #     # get_player_comparison,
@@ -9,11 +19,57 @@ from typing import Any, Optional, List, Dict
 #     # get_matchup_analysis
 # )
 
-# Initialize the router
+# Initialize the router. League routes are served for the configured league at
+# /api/v1/... and for any other league at /api/v1/leagues/{league_id}/...
 router = APIRouter(prefix="/api/v1")
+league_router = APIRouter()
 
-# Initialize the ESPNClient (singleton pattern ensures only one instance)
-client = ESPNClient()
+# Cache hit ratios on /metrics, read at scrape time
+metrics.caches.watch('espn_response', pool.cache_stats)
+metrics.caches.watch('encoded_body', lambda: {'all': encoded_cache.stats()})
+metrics.caches.watch('league_pool', lambda: {'leagues': pool.stats()})
+
+STANDINGS_SORTS = {
+    'record': (lambda team: (team.get('wins', 0), team.get('points_for', 0)), True),
+    'points_for': (lambda team: team.get('points_for', 0), True),
+    'standing': (lambda team: team.get('standing', 0), False),
+}
+TEAM_SORTS = {
+    'standing': (lambda team: team['standing'], False),
+    'wins': (lambda team: (team['wins'], team['points_for']), True),
+    'points_for': (lambda team: team['points_for'], True),
+}
+FANTASYCAST_SORTS = {
+    'schedule': (None, False),
+    'total_score': (lambda box: box['home_team']['score'] + box['away_team']['score'], True),
+}
+
+async def league_scope(request: Request,
+                       season: Optional[int] = Query(None, gt=0, description="Season, if not the configured one")
+                       ) -> PooledLeague:
+    """The league a request is for: the {league_id} path parameter, or the configured league.
+
+    Private leagues take ESPN cookies in the X-ESPN-S2 and X-ESPN-SWID headers.
+    Without them the configured credentials are used for the configured league
+    only; any other league must be public.
+    """
+    league_id = request.path_params.get('league_id')
+    if league_id is not None and not league_id.isdigit():
+        raise HTTPException(status_code=404, detail="League not found")
+    espn_s2, swid = request.headers.get('x-espn-s2'), request.headers.get('x-espn-swid')
+    try:
+        league = await pool.aget(int(league_id) if league_id else None, season, espn_s2, swid)
+    except ESPNInvalidLeague:
+        raise HTTPException(status_code=404, detail="League not found")
+    except ESPNAccessDenied:
+        raise HTTPException(status_code=403, detail="League is private; send X-ESPN-S2 and X-ESPN-SWID")
+    except LoadThrottled as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={'Retry-After': str(math.ceil(e.retry_after))})
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Could not load league: {str(e)}")
+    request.state.cache_scope = league.cache_scope
+    request.state.credentialed = espn_s2 is not None or swid is not None
+    return league
 
 # Helper function to safely get attributes
 def safe_getattr(obj, attr: str, default: Any = None) -> Any:
@@ -42,6 +98,41 @@ def paginate_results(items: List[Any], page: int = 1, page_size: int = 10) -> Di
         }
     }
 
+def parse_cursor(cursor: Optional[str]) -> Optional[Dict[str, Any]]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def parse_fields_param(fields: Optional[str], allowed: FrozenSet[str]) -> Optional[FrozenSet[str]]:
+    try:
+        return parse_fields(fields, allowed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def project_page(result: Dict[str, Any], project_item, fields) -> Dict[str, Any]:
+    if fields is not None:
+        result['items'] = [project_item(item, fields) for item in result['items']]
+    return result
+
+def team_row(team) -> Dict[str, Any]:
+    return {
+        'team_id': team.team_id,
+        'team_name': team.team_name,
+        'division_id': team.division_id,
+        'division_name': team.division_name,
+        'wins': team.wins,
+        'losses': team.losses,
+        'ties': team.ties,
+        'points_for': float(team.points_for) if team.points_for else 0,
+        'points_against': float(team.points_against) if team.points_against else 0,
+        'standing': team.standing,
+        'roster_size': len(team.roster) if team.roster else 0,
+        'logo_url': team.logo_url if hasattr(team, 'logo_url') else None
+    }
+
 # League Information Endpoints
 # @router.get("/league/info")
 # def get_league_info():
@@ -54,207 +145,292 @@ def paginate_results(items: List[Any], page: int = 1, page_size: int = 10) -> Di
 #     except Exception as e:
 #         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/league/standings")
-def get_standings(
+@league_router.get("/league/standings")
+async def get_standings(
+    request: Request,
     division_id: Optional[int] = None,
+    sort_by: str = Query('record', pattern='^(record|points_for|standing)$'),
     page: int = Query(1, gt=0),
-    page_size: int = Query(10, gt=0, le=50)
+    page_size: int = Query(10, gt=0, le=50),
+    cursor: Optional[str] = None,
+    league: PooledLeague = Depends(league_scope)
 ):
-    """Get league standings, optionally filtered by division."""
+    """Get league standings, optionally filtered by division. Pass `next_cursor` back as `cursor` to page."""
+    position = parse_cursor(cursor)
     try:
-        standings = client.get_standings()
-        if standings is None:
+        version = league.client.snapshot_version
+        index = league.page_indexes.get('standings', version, league.client.get_standings,
+                                 STANDINGS_SORTS, filters=('division_id',))
+        if index is None:
             raise HTTPException(status_code=404, detail="Standings not found")
-        
-        # Filter by division if specified
-        if division_id is not None:
-            standings = [team for team in standings if team.get('division_id') == division_id]
-        
-        # Sort standings by wins and then points_for
-        standings.sort(
-            key=lambda team: (team.get('wins', 0), team.get('points_for', 0)),
-            reverse=True
-        )
-        
-        return paginate_results(standings, page, page_size)
+        return respond(request, 'standings', version, lambda: index.page(
+            sort_by, 'division_id', division_id, cursor=position, page=page, page_size=page_size))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/league/scoreboard")
-def get_scoreboard(week: Optional[int] = None):
+@league_router.get("/league/scoreboard")
+async def get_scoreboard(request: Request, week: Optional[int] = None,
+                         league: PooledLeague = Depends(league_scope)):
     """Get scoreboard for specific week or current week."""
     try:
-        scoreboard = client.get_scoreboard(matchup_period=week)
+        scoreboard = await league.async_client.get_scoreboard(matchup_period=week)
         if scoreboard is None:
             raise HTTPException(status_code=404, detail="Scoreboard not found")
-        return scoreboard
+        return respond(request, 'scoreboard', league.row_versions.version(('scoreboard', week), scoreboard),
+                       lambda: scoreboard)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/league/fantasycast")
-def get_fantasycast(
+@league_router.get("/league/fantasycast")
+async def get_fantasycast(
+    request: Request,
+    sort_by: str = Query('schedule', pattern='^(schedule|total_score)$'),
     page: int = Query(1, gt=0),
-    page_size: int = Query(10, gt=0, le=50)
+    page_size: int = Query(10, gt=0, le=50),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated lineup player fields, e.g. name,position,points"),
+    league: PooledLeague = Depends(league_scope)
 ):
     """Get live scoring and detailed game information."""
+    position = parse_cursor(cursor)
+    fields = parse_fields_param(fields, LINEUP_FIELDS)
     try:
-        box_scores = client.get_box_scores()  # Using box_scores instead of fantasycast
+        box_scores = await league.async_client.get_box_scores()  # Using box_scores instead of fantasycast
         if box_scores is None:
             raise HTTPException(status_code=404, detail="Fantasycast data not found")
-        return paginate_results(box_scores, page, page_size)
+        version = league.row_versions.version('fantasycast', box_scores)
+        index = league.page_indexes.get('fantasycast', version, lambda: box_scores, FANTASYCAST_SORTS)
+        return respond(request, 'fantasycast', version, lambda: project_page(index.page(
+            sort_by, cursor=position, page=page, page_size=page_size), project_box_score, fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def ndjson_lines(rows: Iterator[Dict[str, Any]], fields=None) -> Iterator[bytes]:
+    for row in rows:
+        if 'error' in row:
+            yield encode_json(row) + b'\n'
+            continue
+        yield encode_json(project_box_score(row, fields)) + b'\n'
+
+@league_router.get("/league/export/box-scores")
+def export_box_scores(
+    start: int = Query(1, gt=0),
+    end: Optional[int] = Query(None, gt=0),
+    matchup_total: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated lineup player fields"),
+    league: PooledLeague = Depends(league_scope)
+):
+    """Stream box scores as NDJSON, one matchup per line, period by period.
+
+    The range is in scoring periods, or matchup periods with `matchup_total=true`;
+    `end` defaults to the current one. Finished periods come from the season store.
+    """
+    if end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    snapshot = league.client.league
+    current = snapshot.currentMatchupPeriod if matchup_total else snapshot.current_week
+    if (end or start) > current:
+        raise HTTPException(status_code=400, detail=f"Periods after the current one ({current}) have no box scores yet")
+    fields = parse_fields_param(fields, LINEUP_FIELDS)
+    rows = league.client.iter_box_scores(start=start, end=end, matchup_total=matchup_total)
+    return StreamingResponse(ndjson_lines(rows, fields), media_type='application/x-ndjson')
+
 # Team Endpoints
-@router.get("/teams")
-def get_all_teams(
+@league_router.get("/teams")
+async def get_all_teams(
+    request: Request,
     page: int = Query(1, gt=0),
     page_size: int = Query(10, gt=0, le=50),
-    division_id: Optional[int] = None
+    division_id: Optional[int] = None,
+    sort_by: str = Query('standing', pattern='^(standing|wins|points_for)$'),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated team fields"),
+    league: PooledLeague = Depends(league_scope)
 ):
     """Get all teams in the league with pagination."""
+    position = parse_cursor(cursor)
+    fields = parse_fields_param(fields, TEAM_FIELDS)
     try:
-        teams = client.league.teams
-        if not teams:
+        version = league.client.snapshot_version
+        snapshot = league.client.league
+        index = league.page_indexes.get('teams', version,
+                                        lambda: [team_row(team) for team in snapshot.teams] or None,
+                                 TEAM_SORTS, filters=('division_id',))
+        if index is None:
             raise HTTPException(status_code=404, detail="No teams found")
-        
-        # Convert teams to serializable format
-        teams_data = []
-        for team in teams:
-            if division_id is not None and team.division_id != division_id:
-                continue
-                
-            team_data = {
-                'team_id': team.team_id,
-                'team_name': team.team_name,
-                'division_id': team.division_id,
-                'division_name': team.division_name,
-                'wins': team.wins,
-                'losses': team.losses,
-                'ties': team.ties,
-                'points_for': float(team.points_for) if team.points_for else 0,
-                'points_against': float(team.points_against) if team.points_against else 0,
-                'standing': team.standing,
-                'roster_size': len(team.roster) if team.roster else 0,
-                'logo_url': team.logo_url if hasattr(team, 'logo_url') else None
-            }
-            teams_data.append(team_data)
-        
-        # Sort teams by standing
-        teams_data.sort(key=lambda x: x['standing'])
-        
-        return paginate_results(teams_data, page, page_size)
+        return respond(request, 'teams', version, lambda: project_page(index.page(
+            sort_by, 'division_id', division_id, cursor=position, page=page, page_size=page_size), project, fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/team/{team_id}")
-def get_team(team_id: int, include_schedule: bool = False, include_roster: bool = True):
+def team_detail(client: ESPNClient, team_id: int, include_schedule: bool, include_roster: bool) -> Dict[str, Any]:
+    team = client.get_team(team_id)
+    if team is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    team_data = {
+        'team_id': team['team_id'],
+        'team_name': team['team_name'],
+        'division_id': team['division_id'],
+        'division_name': team['division_name'],
+        'wins': team['wins'],
+        'losses': team['losses'],
+        'ties': team['ties'],
+        'points_for': team['points_for'],
+        'points_against': team['points_against'],
+        'standing': team['standing'],
+        'logo_url': team['logo_url']
+    }
+
+    if include_roster and 'roster' in team:
+        team_data['roster'] = [{
+            'name': player['name'],
+            'position': player['position'],
+            'proTeam': player['proTeam'],
+            'injuryStatus': player['injuryStatus'],
+            'total_points': player.get('total_points', 0),
+            'avg_points': player.get('avg_points', 0)
+        } for player in team['roster']]
+
+    if include_schedule and 'schedule' in team:
+        team_data['schedule'] = [{
+            'week': idx + 1,
+            'opponent': matchup['opponent'],
+            'is_home': matchup['is_home'],
+            'score': matchup['score'],
+            'opponent_score': matchup['opponent_score']
+        } for idx, matchup in enumerate(team['schedule'])]
+
+    return team_data
+
+@league_router.get("/team/{team_id}")
+async def get_team(request: Request, team_id: int, include_schedule: bool = False, include_roster: bool = True,
+                   fields: Optional[str] = Query(None, description="Comma-separated team fields"),
+                   league: PooledLeague = Depends(league_scope)):
     """Get detailed team information."""
+    fields = parse_fields_param(fields, TEAM_FIELDS)
+    if fields is not None:
+        # Don't build the roster or schedule unless they were asked for.
+        include_roster = include_roster and 'roster' in fields
+        include_schedule = include_schedule and 'schedule' in fields
     try:
-        team = client.get_team(team_id)
-        if team is None:
-            raise HTTPException(status_code=404, detail="Team not found")
-        
-        team_data = {
-            'team_id': team['team_id'],
-            'team_name': team['team_name'],
-            'division_id': team['division_id'],
-            'division_name': team['division_name'],
-            'wins': team['wins'],
-            'losses': team['losses'],
-            'ties': team['ties'],
-            'points_for': team['points_for'],
-            'points_against': team['points_against'],
-            'standing': team['standing'],
-            'logo_url': team['logo_url']
-        }
-        
-        if include_roster and 'roster' in team:
-            team_data['roster'] = [{
-                'name': player['name'],
-                'position': player['position'],
-                'proTeam': player['proTeam'],
-                'injuryStatus': player['injuryStatus'],
-                'total_points': player.get('total_points', 0),
-                'avg_points': player.get('avg_points', 0)
-            } for player in team['roster']]
-            
-        if include_schedule and 'schedule' in team:
-            team_data['schedule'] = [{
-                'week': idx + 1,
-                'opponent': matchup['opponent'],
-                'is_home': matchup['is_home'],
-                'score': matchup['score'],
-                'opponent_score': matchup['opponent_score']
-            } for idx, matchup in enumerate(team['schedule'])]
-            
-        return team_data
+        return respond(request, 'team', league.client.snapshot_version,
+                       lambda: project(team_detail(league.client, team_id, include_schedule, include_roster), fields))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/players/stats/{player_id}")
-def get_player_stats(player_id: int):
+@league_router.get("/players/stats/{player_id}")
+async def get_player_stats(request: Request, player_id: int,
+                           fields: Optional[str] = Query(None, description="Comma-separated player fields"),
+                           league: PooledLeague = Depends(league_scope)):
     """Get detailed player statistics."""
+    fields = parse_fields_param(fields, PLAYER_FIELDS)
     try:
-        player = client.get_player_info(player_ids=player_id)
+        include_stats = wants_stats(fields)
+        player = await league.async_client.get_player_info(player_ids=player_id, include_stats=include_stats)
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
-        return player[0]  # Assuming get_player_info returns a list
+        # get_player_info returns a list
+        version = league.row_versions.version(('player', player_id, include_stats), player)
+        return respond(request, 'player_stats', version, lambda: project(player[0], fields))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/players/compare")
-def compare_players(player1_id: int, player2_id: int):
+@league_router.get("/players/search")
+async def search_players(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, gt=0, le=50),
+    league: PooledLeague = Depends(league_scope)
+):
+    """Autocomplete player names, tolerating partial names, nicknames and typos."""
+    try:
+        return league.client.search_players(q, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@league_router.get("/players/compare")
+async def compare_players(request: Request, player1_id: int, player2_id: int,
+                          fields: Optional[str] = Query(None, description="Comma-separated player fields"),
+                          league: PooledLeague = Depends(league_scope)):
     """Compare two players' statistics."""
+    fields = parse_fields_param(fields, PLAYER_FIELDS)
     try:
-        players = client.get_player_info(player_ids=[player1_id, player2_id])
+        include_stats = wants_stats(fields)
+        players = await league.async_client.get_player_info(player_ids=[player1_id, player2_id],
+                                                             include_stats=include_stats)
         if not players or len(players) < 2:
             raise HTTPException(status_code=404, detail="One or both players not found")
-        return {
-            'player1': players[0],
-            'player2': players[1]
-        }
+        version = league.row_versions.version(('compare', player1_id, player2_id, include_stats), players)
+        return respond(request, 'player_stats', version, lambda: {
+            'player1': project(players[0], fields),
+            'player2': project(players[1], fields)
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/players/rankings")
-def get_player_rankings(position: Optional[str] = None):
+@league_router.get("/players/rankings")
+def get_player_rankings(
+    request: Request,
+    position: Optional[str] = None,
+    sort_by: str = Query('total_points', pattern='^(total_points|avg_points)$'),
+    limit: Optional[int] = Query(None, gt=0),
+    fields: Optional[str] = Query(None, description="Comma-separated player fields"),
+    league: PooledLeague = Depends(league_scope)
+):
     """Get player rankings, optionally filtered by position."""
+    fields = parse_fields_param(fields, PLAYER_FIELDS)
     try:
-        all_players = []
-        for team in client.league.teams:
-            all_players.extend(team.roster)
-        
-        players_data = client.get_player_info(player_ids=[p.playerId for p in all_players])
-        if not players_data:
+        table = league.client.get_player_table()
+        if not len(table):
             raise HTTPException(status_code=404, detail="No players found")
-        
-        if position:
-            players_data = [p for p in players_data if p['position'] == position]
-        
-        players_data.sort(key=lambda x: x['total_points'], reverse=True)
-        return players_data
+        return respond(request, 'rankings', table.version,
+                       lambda: project_rows(table.ranked(sort_by, position=position, limit=limit), fields))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/players/hot-cold")
-def get_hot_cold_players():
+@league_router.get("/players/trending")
+def get_trending_players(
+    weeks: int = Query(4, gt=0, le=20),
+    limit: int = Query(10, gt=0, le=50),
+    include_free_agents: bool = True,
+    free_agent_count: int = Query(100, gt=0, le=250),
+    league: PooledLeague = Depends(league_scope)
+):
+    """Get league-wide risers and fallers, comparing the last N games with the N before."""
+    try:
+        players = league.client.get_player_table().ranked()
+        if include_free_agents:
+            players += league.client.get_free_agents(size=free_agent_count) or []
+        if not players:
+            raise HTTPException(status_code=404, detail="No players found")
+        return get_trending_board(players, weeks=weeks, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@league_router.get("/players/hot-cold")
+def get_hot_cold_players(request: Request,
+                         fields: Optional[str] = Query(None, description="Comma-separated player fields"),
+                         league: PooledLeague = Depends(league_scope)):
     """Get lists of hot and cold players based on recent performance."""
+    fields = parse_fields_param(fields, PLAYER_FIELDS)
     try:
-        all_players = []
-        for team in client.league.teams:
-            all_players.extend(team.roster)
-        
-        players_data = client.get_player_info(player_ids=[p.playerId for p in all_players])
-        if not players_data:
+        table = league.client.get_player_table()
+        if not len(table):
             raise HTTPException(status_code=404, detail="No players found")
-        
-        hot_players = sorted(players_data, key=lambda x: x['total_points'], reverse=True)[:10]
-        cold_players = sorted(players_data, key=lambda x: x['total_points'])[:10]
-        
-        return {
-            'hot_players': hot_players,
-            'cold_players': cold_players
-        }
+
+        return respond(request, 'rankings', table.version, lambda: {
+            'hot_players': project_rows(table.ranked('total_points', limit=10), fields),
+            'cold_players': project_rows(table.ranked('total_points', limit=10, descending=False), fields)
+        })
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+router.include_router(league_router)
+router.include_router(league_router, prefix="/leagues/{league_id}")
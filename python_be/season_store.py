@@ -0,0 +1,375 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from logger_config import setup_logger
+from records import BoxScore, BoxScoreTeam, LineupPlayer, intern
+
+# Set up logger
+logger = setup_logger('season_store')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS periods (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    matchup_period INTEGER NOT NULL,
+    scoring_period INTEGER NOT NULL,
+    matchup_total INTEGER NOT NULL,
+    final INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (league_id, season, matchup_period, scoring_period, matchup_total)
+);
+CREATE TABLE IF NOT EXISTS team_games (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    matchup_period INTEGER NOT NULL,
+    scoring_period INTEGER NOT NULL,
+    matchup_total INTEGER NOT NULL,
+    game_idx INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    team_id INTEGER,
+    team_name TEXT,
+    score REAL,
+    projected REAL,
+    PRIMARY KEY (league_id, season, matchup_period, scoring_period, matchup_total, game_idx, side)
+);
+CREATE TABLE IF NOT EXISTS player_games (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    matchup_period INTEGER NOT NULL,
+    scoring_period INTEGER NOT NULL,
+    matchup_total INTEGER NOT NULL,
+    game_idx INTEGER NOT NULL,
+    side TEXT NOT NULL,
+    lineup_idx INTEGER NOT NULL,
+    team_id INTEGER,
+    player_id INTEGER,
+    player_name TEXT,
+    position TEXT,
+    pro_team TEXT,
+    injury_status TEXT,
+    starting INTEGER,
+    points REAL,
+    projected REAL,
+    stats TEXT,
+    PRIMARY KEY (league_id, season, matchup_period, scoring_period, matchup_total, game_idx, side, lineup_idx)
+);
+CREATE INDEX IF NOT EXISTS player_games_by_player
+    ON player_games (league_id, season, player_id, scoring_period);
+CREATE INDEX IF NOT EXISTS player_games_by_name
+    ON player_games (league_id, season, player_name, scoring_period);
+CREATE INDEX IF NOT EXISTS player_games_by_team
+    ON player_games (league_id, season, team_id, scoring_period);
+CREATE TABLE IF NOT EXISTS player_stat_values (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    scoring_period INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    player_name TEXT,
+    team_id INTEGER,
+    stat TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (league_id, season, scoring_period, player_id, stat)
+);
+CREATE INDEX IF NOT EXISTS player_stat_values_by_stat
+    ON player_stat_values (league_id, season, stat, value);
+CREATE TABLE IF NOT EXISTS transactions (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    scoring_period INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    type TEXT,
+    team TEXT,
+    player TEXT,
+    action TEXT,
+    bid_amount REAL,
+    status TEXT,
+    date INTEGER,
+    PRIMARY KEY (league_id, season, scoring_period, idx)
+);
+CREATE TABLE IF NOT EXISTS standings (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    team_id INTEGER NOT NULL,
+    standing INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (league_id, season, team_id)
+);
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    league_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    period INTEGER NOT NULL,
+    done_at REAL NOT NULL,
+    PRIMARY KEY (league_id, season, task, period)
+);
+"""
+
+# Bumped whenever SCHEMA changes incompatibly. Older stores are dropped and
+# rebuilt, since everything in them can be fetched from ESPN again.
+SCHEMA_VERSION = 3
+TABLES = ('periods', 'team_games', 'player_games', 'player_stat_values', 'transactions', 'standings',
+          'backfill_progress')
+
+# Columns of player_games that range queries may select or filter on.
+PLAYER_COLUMNS = (
+    'matchup_period', 'scoring_period', 'team_id', 'player_id', 'player_name', 'position', 'pro_team',
+    'injury_status', 'starting', 'points', 'projected',
+)
+
+
+def _json_default(value: Any) -> Any:
+    # Player stats carry game dates; store them the way FastAPI would render them.
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _period_stat_line(stats: Dict[str, Any], scoring_period: int) -> Dict[str, Any]:
+    """Per-game stat line (PTS, REB, ...) for one scoring period from an espn_api Player.stats dict."""
+    line = (stats or {}).get(str(scoring_period)) or {}
+    return line.get('total') or {}
+
+
+class SeasonStore:
+    """SQLite store of box scores: one row per player per scoring period.
+
+    Box scores are written as they are fetched. Periods that were already over
+    when fetched are marked final and served from here instead of ESPN.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                if version:
+                    logger.warning(f"Season store at {path} has schema v{version}, rebuilding as v{SCHEMA_VERSION}")
+                for table in TABLES:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One connection per thread; sqlite3 connections can't be shared across threads.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+        with conn:
+            yield conn
+
+    def has_final_period(self, league_id: int, season: int, matchup_period: int,
+                         scoring_period: int, matchup_total: bool) -> bool:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT final FROM periods WHERE league_id=? AND season=? AND matchup_period=? "
+                "AND scoring_period=? AND matchup_total=?",
+                (league_id, season, matchup_period, scoring_period, int(matchup_total)),
+            ).fetchone()
+        return bool(row and row['final'])
+
+    def save_box_scores(self, league_id: int, season: int, matchup_period: int, scoring_period: int,
+                        matchup_total: bool, box_scores: List[Dict[str, Any]], final: bool) -> None:
+        """Write a get_box_scores result, replacing any earlier copy of the same period."""
+        key = (league_id, season, matchup_period, scoring_period, int(matchup_total))
+        team_rows, player_rows, stat_rows = [], [], []
+        for game_idx, box_score in enumerate(box_scores):
+            for side in ('home_team', 'away_team'):
+                team = box_score.get(side) or {}
+                team_rows.append(key + (game_idx, side, team.get('team_id'), team.get('team_name'),
+                                        team.get('score'), team.get('projected')))
+                for lineup_idx, player in enumerate(team.get('lineup', [])):
+                    player_rows.append(key + (
+                        game_idx, side, lineup_idx, team.get('team_id'), player.get('playerId'), player.get('name'),
+                        player.get('position'), player.get('proTeam'), player.get('injuryStatus'),
+                        int(bool(player.get('starting'))), player.get('points'), player.get('projected'),
+                        json.dumps(player.get('stats', {}), default=_json_default),
+                    ))
+                    # Stat lines only make sense per scoring period, not for matchup totals.
+                    if not matchup_total and player.get('playerId') is not None:
+                        for stat, value in _period_stat_line(player.get('stats'), scoring_period).items():
+                            if isinstance(value, (int, float)):
+                                stat_rows.append((league_id, season, scoring_period, player.get('playerId'),
+                                                  player.get('name'), team.get('team_id'), stat, value))
+
+        where = "league_id=? AND season=? AND matchup_period=? AND scoring_period=? AND matchup_total=?"
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM team_games WHERE {where}", key)
+            conn.execute(f"DELETE FROM player_games WHERE {where}", key)
+            conn.executemany("INSERT INTO team_games VALUES (?,?,?,?,?,?,?,?,?,?,?)", team_rows)
+            conn.executemany("INSERT INTO player_games VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", player_rows)
+            if not matchup_total:
+                conn.execute("DELETE FROM player_stat_values WHERE league_id=? AND season=? AND scoring_period=?",
+                             (league_id, season, scoring_period))
+                conn.executemany("INSERT INTO player_stat_values VALUES (?,?,?,?,?,?,?,?)", stat_rows)
+            conn.execute("INSERT OR REPLACE INTO periods VALUES (?,?,?,?,?,?,?)", key + (int(final), time.time()))
+        logger.info(f"Stored {len(player_rows)} player rows for season {season} "
+                    f"matchup {matchup_period} scoring period {scoring_period}")
+
+    def load_box_scores(self, league_id: int, season: int, matchup_period: int,
+                        scoring_period: int, matchup_total: bool) -> Optional[List[Dict[str, Any]]]:
+        """Rebuild a get_box_scores result from stored rows."""
+        key = (league_id, season, matchup_period, scoring_period, int(matchup_total))
+        where = "league_id=? AND season=? AND matchup_period=? AND scoring_period=? AND matchup_total=?"
+        with self._connect() as conn:
+            teams = conn.execute(f"SELECT * FROM team_games WHERE {where} ORDER BY game_idx, side DESC", key).fetchall()
+            players = conn.execute(f"SELECT * FROM player_games WHERE {where} ORDER BY game_idx, side, lineup_idx", key).fetchall()
+        if not teams:
+            return None
+
+        lineups: Dict[Tuple[int, str], List[LineupPlayer]] = {}
+        for row in players:
+            lineups.setdefault((row['game_idx'], row['side']), []).append(LineupPlayer(
+                intern(row['player_name']),
+                intern(row['position']),
+                row['points'],
+                row['projected'],
+                json.loads(row['stats']),
+                intern(row['injury_status']),
+                bool(row['starting']),
+                intern(row['pro_team']),
+                row['player_id'],
+            ))
+        games: Dict[int, Dict[str, BoxScoreTeam]] = {}
+        for row in teams:
+            games.setdefault(row['game_idx'], {})[row['side']] = BoxScoreTeam(
+                row['team_id'], row['team_name'], row['score'], row['projected'],
+                tuple(lineups.get((row['game_idx'], row['side']), ())))
+        return [BoxScore(games[idx]['home_team'], games[idx]['away_team']) for idx in sorted(games)]
+
+    def query_player_games(self,
+                           league_id: int,
+                           season: int,
+                           player_name: Optional[str] = None,
+                           team_id: Optional[int] = None,
+                           player_id: Optional[int] = None,
+                           period_range: Optional[Tuple[int, int]] = None,
+                           columns: Optional[Sequence[str]] = None,
+                           matchup_total: bool = False) -> List[Dict[str, Any]]:
+        """Range query over per-player rows by player, team and inclusive scoring period range.
+
+        `player_id` picks out one player; `player_name` matches everyone with that name.
+        """
+        columns = list(columns or PLAYER_COLUMNS)
+        unknown = set(columns) - set(PLAYER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {sorted(unknown)}")
+        clauses, params = ["league_id=?", "season=?", "matchup_total=?"], [league_id, season, int(matchup_total)]
+        if player_name is not None:
+            clauses.append("player_name=?")
+            params.append(player_name)
+        if player_id is not None:
+            clauses.append("player_id=?")
+            params.append(player_id)
+        if team_id is not None:
+            clauses.append("team_id=?")
+            params.append(team_id)
+        if period_range is not None:
+            clauses.append("scoring_period BETWEEN ? AND ?")
+            params.extend(period_range)
+        sql = f"SELECT {', '.join(columns)} FROM player_games WHERE {' AND '.join(clauses)} ORDER BY scoring_period"
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def query_stat(self,
+                   league_id: int,
+                   season: int,
+                   stat: str,
+                   min_value: Optional[float] = None,
+                   max_value: Optional[float] = None,
+                   player_name: Optional[str] = None,
+                   period_range: Optional[Tuple[int, int]] = None,
+                   player_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Range query on one stat column (e.g. 'PTS' >= 40) across stored scoring periods."""
+        clauses, params = ["league_id=?", "season=?", "stat=?"], [league_id, season, stat]
+        if min_value is not None:
+            clauses.append("value >= ?")
+            params.append(min_value)
+        if max_value is not None:
+            clauses.append("value <= ?")
+            params.append(max_value)
+        if player_name is not None:
+            clauses.append("player_name=?")
+            params.append(player_name)
+        if player_id is not None:
+            clauses.append("player_id=?")
+            params.append(player_id)
+        if period_range is not None:
+            clauses.append("scoring_period BETWEEN ? AND ?")
+            params.extend(period_range)
+        sql = (f"SELECT scoring_period, player_id, player_name, team_id, stat, value FROM player_stat_values "
+               f"WHERE {' AND '.join(clauses)} ORDER BY value DESC")
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def season_totals(self, league_id: int, season: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Season-long fantasy points per player from stored single-period box scores."""
+        sql = ("SELECT player_id, MAX(player_name) AS player_name, COUNT(*) AS games, SUM(points) AS total_points, "
+               "AVG(points) AS avg_points FROM player_games WHERE league_id=? AND season=? AND matchup_total=0 "
+               "GROUP BY player_id ORDER BY total_points DESC")
+        params: List[Any] = [league_id, season]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def save_transactions(self, league_id: int, season: int, scoring_period: int,
+                          transactions: List[Dict[str, Any]]) -> None:
+        rows = [(league_id, season, scoring_period, idx, t.get('type'), t.get('team'), t.get('player'),
+                 t.get('action'), t.get('bid_amount'), t.get('status'), t.get('date'))
+                for idx, t in enumerate(transactions)]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM transactions WHERE league_id=? AND season=? AND scoring_period=?",
+                         (league_id, season, scoring_period))
+            conn.executemany("INSERT INTO transactions VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+
+    def save_standings(self, league_id: int, season: int, standings: List[Dict[str, Any]]) -> None:
+        rows = [(league_id, season, team['team_id'], team.get('standing'), json.dumps(team, default=_json_default))
+                for team in standings]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM standings WHERE league_id=? AND season=?", (league_id, season))
+            conn.executemany("INSERT INTO standings VALUES (?,?,?,?,?)", rows)
+
+    def load_standings(self, league_id: int, season: int) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT data FROM standings WHERE league_id=? AND season=? ORDER BY standing",
+                                (league_id, season))
+            return [json.loads(row['data']) for row in rows]
+
+    def mark_done(self, league_id: int, season: int, task: str, period: int = 0) -> None:
+        """Checkpoint one finished backfill task (e.g. 'box_scores' for a scoring period)."""
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO backfill_progress VALUES (?,?,?,?,?)",
+                         (league_id, season, task, period, time.time()))
+
+    def done_tasks(self, league_id: int, season: int) -> Set[Tuple[str, int]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT task, period FROM backfill_progress WHERE league_id=? AND season=?",
+                                (league_id, season))
+            return {(row['task'], row['period']) for row in rows}
+
+    def stored_periods(self, league_id: int, season: int) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM periods WHERE league_id=? AND season=? ORDER BY scoring_period",
+                                (league_id, season))
+            return [dict(row) for row in rows]
+
+
+def open_season_store() -> Optional[SeasonStore]:
+    """Open the store at SEASON_STORE_PATH (defaults to data/season.db); an empty path disables it."""
+    path = os.getenv("SEASON_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'season.db'))
+    if not path:
+        return None
+    try:
+        return SeasonStore(path)
+    except Exception as e:
+        logger.error(f"Could not open season store at {path}: {str(e)}")
+        return None
@@ -1,5 +1,6 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+import numpy as np
 
 def calculate_team_stats(team_data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate advanced team statistics."""
@@ -18,7 +19,8 @@ def calculate_team_stats(team_data: Dict[str, Any]) -> Dict[str, Any]:
             'avg_points_against': 0
         },
         'streaks': {
-            'current_streak': team_data.get('streak_type', 'N/A') + str(team_data.get('streak_length', 0)),
+            # Standings rows carry streak_type=None when ESPN reports no streak.
+            'current_streak': (team_data.get('streak_type') or 'N/A') + str(team_data.get('streak_length') or 0),
             'longest_win_streak': 0,
             'longest_loss_streak': 0
         }
@@ -214,3 +216,126 @@ def calculate_league_stats(teams: List[Dict[str, Any]], matchups: List[Dict[str,
         stats['scoring']['avg_points_per_game'] = round(stats['scoring']['total_points'] / stats['total_games'], 2) if stats['total_games'] > 0 else 0
     
     return stats
+
+# Vectorized engine
+#
+# The functions below produce the same output as calculate_matchup_stats and
+# calculate_league_stats, but convert teams and matchups into columnar NumPy
+# arrays once and answer every question with array reductions. Use them when
+# running across many weeks or seasons; ties resolve to the first occurrence,
+# exactly like the loop versions.
+
+class MatchupColumns:
+    """Columnar view of a list of scoreboard/box score matchup dicts."""
+
+    def __init__(self, matchups: List[Dict[str, Any]]):
+        self.home_names = [m.get('home_team', {}).get('team_name') for m in matchups]
+        self.away_names = [m.get('away_team', {}).get('team_name') for m in matchups]
+        # Original Python values are kept so results keep their int/float types.
+        self.home_values = [m.get('home_team', {}).get('score', 0) for m in matchups]
+        self.away_values = [m.get('away_team', {}).get('score', 0) for m in matchups]
+        self.home = np.asarray(self.home_values, dtype=np.float64)
+        self.away = np.asarray(self.away_values, dtype=np.float64)
+        self.combined = self.home + self.away
+        self.differential = np.abs(self.home - self.away)
+
+    def __len__(self) -> int:
+        return len(self.home_values)
+
+    def game(self, idx: int, metric: str) -> Dict[str, Any]:
+        home_score = self.home_values[idx]
+        away_score = self.away_values[idx]
+        value = home_score + away_score if metric == 'combined_score' else abs(home_score - away_score)
+        return {
+            'home_team': self.home_names[idx],
+            'away_team': self.away_names[idx],
+            'home_score': home_score,
+            'away_score': away_score,
+            metric: value
+        }
+
+
+class TeamColumns:
+    """Columnar view of a list of team/standings dicts."""
+
+    def __init__(self, teams: List[Dict[str, Any]]):
+        self.names = [t.get('team_name') for t in teams]
+        self.win_values = [t.get('wins', 0) for t in teams]
+        self.loss_values = [t.get('losses', 0) for t in teams]
+        self.point_values = [t.get('points_for', 0) for t in teams]
+        self.wins = np.asarray(self.win_values, dtype=np.float64)
+        self.losses = np.asarray(self.loss_values, dtype=np.float64)
+        self.points = np.asarray(self.point_values, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def calculate_matchup_stats_vectorized(matchups) -> Dict[str, Any]:
+    """Calculate matchup statistics with array reductions. Accepts dicts or MatchupColumns."""
+    cols = matchups if isinstance(matchups, MatchupColumns) else MatchupColumns(matchups)
+    total = len(cols)
+    stats = {
+        'total_matchups': total,
+        'avg_combined_score': 0,
+        'highest_scoring_game': None,
+        'closest_game': None,
+        'biggest_blowout': None,
+        'home_wins': 0,
+        'away_wins': 0
+    }
+    if total == 0:
+        return stats
+
+    stats['highest_scoring_game'] = cols.game(int(np.argmax(cols.combined)), 'combined_score')
+    stats['closest_game'] = cols.game(int(np.argmin(cols.differential)), 'point_differential')
+    stats['biggest_blowout'] = cols.game(int(np.argmax(cols.differential)), 'point_differential')
+    home_wins = int(np.count_nonzero(cols.home > cols.away))
+    stats['home_wins'] = home_wins
+    stats['away_wins'] = total - home_wins
+    stats['avg_combined_score'] = round(float(cols.combined.sum()) / total, 2)
+    return stats
+
+
+def calculate_league_stats_vectorized(teams, matchups) -> Dict[str, Any]:
+    """Calculate overall league statistics with array reductions. Accepts dicts or *Columns."""
+    cols = teams if isinstance(teams, TeamColumns) else TeamColumns(teams)
+    count = len(cols)
+    stats = {
+        'teams': count,
+        'total_games': 0,
+        'scoring': {
+            'highest_scoring_team': None,
+            'lowest_scoring_team': None,
+            'avg_points_per_game': 0,
+            'total_points': 0
+        },
+        'standings': {
+            'avg_wins': 0,
+            'avg_losses': 0,
+            'most_wins': None,
+            'most_losses': None
+        },
+        'matchups': calculate_matchup_stats_vectorized(matchups)
+    }
+    if count == 0:
+        return stats
+
+    total_wins = sum(cols.win_values)
+    total_losses = sum(cols.loss_values)
+    stats['total_games'] = total_wins + total_losses
+    stats['scoring']['total_points'] = sum(cols.point_values)
+
+    highest = int(np.argmax(cols.points))
+    lowest = int(np.argmin(cols.points))
+    most_wins = int(np.argmax(cols.wins))
+    most_losses = int(np.argmax(cols.losses))
+    stats['scoring']['highest_scoring_team'] = {'team_name': cols.names[highest], 'points': cols.point_values[highest]}
+    stats['scoring']['lowest_scoring_team'] = {'team_name': cols.names[lowest], 'points': cols.point_values[lowest]}
+    stats['standings']['most_wins'] = {'team_name': cols.names[most_wins], 'wins': cols.win_values[most_wins]}
+    stats['standings']['most_losses'] = {'team_name': cols.names[most_losses], 'losses': cols.loss_values[most_losses]}
+
+    stats['standings']['avg_wins'] = round(total_wins / count, 2)
+    stats['standings']['avg_losses'] = round(total_losses / count, 2)
+    stats['scoring']['avg_points_per_game'] = round(stats['scoring']['total_points'] / stats['total_games'], 2) if stats['total_games'] > 0 else 0
+    return stats